@@ -1,9 +1,10 @@
+import json
 from datetime import datetime, timedelta, UTC
 from hmac import compare_digest
 
 import httpx
 from fastapi import APIRouter, Request, Depends, Form, Security, Response
-from fastapi.responses import JSONResponse, RedirectResponse, HTMLResponse
+from fastapi.responses import JSONResponse, RedirectResponse, HTMLResponse, StreamingResponse
 from starlette.templating import Jinja2Templates
 from jose import jwt, JWTError
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
@@ -12,9 +13,13 @@ from app.admin.security import verify_admin_token
 from app.config import (SECRET_KEY, ADMIN_USERNAME, ALGORITHM, ADMIN_PASSWORD, ACCESS_TOKEN_EXPIRE_MINUTES, API_KEY, FLOWER_URL)
 
 from app.admin.utils import _proxy_request, _filter_headers, _rewrite_flower_html
+from app.infrastructure.auth import revoke_token
+from app.infrastructure.events import subscribe_events
+from app.infrastructure.static_assets import AssetManifest
 
 # Initialize Jinja2 templates for admin pages
 templates = Jinja2Templates(directory="app/admin/templates")
+templates.env.globals["static_url"] = AssetManifest("admin", "/admin/static").url
 
 # Router for admin panel endpoints
 router = APIRouter(prefix="/admin", tags=["Admin"])
@@ -82,8 +87,15 @@ async def admin_login(username: str = Form(...), password: str = Form(...)):
 
 
 @router.get("/logout")
-async def admin_logout():
-    """Logout admin: remove cookie and redirect to login page."""
+async def admin_logout(request: Request):
+    """Logout admin: revoke the admin token, remove cookie and redirect to login page.
+
+    Raises:
+        AuthUnavailableError: If the revocation could not be stored; the cookie is kept
+    """
+    token = request.cookies.get("admin_token")
+    if token:
+        await revoke_token(token)
     response = RedirectResponse(url="/admin/login", status_code=303)
     response.delete_cookie("admin_token", path="/")
     return response
@@ -160,6 +172,40 @@ async def look_detail(request: Request, look_id: str):
     )
 
 
+@router.get("/events", dependencies=[Depends(verify_admin_token)])
+async def publication_events(request: Request, look_id: int | None = None):
+    """Stream look publication events as Server-Sent Events.
+    
+    Events come from SocialMediaPoster, one per service a look was posted to,
+    and from the result processor once a look is marked as pushed.
+    
+    Args:
+        request (Request): FastAPI request object
+        look_id (int | None): Only stream events of this look
+        
+    Returns:
+        StreamingResponse: ``text/event-stream`` of ``publication`` events
+    """
+    async def stream():
+        events = subscribe_events()
+        try:
+            async for event in events:
+                if await request.is_disconnected():
+                    break
+                if event is None:
+                    yield ": ping\n\n"
+                elif look_id is None or event.get("look_id") == look_id:
+                    yield f"event: publication\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+        finally:
+            await events.aclose()
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.api_route("/flower/", methods=["GET", "POST"], dependencies=[Depends(verify_admin_token)])
 async def flower_root(request: Request):
     return await _proxy_request(request, FLOWER_URL)
@@ -1,20 +1,24 @@
 from fastapi import Request, HTTPException, status
-from jose import jwt, JWTError
-from app.config import SECRET_KEY, ADMIN_USERNAME, ALGORITHM
+from jose import JWTError
+from app.config import ADMIN_USERNAME
+from app.infrastructure.auth import decode_token
 
 
 async def verify_admin_token(request: Request):
     """Check the presence and validity of the JWT token in the 'admin_token' httpOnly cookie.
+    Already verified tokens are served from the in-process token cache. Admin
+    tokens fail closed: if revocation cannot be checked, the request is refused.
     Args:
         request (Request): FastAPI request object
     Raises:
-        HTTPException: 401 if token is missing or invalid, 403 if not an admin user
+        HTTPException: 401 if token is missing, invalid or revoked, 403 if not an admin user
+        AuthUnavailableError: If revocation of the token cannot be checked
     """
     token = request.cookies.get("admin_token")
     if not token:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authorized")
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = await decode_token(token, fail_closed=True)
         if payload.get("sub") != ADMIN_USERNAME:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not an admin user")
     except JWTError:
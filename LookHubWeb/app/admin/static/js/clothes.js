@@ -55,6 +55,20 @@ function updatePaginationControls() {
     loadMoreBtn.disabled = currentPage === totalPages || totalPages === 0;
 }
 
+// Одежда по ссылке создаётся в фоне, опрашиваем задачу до её завершения
+async function waitForClothesJob(jobId, intervalMs = 1000) {
+    while (true) {
+        await new Promise(resolve => setTimeout(resolve, intervalMs));
+        const response = await fetch(`/api/clothes/ai/${jobId}`, {
+            headers: { 'Accept': 'application/json' }
+        });
+        if (!response.ok) throw new Error(`HTTP error! Status: ${response.status}`);
+        const job = await response.json();
+        if (job.status === 'success') return job.result;
+        if (job.status === 'failure') throw new Error(job.error || 'Не удалось обработать ссылку');
+    }
+}
+
 async function createClothesWithAI() {
     const link = document.getElementById('ai-link').value.trim();
     if (!link) {
@@ -72,8 +86,9 @@ async function createClothesWithAI() {
             body: JSON.stringify({ link })
         });
         if (!response.ok) throw new Error(`HTTP error! Status: ${response.status}`);
-        const newClothes = await response.json();
+        const job = await response.json();
         document.getElementById('ai-link').value = '';
+        const newClothes = await waitForClothesJob(job.job_id);
         await loadClothes(1); // Сбрасываем на первую страницу
         alert(`Одежда "${newClothes.name || 'Без названия'}" успешно добавлена!`);
     } catch (error) {
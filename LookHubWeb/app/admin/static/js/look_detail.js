@@ -48,8 +48,9 @@ async function loadLookDetails() {
         const editImageContainer = document.getElementById('edit-look-image-urls');
         editImageContainer.innerHTML = '';
         if (look.image_urls?.length) {
-            look.image_urls.forEach(url => {
-                const fullUrl = url.startsWith('http') ? url : `${baseUrl}${url}`;
+            look.image_urls.forEach((url, index) => {
+                const thumbnail = look.images?.[index]?.thumbnail || url;
+                const fullUrl = thumbnail.startsWith('http') ? thumbnail : `${baseUrl}${thumbnail}`;
                 imageContainer.insertAdjacentHTML('beforeend', `<img src="${fullUrl}" alt="Image">`);
                 editImageContainer.insertAdjacentHTML('beforeend', `
                     <div class="image-item">
@@ -162,8 +163,9 @@ function cancelEdit() {
     const editImageContainer = document.getElementById('edit-look-image-urls');
     editImageContainer.innerHTML = '';
     if (originalData.image_urls?.length) {
-        originalData.image_urls.forEach(url => {
-            const fullUrl = url.startsWith('http') ? url : `${baseUrl}${url}`;
+        originalData.image_urls.forEach((url, index) => {
+            const thumbnail = originalData.images?.[index]?.thumbnail || url;
+            const fullUrl = thumbnail.startsWith('http') ? thumbnail : `${baseUrl}${thumbnail}`;
             editImageContainer.insertAdjacentHTML('beforeend', `
                 <div class="image-item">
                     <img src="${fullUrl}" alt="Image" data-original="${url}">
@@ -275,7 +277,7 @@ async function publishLookToSocialMedia() {
         }
         
         const result = await response.json();
-        alert(`Лук успешно отправлен в социальные сети!\nTask ID: ${result.task_id}`);
+        alert(`Лук успешно отправлен в социальные сети!\nTask ID: ${result.task_id}\nСтатус публикации появится под кнопкой.`);
         
         // Обновляем данные лука
         await loadLookDetails();
@@ -388,6 +390,29 @@ document.addEventListener('click', (e) => {
 });
 
 loadLookDetails();
+listenPublicationEvents();
+
+// Статусы публикации приходят с сервера в реальном времени (SSE)
+const PUBLICATION_STATUS_LABELS = {
+    success: 'опубликован',
+    error: 'ошибка',
+    pushed: 'лук отмечен как опубликованный'
+};
+
+function listenPublicationEvents() {
+    const events = new EventSource(`/admin/events?look_id=${lookId}`);
+    events.addEventListener('publication', async (message) => {
+        const event = JSON.parse(message.data);
+        const label = PUBLICATION_STATUS_LABELS[event.status] || event.status;
+        const item = document.createElement('li');
+        item.textContent = (event.service ? `${event.service}: ${label}` : label)
+            + (event.error ? ` (${event.error})` : '');
+        document.getElementById('publish-status').appendChild(item);
+        if (event.status === 'pushed') {
+            await loadLookDetails();
+        }
+    });
+}
 
 // Получение токена из localStorage
 function getApiToken() {
@@ -0,0 +1,193 @@
+import asyncio
+from typing import Callable
+
+import orjson
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.config import (
+    ADMISSION_LIMITS,
+    ADMISSION_MAX_WAIT_SECONDS,
+    ADMISSION_RETRY_AFTER_SECONDS,
+)
+from app.infrastructure.metrics import register_collector
+
+UPLOAD_PATH_SUFFIXES = ("/add_images", "/with_images")
+# Long-lived or cheap paths that never wait for a slot
+UNLIMITED_PATH_PREFIXES = (
+    "/assets/",
+    "/admin/static/",
+    "/frontend/static/",
+    "/admin/events",
+    "/admin/flower",
+    "/images/",
+    "/metrics",
+)
+
+
+def classify_request(method: str, path: str) -> str | None:
+    """Get the admission class of a request.
+
+    Args:
+        method (str): HTTP method
+        path (str): Request path
+
+    Returns:
+        str | None: "read", "admin" or "upload", None if the request is not limited
+    """
+    if method == "OPTIONS" or path.startswith(UNLIMITED_PATH_PREFIXES):
+        return None
+    if method == "POST" and path.rstrip("/").endswith(UPLOAD_PATH_SUFFIXES):
+        return "upload"
+    if path.startswith("/admin"):
+        return "admin"
+    if path.startswith("/api/"):
+        return "read" if method in ("GET", "HEAD") else "admin"
+    if path.startswith("/frontend"):
+        return "read"
+    return None
+
+
+class AdmissionGate:
+    """Concurrency limit with a bounded wait queue for one class of requests.
+
+    A request runs at once if a slot is free. Otherwise it waits in the queue
+    for at most ``max_wait`` seconds, and is rejected right away if the queue
+    is already full.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        concurrency: int,
+        max_queue: int,
+        max_wait: float = ADMISSION_MAX_WAIT_SECONDS,
+    ):
+        """Initialize the gate.
+
+        Args:
+            name (str): Name of the request class, used in metrics
+            concurrency (int): Maximum number of requests in progress
+            max_queue (int): Maximum number of waiting requests
+            max_wait (float): Maximum seconds a request waits for a slot
+        """
+        self.name = name
+        self.concurrency = concurrency
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._waiting = 0
+        self._active = 0
+        self._admitted = 0
+        self._rejected_queue_full = 0
+        self._rejected_timeout = 0
+
+    async def acquire(self) -> bool:
+        """Wait for a slot.
+
+        Returns:
+            bool: True if the request was admitted and must call release, False if it was rejected
+        """
+        if self._semaphore.locked():
+            if self._waiting >= self.max_queue:
+                self._rejected_queue_full += 1
+                return False
+            self._waiting += 1
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), self.max_wait)
+            except asyncio.TimeoutError:
+                self._rejected_timeout += 1
+                return False
+            finally:
+                self._waiting -= 1
+        else:
+            await self._semaphore.acquire()
+        self._active += 1
+        self._admitted += 1
+        return True
+
+    def release(self) -> None:
+        """Free the slot of an admitted request."""
+        self._active -= 1
+        self._semaphore.release()
+
+    def metrics(self) -> dict[str, float]:
+        """Get current queue and rejection metrics.
+
+        Returns:
+            dict[str, float]: Metric name -> value
+        """
+        label = f'{{route_class="{self.name}"}}'
+        return {
+            f"lookhub_admission_in_progress{label}": self._active,
+            f"lookhub_admission_queue_depth{label}": self._waiting,
+            f"lookhub_admission_admitted_total{label}": self._admitted,
+            f"lookhub_admission_rejected_queue_full_total{label}": self._rejected_queue_full,
+            f"lookhub_admission_rejected_timeout_total{label}": self._rejected_timeout,
+        }
+
+
+class AdmissionControlMiddleware:
+    """ASGI middleware that sheds load before requests pile up on the DB pool.
+
+    Requests are sorted into classes that each have their own gate, so a burst
+    of public reads cannot starve the admin or uploads. Requests that cannot
+    get a slot in time are answered at once with 503 and ``Retry-After``.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        gates: dict[str, AdmissionGate] | None = None,
+        classify: Callable[[str, str], str | None] = classify_request,
+    ):
+        """Initialize the middleware.
+
+        Args:
+            app (ASGIApp): Wrapped application
+            gates (dict[str, AdmissionGate] | None): Gates by request class, the shared ones if None
+            classify (Callable[[str, str], str | None]): Maps method and path to a request class
+        """
+        self.app = app
+        self.gates = admission_gates if gates is None else gates
+        self.classify = classify
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        gate = self.gates.get(self.classify(scope["method"], scope["path"]))
+        if gate is None:
+            await self.app(scope, receive, send)
+            return
+        if not await gate.acquire():
+            await self._reject(send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            gate.release()
+
+    @staticmethod
+    async def _reject(send: Send) -> None:
+        """Answer with 503 Service Unavailable."""
+        body = orjson.dumps({"detail": "Server is busy, retry later"})
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 503,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", str(ADMISSION_RETRY_AFTER_SECONDS).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+
+admission_gates = {
+    name: AdmissionGate(name, concurrency, max_queue)
+    for name, (concurrency, max_queue) in ADMISSION_LIMITS.items()
+}
+for _gate in admission_gates.values():
+    register_collector(_gate.metrics)
@@ -0,0 +1,126 @@
+import asyncio
+import time
+from typing import Callable
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.api.admission import classify_request
+from app.config import REQUEST_TIMEOUTS, REQUEST_TIMEOUT_HEADER
+from app.infrastructure.database import request_deadline
+
+
+def request_timeout(route_class: str | None, header: bytes | None) -> float | None:
+    """Get the time a request may take.
+
+    A client may ask for a shorter timeout than the one of its route class,
+    never for a longer one.
+
+    Args:
+        route_class (str | None): Admission class of the request
+        header (bytes | None): Value of the timeout header, in seconds
+
+    Returns:
+        float | None: Timeout in seconds, None if the request has no deadline
+    """
+    timeout = REQUEST_TIMEOUTS.get(route_class)
+    if timeout is None or header is None:
+        return timeout
+    try:
+        requested = float(header)
+    except ValueError:
+        return timeout
+    return min(timeout, requested) if requested > 0 else timeout
+
+
+class RequestDeadlineMiddleware:
+    """ASGI middleware that gives every request a deadline and stops abandoned work.
+
+    The deadline is stored in ``request_deadline``, from which the session
+    layer sets the Postgres ``statement_timeout`` of every transaction. When
+    the client disconnects before the response is finished, the request is
+    cancelled together with its in-flight query.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        classify: Callable[[str, str], str | None] = classify_request,
+    ):
+        """Initialize the middleware.
+
+        Args:
+            app (ASGIApp): Wrapped application
+            classify (Callable[[str, str], str | None]): Maps method and path to a route class
+        """
+        self.app = app
+        self.classify = classify
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        header = dict(scope["headers"]).get(REQUEST_TIMEOUT_HEADER.encode())
+        timeout = request_timeout(self.classify(scope["method"], scope["path"]), header)
+        if timeout is None:
+            await self.app(scope, receive, send)
+            return
+
+        token = request_deadline.set(time.monotonic() + timeout)
+        try:
+            await self._run_until_disconnect(scope, receive, send)
+        finally:
+            request_deadline.reset(token)
+
+    async def _run_until_disconnect(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        """Run the app and cancel it if the client disconnects first.
+
+        Incoming messages are read by a single pump and handed to the app one
+        at a time, so the request body is still streamed with back-pressure.
+        An error of the server's ``receive`` is raised from the app's next
+        ``receive`` call, and from every one after it.
+        """
+        messages: asyncio.Queue[Message | Exception] = asyncio.Queue(maxsize=1)
+        response_complete = asyncio.Event()
+
+        async def receive_message() -> Message:
+            message = await messages.get()
+            if isinstance(message, Exception):
+                messages.put_nowait(message)
+                raise message
+            return message
+
+        async def send_message(message: Message) -> None:
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get(
+                "more_body", False
+            ):
+                response_complete.set()
+
+        app_task = asyncio.create_task(self.app(scope, receive_message, send_message))
+
+        async def pump() -> None:
+            while True:
+                try:
+                    message = await receive()
+                except Exception as e:
+                    # Otherwise the app would wait for the next message forever
+                    await messages.put(e)
+                    return
+                if message["type"] == "http.disconnect":
+                    # Work after a finished response, like background tasks, is not abandoned
+                    if not response_complete.is_set():
+                        app_task.cancel()
+                    return
+                await messages.put(message)
+
+        pump_task = asyncio.create_task(pump())
+        try:
+            await app_task
+        except asyncio.CancelledError:
+            # Raised again if this request itself, not only the app, was cancelled
+            if not pump_task.done():
+                raise
+        finally:
+            pump_task.cancel()
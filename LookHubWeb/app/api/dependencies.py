@@ -4,6 +4,9 @@ from fastapi import Depends, Security
 from app.api.security import verify_api_token
 from app.application.use_cases import LooksUseCase, ClothesUseCase
 from app.infrastructure.database import get_async_session, scoped_session
+from app.infrastructure.image_deletion import image_deletion_queue
+from app.infrastructure.image_index import image_hash_index
+from app.infrastructure.image_processing import image_processor
 from app.infrastructure.repositories.clothes import ClothesRepository
 from app.infrastructure.repositories.looks import LooksRepository
 
@@ -12,7 +15,7 @@ from app.infrastructure.repositories.looks import LooksRepository
 async def get_looks_use_case() -> LooksUseCase:
     looks_repo = LooksRepository(scoped_session)
     clothes_repo = ClothesRepository(scoped_session)
-    return LooksUseCase(looks_repo, clothes_repo)
+    return LooksUseCase(looks_repo, clothes_repo, image_processor, image_deletion_queue, image_hash_index)
 
 
 async def get_clothes_use_case() -> ClothesUseCase:
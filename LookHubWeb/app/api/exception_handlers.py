@@ -1,7 +1,14 @@
 from fastapi import FastAPI, Request, HTTPException
+from sqlalchemy.exc import DBAPIError
 from starlette import status
 
-from app.application.exceptions import EntityNotFoundError, UnknownError, InvalidFileError
+from app.application.exceptions import (
+    EntityNotFoundError, UnknownError, InvalidFileError, FileTooLargeError, ImageTooLargeError,
+    RequestTimeoutError, AuthUnavailableError, ClothesNotFoundError,
+)
+
+# Postgres error code of statements cancelled by statement_timeout
+QUERY_CANCELED_SQLSTATE = "57014"
 
 
 def init_exception_handlers(app: FastAPI):
@@ -11,6 +18,12 @@ def init_exception_handlers(app: FastAPI):
             status_code=status.HTTP_404_NOT_FOUND,
             detail=exc.args)
 
+    @app.exception_handler(ClothesNotFoundError)
+    async def clothes_not_found(request: Request, exc: ClothesNotFoundError):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=exc.args)
+
     @app.exception_handler(InvalidFileError)
     async def invalid_file(request: Request, exc: InvalidFileError):
         raise HTTPException(
@@ -22,3 +35,35 @@ def init_exception_handlers(app: FastAPI):
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=exc.args)
+
+    @app.exception_handler(FileTooLargeError)
+    async def file_too_large(request: Request, exc: FileTooLargeError):
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=exc.args)
+
+    @app.exception_handler(ImageTooLargeError)
+    async def image_too_large(request: Request, exc: ImageTooLargeError):
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=exc.args)
+
+    @app.exception_handler(RequestTimeoutError)
+    async def request_timeout(request: Request, exc: RequestTimeoutError):
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail=exc.args)
+
+    @app.exception_handler(AuthUnavailableError)
+    async def auth_unavailable(request: Request, exc: AuthUnavailableError):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=exc.args)
+
+    @app.exception_handler(DBAPIError)
+    async def database_error(request: Request, exc: DBAPIError):
+        if getattr(exc.orig, "sqlstate", None) != QUERY_CANCELED_SQLSTATE:
+            raise exc
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail=RequestTimeoutError().args)
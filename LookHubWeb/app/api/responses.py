@@ -0,0 +1,35 @@
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+def _default(obj: Any) -> Any:
+    """Convert values orjson cannot encode natively."""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class ModelJSONResponse(JSONResponse):
+    """JSON response encoded with orjson that also accepts pydantic models.
+
+    Used as the default response class of the app. Endpoints on hot read paths
+    return it directly with the already validated models, so FastAPI skips
+    re-validating them against ``response_model`` and the stdlib encoder; the
+    response model is then only used for the OpenAPI schema.
+    """
+
+    def render(self, content: Any) -> bytes:
+        """Encode the response content.
+
+        Args:
+            content (Any): Pydantic model, or JSON-compatible data possibly containing models
+
+        Returns:
+            bytes: Encoded JSON
+        """
+        if isinstance(content, BaseModel):
+            content = content.model_dump(mode="json")
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
@@ -1,10 +1,13 @@
-from fastapi import APIRouter, HTTPException, status, Form
+from fastapi import APIRouter, HTTPException, status, Form, Security
+from fastapi.security import HTTPAuthorizationCredentials
 from jose import jwt
 from datetime import datetime, timedelta, UTC
 from app.config import API_KEY, SECRET_KEY, ALGORITHM
 
 from app.api.routers.looks import router as looks_router
 from app.api.routers.clothes import router as clothes_router
+from app.api.security import bearer_scheme
+from app.infrastructure.auth import revoke_token
 
 # Main API router that includes all sub-routers
 router = APIRouter(prefix="/api", tags=["API"])
@@ -33,3 +36,16 @@ async def get_api_token(api_key: str = Form(...)):
     to_encode = {"sub": "api_client", "exp": expire}
     token = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return {"access_token": token, "token_type": "bearer"}
+
+
+@router.post("/token/revoke", status_code=status.HTTP_204_NO_CONTENT)
+async def revoke_api_token(credentials: HTTPAuthorizationCredentials = Security(bearer_scheme)):
+    """Revokes the JWT token from the Authorization header for all workers.
+    
+    Args:
+        credentials (HTTPAuthorizationCredentials): Bearer token to revoke
+
+    Raises:
+        AuthUnavailableError: If the revocation could not be stored
+    """
+    await revoke_token(credentials.credentials)
@@ -1,12 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
 from starlette import status
 
 from app.api.dependencies import ClothesUseCaseDep, SecurityDep
-from app.api.routers.utils import create_enum_from_model
-from app.api.schemas import Paginated
+from app.api.responses import ModelJSONResponse
+from app.api.routers.utils import create_enum_from_model, batch_ids
+from app.api.schemas import Paginated, Batch, Job
 from app.domain.entities.clothes import ClothesRead, ClothesUpdate, ClothesCreate
-from app.domain.entities.enums import GenderEnum
+from app.domain.entities.enums import GenderEnum, ColourEnum
+from app.infrastructure.tasks.producer import task_producer, INGEST_CLOTHES_TASK
 
 # Router for clothes-related endpoints
 router = APIRouter(prefix="/clothes")
@@ -38,20 +40,33 @@ async def add_clothes(clothes_use_case: ClothesUseCaseDep, clothes: ClothesCreat
     return await clothes_use_case.add_one(clothes)
 
 
-@router.post("/ai", response_model=ClothesRead, status_code=status.HTTP_201_CREATED, dependencies=[SecurityDep])
-async def add_clothes_with_ai(
-    clothes_use_case: ClothesUseCaseDep, clothes: ClothesAICreate
-):
-    """Create a new clothing item using AI to parse data from a URL.
+@router.post("/ai", response_model=Job, status_code=status.HTTP_202_ACCEPTED, dependencies=[SecurityDep])
+async def add_clothes_with_ai(clothes: ClothesAICreate):
+    """Queue the creation of a clothing item from the product page at a URL.
     
     Args:
-        clothes_use_case (ClothesUseCaseDep): Injected clothes use case
         clothes (ClothesAICreate): URL to parse clothes data from
         
     Returns:
-        ClothesRead: Created clothing item with AI-generated description
+        Job: Queued job, polled via GET /clothes/ai/{job_id}
+    """
+    return Job(job_id=await task_producer.send(INGEST_CLOTHES_TASK, [clothes.link]))
+
+
+@router.get("/ai/{job_id}", response_model=Job, status_code=status.HTTP_200_OK, dependencies=[SecurityDep])
+async def get_clothes_ai_job(job_id: str):
+    """Get the state of a clothing item creation job.
+    
+    Args:
+        job_id (str): ID of the job
+        
+    Returns:
+        Job: Job state with the created clothing item once it succeeded
     """
-    return await clothes_use_case.add_one_with_ai(clothes.link)
+    job_status, info = await task_producer.get_state(job_id)
+    if job_status == "failure":
+        return Job(job_id=job_id, status=job_status, error=str(info))
+    return Job(job_id=job_id, status=job_status, result=info)
 
 
 @router.get("/", response_model=Paginated[ClothesRead], status_code=status.HTTP_200_OK)
@@ -63,6 +78,7 @@ async def get_clothes_list(
     desc_order: bool = True,
     random_order: bool = False,
     gender: GenderEnum | None = None,
+    colours: list[ColourEnum] | None = Query(None),
 ):
     """Get a paginated list of clothing items.
     
@@ -74,6 +90,7 @@ async def get_clothes_list(
         desc_order (bool, optional): Order descending. Defaults to True.
         random_order (bool): If True, ignore order_by and use random order
         gender (GenderEnum, optional): Filter by gender. Defaults to GenderEnum.unisex.
+        colours (list[ColourEnum], optional): Filter by having any of the colours. Defaults to None.
         
     Returns:
         Paginated[ClothesRead]: Paginated list of clothing items
@@ -83,8 +100,24 @@ async def get_clothes_list(
                                                      order_by.value if order_by else None,
                                                      desc_order,
                                                      random_order,
-                                                     gender=gender.value if gender else None)
-    return Paginated[ClothesRead](results=clothes, count=total)
+                                                     gender=gender.value if gender else None,
+                                                     colours=[c.value for c in colours] if colours else None)
+    return ModelJSONResponse(Paginated[ClothesRead](results=clothes, count=total))
+
+
+@router.get("/batch", response_model=Batch[ClothesRead], status_code=status.HTTP_200_OK)
+async def get_clothes_batch(clothes_use_case: ClothesUseCaseDep, ids: list[int] = Depends(batch_ids)):
+    """Get several clothes by ID with a single query.
+    
+    Args:
+        clothes_use_case (ClothesUseCaseDep): Injected clothes use case
+        ids (list[int]): Comma-separated IDs, at most API_BATCH_MAX_IDS
+        
+    Returns:
+        Batch[ClothesRead]: Found clothes in request order and the IDs that were not found
+    """
+    results, missing = await clothes_use_case.get_batch(ids)
+    return ModelJSONResponse(Batch[ClothesRead](results=results, missing=missing))
 
 
 @router.get("/{clothes_id}", response_model=ClothesRead, status_code=status.HTTP_200_OK)
@@ -98,7 +131,7 @@ async def get_clothes_detail(clothes_use_case: ClothesUseCaseDep, clothes_id: in
     Returns:
         ClothesRead: Clothing item details
     """
-    return await clothes_use_case.get_one_by_id(clothes_id)
+    return ModelJSONResponse(await clothes_use_case.get_one_by_id(clothes_id))
 
 
 @router.patch(
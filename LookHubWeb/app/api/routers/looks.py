@@ -1,15 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, Body, Depends, HTTPException, UploadFile, File, Form, Query
 from starlette import status
 import json
 import uuid
-from celery import Celery
+from pydantic import ValidationError
 
 from app.api.dependencies import LooksUseCaseDep, SecurityDep
-from app.api.routers.utils import create_enum_from_model
-from app.api.schemas import Paginated, ClothesData
+from app.api.responses import ModelJSONResponse
+from app.api.routers.utils import create_enum_from_model, batch_ids
+from app.api.uploads import spooled_uploads
+from app.api.schemas import Paginated, Batch, BulkCreated, ClothesData, Published
 from app.domain.entities.categories import ClothesCategoryCreate
-from app.domain.entities.looks import LookRead, LookCreate, LookUpdate
-from app.config import REDIS_HOST, REDIS_PORT
+from app.domain.entities.looks import LookRead, LookCreate, LookUpdate, LookDuplicate
+from app.config import IMAGE_DUPLICATE_MAX_DISTANCE, API_BULK_MAX_LOOKS, API_BATCH_MAX_IDS
+from app.infrastructure.tasks.producer import (
+    task_producer, SOCIAL_MEDIA_TASK, SOCIAL_MEDIA_QUEUE, SOCIAL_MEDIA_RETRY_POLICY,
+)
 
 # Router for looks-related endpoints
 router = APIRouter(prefix="/looks")
@@ -55,8 +60,68 @@ async def add_images_to_look(looks_use_case: LooksUseCaseDep,
         Returns:
             LookRead: Created look
         """
-    images = [image.file.read() for image in image_files]
-    return await looks_use_case.add_images(look_id, images)
+    async with spooled_uploads(image_files) as images:
+        return await looks_use_case.add_images(look_id, images)
+
+
+@router.post("/bulk", response_model=BulkCreated, status_code=status.HTTP_201_CREATED, dependencies=[SecurityDep])
+async def create_looks_bulk(looks_use_case: LooksUseCaseDep,
+                            looks: list[LookCreate] = Body(..., min_length=1, max_length=API_BULK_MAX_LOOKS)):
+    """Create several looks with their clothes categories in one transaction.
+    
+    Args:
+        looks_use_case (LooksUseCaseDep): Injected looks use case
+        looks (list[LookCreate]): Looks to create, category clothes given as IDs
+        
+    Returns:
+        BulkCreated: IDs of the created looks, in request order
+        
+    Raises:
+        HTTPException: 422 if category clothes are not given as IDs or do not exist
+    """
+    if any(not isinstance(clothes, int)
+           for look in looks for category in look.clothes_categories for clothes in category.clothes):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Category clothes must be given as IDs"
+        )
+    return BulkCreated(ids=await looks_use_case.add_many(looks))
+
+
+@router.post("/with_images",
+             response_model=LookRead,
+             status_code=status.HTTP_201_CREATED,
+             dependencies=[SecurityDep])
+async def create_look_with_images(looks_use_case: LooksUseCaseDep,
+                                  look: str = Form(...),
+                                  image_files: list[UploadFile] = File([])):
+    """Create a new look with its clothes categories and images in one request.
+    
+    Args:
+        looks_use_case (LooksUseCaseDep): Injected looks use case
+        look (str): JSON encoded data for the new look, category clothes given as IDs
+        image_files (list[UploadFile]): Image files of the look
+        
+    Returns:
+        LookRead: Created look
+        
+    Raises:
+        HTTPException: 422 if the look data is invalid or category clothes are not given as IDs
+    """
+    try:
+        look = LookCreate.model_validate_json(look)
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=e.errors(include_url=False, include_context=False)
+        )
+    if any(not isinstance(clothes, int) for category in look.clothes_categories for clothes in category.clothes):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Category clothes must be given as IDs"
+        )
+    async with spooled_uploads(image_files) as images:
+        return await looks_use_case.add_one_with_images(look, images)
 
 
 @router.post("/", response_model=LookRead, status_code=status.HTTP_201_CREATED, dependencies=[SecurityDep])
@@ -109,7 +174,22 @@ async def get_looks_list(
         checked=checked,
         pushed=pushed,
     )
-    return Paginated[LookRead](results=looks, count=total)
+    return ModelJSONResponse(Paginated[LookRead](results=looks, count=total))
+
+
+@router.get("/batch", response_model=Batch[LookRead], status_code=status.HTTP_200_OK)
+async def get_looks_batch(looks_use_case: LooksUseCaseDep, ids: list[int] = Depends(batch_ids)):
+    """Get several looks by ID with a single query.
+    
+    Args:
+        looks_use_case (LooksUseCaseDep): Injected looks use case
+        ids (list[int]): Comma-separated IDs, at most API_BATCH_MAX_IDS
+        
+    Returns:
+        Batch[LookRead]: Found looks in request order and the IDs that were not found
+    """
+    results, missing = await looks_use_case.get_batch(ids)
+    return ModelJSONResponse(Batch[LookRead](results=results, missing=missing))
 
 
 @router.get("/{look_id}", response_model=LookRead, status_code=status.HTTP_200_OK)
@@ -123,7 +203,26 @@ async def get_look_detail(looks_use_case: LooksUseCaseDep, look_id: int):
     Returns:
         LookRead: Look details
     """
-    return await looks_use_case.get_one_by_id(look_id)
+    return ModelJSONResponse(await looks_use_case.get_one_by_id(look_id))
+
+
+@router.get("/{look_id}/duplicates", response_model=list[LookDuplicate], status_code=status.HTTP_200_OK)
+async def get_look_duplicates(
+    looks_use_case: LooksUseCaseDep,
+    look_id: int,
+    max_distance: int = Query(IMAGE_DUPLICATE_MAX_DISTANCE, ge=0, le=32),
+):
+    """Find other looks with the same or nearly the same images.
+    
+    Args:
+        looks_use_case (LooksUseCaseDep): Injected looks use case
+        look_id (int): ID of the look
+        max_distance (int, optional): Maximum Hamming distance of perceptual hashes. Defaults to 10.
+        
+    Returns:
+        list[LookDuplicate]: Similar images of other looks, closest first
+    """
+    return ModelJSONResponse(await looks_use_case.find_duplicates(look_id, max_distance))
 
 
 @router.patch("/{look_id}", response_model=LookRead, status_code=status.HTTP_200_OK, dependencies=[SecurityDep])
@@ -218,6 +317,70 @@ async def remove_clothes_from_category(
     return {"message": "Вещь успешно удалена из категории"}
 
 
+def _publish_error(look: LookRead) -> str | None:
+    """Get the reason a look cannot be published.
+
+    Args:
+        look (LookRead): Look to publish
+
+    Returns:
+        str | None: Reason, None if the look can be published
+    """
+    if not look.checked:
+        return "Look must be checked before publishing"
+    if not look.image_urls:
+        return "Look must have images before publishing"
+    return None
+
+
+async def _send_to_social_media(looks: list[LookRead]) -> list[str]:
+    """Send looks to the SocialMediaPoster queue over one pooled broker connection.
+
+    Args:
+        looks (list[LookRead]): Looks to publish
+
+    Returns:
+        list[str]: Task IDs, in order of the looks
+    """
+    task_ids = [str(uuid.uuid4()) for _ in looks]
+    looks_data = [{**look.model_dump(mode="json"), "task_id": task_id} for look, task_id in zip(looks, task_ids)]
+    return await task_producer.send_many(
+        SOCIAL_MEDIA_TASK,
+        ([look_data] for look_data in looks_data),
+        queue=SOCIAL_MEDIA_QUEUE,
+        task_ids=task_ids,
+        retry_policy=SOCIAL_MEDIA_RETRY_POLICY,
+    )
+
+
+@router.post("/publish", response_model=Published, dependencies=[SecurityDep])
+async def publish_looks_to_social_media(
+    looks_use_case: LooksUseCaseDep,
+    look_ids: list[int] = Body(..., min_length=1, max_length=API_BATCH_MAX_IDS),
+):
+    """Publish several looks to social media platforms at once.
+    
+    Looks that do not exist or are not ready are reported and skipped, the
+    rest are sent together.
+    
+    Args:
+        looks_use_case (LooksUseCaseDep): Injected looks use case
+        look_ids (list[int]): IDs of the looks to publish
+        
+    Returns:
+        Published: Task IDs of the sent looks, missing and rejected looks
+    """
+    looks, missing = await looks_use_case.get_batch(look_ids)
+    rejected = {look.id: error for look in looks if (error := _publish_error(look))}
+    ready = [look for look in looks if look.id not in rejected]
+    task_ids = await _send_to_social_media(ready) if ready else []
+    return Published(
+        task_ids={look.id: task_id for look, task_id in zip(ready, task_ids)},
+        missing=missing,
+        rejected=rejected,
+    )
+
+
 @router.post("/{look_id}/publish", dependencies=[SecurityDep])
 async def publish_look_to_social_media(looks_use_case: LooksUseCaseDep, look_id: int):
     """Publish a look to social media platforms.
@@ -229,39 +392,16 @@ async def publish_look_to_social_media(looks_use_case: LooksUseCaseDep, look_id:
     Returns:
         dict: Success message with task_id
     """
-    # Get the look data
     look = await looks_use_case.get_one_by_id(look_id)
     
     # Check if look is ready for publishing
-    if not look.checked:
+    if error := _publish_error(look):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Look must be checked before publishing"
+            detail=error
         )
     
-    if not look.image_urls:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Look must have images before publishing"
-        )
-    
-    # Create Celery app for SocialMediaPoster
-    social_media_celery = Celery(
-        "social_media_poster",
-        broker=f"redis://{REDIS_HOST}:{REDIS_PORT}/0",
-        backend=f"redis://{REDIS_HOST}:{REDIS_PORT}/1"
-    )
-    
-    # Prepare look data for SocialMediaPoster
-    look_data = look.model_dump()
-    task_id = str(uuid.uuid4())
-    look_data['task_id'] = task_id
-    
-    # Send task to SocialMediaPoster
-    social_media_celery.send_task(
-        "src.tasks.post_to_social_media",
-        args=[look_data]
-    )
+    task_id, = await _send_to_social_media([look])
     
     return {
         "message": "Look sent to social media queue",
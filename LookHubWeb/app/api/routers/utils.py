@@ -1,7 +1,11 @@
 from enum import Enum
 from typing import get_origin, get_args
 
+from fastapi import HTTPException, Query
 from pydantic import BaseModel
+from starlette import status
+
+from app.config import API_BATCH_MAX_IDS
 
 
 def create_enum_from_model(model: type[BaseModel], enum_name: str) -> type[Enum]:
@@ -51,3 +55,30 @@ def create_enum_from_model(model: type[BaseModel], enum_name: str) -> type[Enum]
         sortable_fields[field_name] = field_name
 
     return Enum(enum_name, sortable_fields)
+
+
+def batch_ids(ids: str = Query(..., description="Comma-separated IDs", examples=["1,2,3"])) -> list[int]:
+    """Parse the IDs of a batch GET request.
+
+    Args:
+        ids (str): Comma-separated IDs
+
+    Returns:
+        list[int]: IDs in request order
+
+    Raises:
+        HTTPException: 422 if an ID is not an integer or there are too many IDs
+    """
+    try:
+        parsed = [int(item) for item in ids.split(",") if item.strip()]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="ids must be comma-separated integers",
+        )
+    if not parsed or len(parsed) > API_BATCH_MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"ids must contain 1 to {API_BATCH_MAX_IDS} IDs",
+        )
+    return parsed
@@ -1,4 +1,4 @@
-from typing import Generic, Type
+from typing import Any, Generic, Type
 
 from pydantic import BaseModel
 
@@ -21,6 +21,57 @@ class Paginated(BaseModel, Generic[EntityRead]):
     count: int
 
 
+class Batch(BaseModel, Generic[EntityRead]):
+    """Generic schema for batch GET responses.
+    
+    Type Parameters:
+        EntityRead: The type of entity being returned
+        
+    Attributes:
+        results (list[EntityRead]): Found entities in request order
+        missing (list[int]): Requested IDs that do not exist
+    """
+    results: list[EntityRead]
+    missing: list[int] = []
+
+
+class BulkCreated(BaseModel):
+    """Schema for bulk create responses.
+    
+    Attributes:
+        ids (list[int]): IDs of the created entities, in request order
+    """
+    ids: list[int]
+
+
+class Published(BaseModel):
+    """Schema for batch publish responses.
+    
+    Attributes:
+        task_ids (dict[int, str]): Task IDs of the sent looks by look ID
+        missing (list[int]): Requested IDs that do not exist
+        rejected (dict[int, str]): Reasons the remaining looks were not sent, by look ID
+    """
+    task_ids: dict[int, str]
+    missing: list[int] = []
+    rejected: dict[int, str] = {}
+
+
+class Job(BaseModel):
+    """Schema for background job responses.
+    
+    Attributes:
+        job_id (str): ID of the job
+        status (str): "pending", "started", "retry", "success" or "failure"
+        result (Any): Result of a successful job
+        error (str | None): Error of a failed job
+    """
+    job_id: str
+    status: str = "pending"
+    result: Any = None
+    error: str | None = None
+
+
 class ClothesData(BaseModel):
     """Schema for clothes data in API requests.
     
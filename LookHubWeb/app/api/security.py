@@ -1,25 +1,27 @@
 from fastapi import HTTPException, status, Security
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import jwt, JWTError
-from app.config import SECRET_KEY, ALGORITHM
+from jose import JWTError
+
+from app.infrastructure.auth import decode_token
 
 bearer_scheme = HTTPBearer()
 
 
-def verify_api_token(credentials: HTTPAuthorizationCredentials = Security(bearer_scheme)):
+async def verify_api_token(credentials: HTTPAuthorizationCredentials = Security(bearer_scheme)):
     """Checks JWT token from Authorization header for API.
     
+    Already verified tokens are served from the in-process token cache.
+    
     Args:
         credentials (HTTPAuthorizationCredentials): Bearer token from header
     
     Raises:
-        HTTPException: 401 if token is missing or invalid
+        HTTPException: 401 if token is missing, invalid or revoked
     """
     token = credentials.credentials
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = await decode_token(token)
         if payload.get("sub") != "api_client":
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token subject")
     except JWTError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-
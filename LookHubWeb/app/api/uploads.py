@@ -0,0 +1,184 @@
+import asyncio
+import hashlib
+import uuid
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable
+
+import orjson
+from fastapi import UploadFile
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.api.admission import classify_request
+from app.application.exceptions import FileTooLargeError
+from app.config import (
+    UPLOAD_SPOOL_DIR,
+    UPLOAD_CHUNK_SIZE,
+    UPLOAD_FORM_OVERHEAD_BYTES,
+    UPLOAD_MAX_FILE_BYTES,
+    UPLOAD_MAX_REQUEST_BYTES,
+)
+from app.domain.entities.images import ImageUpload
+
+
+async def spool_upload(
+    upload: UploadFile, max_bytes: int = UPLOAD_MAX_FILE_BYTES
+) -> ImageUpload:
+    """Copy an uploaded file in chunks to the spool directory.
+
+    The multipart parser has already received the file into its own
+    temporary file; the request size is capped while receiving by
+    ``UploadSizeLimitMiddleware``. The file is hashed while it is copied, so
+    its contents are never held in memory at once.
+
+    Args:
+        upload (UploadFile): Uploaded file
+        max_bytes (int): Maximum allowed file size
+
+    Returns:
+        ImageUpload: Spooled file with its size and SHA-256 digest
+
+    Raises:
+        FileTooLargeError: If the file exceeds max_bytes
+    """
+    path = UPLOAD_SPOOL_DIR / f"{uuid.uuid4()}.upload"
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(path, "wb") as spool_file:
+            while chunk := await upload.read(UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise FileTooLargeError(max_bytes)
+                digest.update(chunk)
+                await asyncio.to_thread(spool_file.write, chunk)
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+    return ImageUpload(path=path, size=size, sha256=digest.hexdigest())
+
+
+@asynccontextmanager
+async def spooled_uploads(
+    uploads: list[UploadFile], max_request_bytes: int = UPLOAD_MAX_REQUEST_BYTES
+) -> AsyncIterator[list[ImageUpload]]:
+    """Spool uploaded files to disk and remove them when the block exits.
+
+    Args:
+        uploads (list[UploadFile]): Uploaded files
+        max_request_bytes (int): Maximum total size of all files
+
+    Yields:
+        list[ImageUpload]: Spooled files in upload order
+
+    Raises:
+        FileTooLargeError: If a file or all files together exceed the limits
+    """
+    spooled: list[ImageUpload] = []
+    try:
+        total = 0
+        for upload in uploads:
+            remaining = max_request_bytes - total
+            try:
+                image = await spool_upload(
+                    upload, min(UPLOAD_MAX_FILE_BYTES, remaining)
+                )
+            except FileTooLargeError:
+                if remaining < UPLOAD_MAX_FILE_BYTES:
+                    raise FileTooLargeError(max_request_bytes)
+                raise
+            spooled.append(image)
+            total += image.size
+        yield spooled
+    finally:
+        for image in spooled:
+            await asyncio.to_thread(image.path.unlink, missing_ok=True)
+
+
+class UploadSizeLimitMiddleware:
+    """ASGI middleware that caps the size of upload request bodies while they arrive.
+
+    The multipart parser stores the whole body before a route runs, so the
+    limits of ``spooled_uploads`` alone apply only after a large body has been
+    received. This middleware answers 413 at once when ``Content-Length`` is
+    over the limit. A body without one is read until it grows past the
+    limit; then the 413 is sent from here and the app is told that the client
+    disconnected, so it stops instead of waiting for more body. The per-file
+    limit is still checked while spooling.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        max_body_bytes: int = UPLOAD_MAX_REQUEST_BYTES + UPLOAD_FORM_OVERHEAD_BYTES,
+        classify: Callable[[str, str], str | None] = classify_request,
+    ):
+        """Initialize the middleware.
+
+        Args:
+            app (ASGIApp): Wrapped application
+            max_body_bytes (int): Maximum size of an upload request body
+            classify (Callable[[str, str], str | None]): Maps method and path to a route class
+        """
+        self.app = app
+        self.max_body_bytes = max_body_bytes
+        self.classify = classify
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or self.classify(scope["method"], scope["path"]) != "upload"
+        ):
+            await self.app(scope, receive, send)
+            return
+        content_length = dict(scope["headers"]).get(b"content-length")
+        if content_length is not None and content_length.isdigit():
+            if int(content_length) > self.max_body_bytes:
+                await self._reject(send)
+                return
+
+        received = 0
+        rejected = False
+        response_started = False
+
+        async def limited_receive() -> Message:
+            nonlocal received, rejected
+            if rejected:
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_bytes:
+                    rejected = True
+                    if not response_started:
+                        await self._reject(send)
+                    # The app sees the client as gone, so the deadline middleware
+                    # cancels it and the admission slot is released
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def limited_send(message: Message) -> None:
+            nonlocal response_started
+            # The client already got the 413
+            if rejected:
+                return
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        await self.app(scope, limited_receive, limited_send)
+
+    async def _reject(self, send: Send) -> None:
+        """Answer with 413 Content Too Large without reading the body."""
+        body = orjson.dumps({"detail": FileTooLargeError(self.max_body_bytes).args})
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 413,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"connection", b"close"),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
@@ -113,6 +113,19 @@ class CRUDUseCase(Generic[EntityCreate, EntityUpdate, EntityRead]):
         clothes = await self.repository.get_list_by_ids(ids)
         return [self._entity_read.model_validate(item) for item in clothes]
 
+    async def get_batch(self, ids: list[int]) -> tuple[list[EntityRead], list[int]]:
+        """Get entities by their IDs with a single query, in request order.
+
+        Args:
+            ids (list[int]): Entity IDs, duplicates are returned once
+
+        Returns:
+            tuple[list[EntityRead], list[int]]: Found entities in request order and IDs that were not found
+        """
+        ids = list(dict.fromkeys(ids))
+        found = {item.id: item for item in await self.get_list_by_ids(ids)}
+        return [found[i] for i in ids if i in found], [i for i in ids if i not in found]
+
     async def update_one(self, instance_id: int, data: EntityUpdate) -> EntityRead:
         """Update an existing entity.
         
@@ -18,3 +18,44 @@ class UnknownError(Exception):
     def __init__(self):
         super().__init__('Unknown error')
 
+
+
+class FileTooLargeError(Exception):
+    """Error should raise when an uploaded file or request exceeds the size limit"""
+    def __init__(self, limit: int):
+        self.limit = limit
+        super().__init__(f'Upload exceeds the limit of {limit} bytes')
+
+
+class ImageTooLargeError(Exception):
+    """Error should raise when an uploaded image has more pixels than allowed"""
+    def __init__(self, max_pixels: int):
+        self.max_pixels = max_pixels
+        super().__init__(f'Image exceeds the limit of {max_pixels} pixels')
+
+
+class ClothesNotFoundError(Exception):
+    """Error should raise when looks refer to clothes that do not exist"""
+    def __init__(self, clothes_ids: list[int]):
+        self.clothes_ids = clothes_ids
+        super().__init__(f'Clothes not found: {", ".join(map(str, clothes_ids))}')
+
+
+class ProductPageError(Exception):
+    """Error should raise when a product page cannot be fetched or parsed"""
+    def __init__(self, url: str, reason: str):
+        self.url = url
+        self.reason = reason
+        super().__init__(f'Cannot ingest product page {url}: {reason}')
+
+
+class AuthUnavailableError(Exception):
+    """Error should raise when token revocation cannot be checked or stored"""
+    def __init__(self):
+        super().__init__('Token revocation is unavailable, retry later')
+
+
+class RequestTimeoutError(Exception):
+    """Error should raise when a request runs past its deadline"""
+    def __init__(self):
+        super().__init__('Request deadline exceeded')
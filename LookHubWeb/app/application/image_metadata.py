@@ -0,0 +1,169 @@
+import math
+
+from PIL import Image as PILImage
+from PIL.Image import Image
+
+from app.domain.entities.images import ImageMetadata
+
+BLURHASH_CHARACTERS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz#$%*+,-.:;=?@[]^_{|}~"
+BLURHASH_COMPONENTS = (4, 3)  # Horizontal and vertical components of the placeholder
+SAMPLE_SIZE = 32  # Long edge of the image the placeholder and colour are computed from
+DHASH_SIZE = 8  # Rows and columns of compared pixels, giving a 64-bit hash
+
+
+def _encode83(value: int, length: int) -> str:
+    return "".join(
+        BLURHASH_CHARACTERS[value // 83 ** (length - i - 1) % 83] for i in range(length)
+    )
+
+
+def _srgb_to_linear(value: int) -> float:
+    value = value / 255
+    return value / 12.92 if value <= 0.04045 else ((value + 0.055) / 1.055) ** 2.4
+
+
+def _linear_to_srgb(value: float) -> int:
+    value = min(max(value, 0.0), 1.0)
+    if value <= 0.0031308:
+        return int(value * 12.92 * 255 + 0.5)
+    return int((1.055 * value ** (1 / 2.4) - 0.055) * 255 + 0.5)
+
+
+def blurhash(image: Image, components: tuple[int, int] = BLURHASH_COMPONENTS) -> str:
+    """Encode a small RGB image as a BlurHash placeholder string.
+
+    Args:
+        image (Image): RGB image, a few dozen pixels on each side
+        components (tuple[int, int]): Number of horizontal and vertical components
+
+    Returns:
+        str: BlurHash string
+    """
+    x_components, y_components = components
+    width, height = image.size
+    linear = [
+        tuple(_srgb_to_linear(channel) for channel in pixel)
+        for pixel in image.getdata()
+    ]
+    cos_x = [
+        [math.cos(math.pi * i * x / width) for x in range(width)]
+        for i in range(x_components)
+    ]
+    cos_y = [
+        [math.cos(math.pi * j * y / height) for y in range(height)]
+        for j in range(y_components)
+    ]
+
+    factors = []
+    for j in range(y_components):
+        for i in range(x_components):
+            normalisation = 1 if i == 0 and j == 0 else 2
+            r = g = b = 0.0
+            for y in range(height):
+                row = y * width
+                for x in range(width):
+                    basis = cos_x[i][x] * cos_y[j][y]
+                    pixel = linear[row + x]
+                    r += basis * pixel[0]
+                    g += basis * pixel[1]
+                    b += basis * pixel[2]
+            scale = normalisation / (width * height)
+            factors.append((r * scale, g * scale, b * scale))
+
+    dc, ac = factors[0], factors[1:]
+    result = _encode83((x_components - 1) + (y_components - 1) * 9, 1)
+    if ac:
+        actual_max = max(abs(value) for factor in ac for value in factor)
+        quantised_max = max(0, min(82, int(actual_max * 166 - 0.5)))
+        max_value = (quantised_max + 1) / 166
+        result += _encode83(quantised_max, 1)
+    else:
+        max_value = 1
+        result += _encode83(0, 1)
+
+    result += _encode83(
+        (_linear_to_srgb(dc[0]) << 16)
+        + (_linear_to_srgb(dc[1]) << 8)
+        + _linear_to_srgb(dc[2]),
+        4,
+    )
+
+    def quantise(value: float) -> int:
+        return max(
+            0,
+            min(18, int(math.copysign(abs(value / max_value) ** 0.5, value) * 9 + 9.5)),
+        )
+
+    for factor in ac:
+        result += _encode83(
+            quantise(factor[0]) * 19 * 19
+            + quantise(factor[1]) * 19
+            + quantise(factor[2]),
+            2,
+        )
+    return result
+
+
+def dominant_color(image: Image) -> str:
+    """Find the most frequent colour of a small RGB image after quantisation.
+
+    Args:
+        image (Image): RGB image, a few dozen pixels on each side
+
+    Returns:
+        str: Colour as "#rrggbb"
+    """
+    palette_image = image.quantize(colors=8, method=PILImage.Quantize.MEDIANCUT)
+    palette = palette_image.getpalette()
+    _, index = max(palette_image.getcolors())
+    r, g, b = palette[index * 3 : index * 3 + 3]
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+
+def dhash(image: Image) -> str:
+    """Compute the 64-bit difference hash of an image.
+
+    Near-identical images, such as re-encoded or resized copies, get hashes
+    within a small Hamming distance of each other.
+
+    Args:
+        image (Image): Decoded image or any downscaled derivative of it
+
+    Returns:
+        str: Hash as 16 hex digits
+    """
+    pixels = list(
+        image.convert("L")
+        .resize((DHASH_SIZE + 1, DHASH_SIZE), PILImage.Resampling.LANCZOS)
+        .getdata()
+    )
+    value = 0
+    for y in range(DHASH_SIZE):
+        row = y * (DHASH_SIZE + 1)
+        for x in range(DHASH_SIZE):
+            value = value << 1 | (pixels[row + x] > pixels[row + x + 1])
+    return f"{value:016x}"
+
+
+def extract_metadata(image: Image, size: tuple[int, int]) -> ImageMetadata:
+    """Compute layout and placeholder metadata of an image.
+
+    The placeholder and colour are computed from a tiny downscaled copy, so
+    the cost does not depend on the image size.
+
+    Args:
+        image (Image): Decoded image or any downscaled derivative of it
+        size (tuple[int, int]): Width and height of the stored full-size image
+
+    Returns:
+        ImageMetadata: Dimensions, dominant colour, BlurHash and perceptual hash of the image
+    """
+    sample = image.convert("RGB")
+    sample.thumbnail((SAMPLE_SIZE, SAMPLE_SIZE), PILImage.Resampling.BILINEAR)
+    return ImageMetadata(
+        width=size[0],
+        height=size[1],
+        dominant_color=dominant_color(sample),
+        blurhash=blurhash(sample),
+        dhash=dhash(image),
+    )
@@ -1,9 +1,11 @@
 import abc
-from typing import Any
+from pathlib import Path
+from typing import Any, Awaitable, Callable
 
 
-from app.domain.entities.clothes import ClothesRead
+from app.domain.entities.clothes import ClothesRead, ClothesCreate
 from app.domain.entities.enums import GenderEnum
+from app.domain.entities.images import EncodedImage
 from app.domain.entities.looks import LookCreate
 
 
@@ -115,6 +117,38 @@ class LooksRepositoryInterface(BaseRepositoryInterface, abc.ABC):
         """
         raise NotImplementedError
 
+    @abc.abstractmethod
+    async def add_many(self, looks: list[dict[str, Any]]) -> list[int]:
+        """Create looks with their clothes categories and image references in one transaction.
+        
+        Args:
+            looks (list[dict[str, Any]]): Look data, each with a "clothes_categories" list
+                of {"name": str, "clothes": list[int]}
+            
+        Returns:
+            list[int]: IDs of the created looks, in input order
+            
+        Raises:
+            ClothesNotFoundError: If categories refer to clothes that do not exist
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def update_with_images(
+        self, instance_id: int, data: dict[str, Any]
+    ) -> tuple[dict[str, Any], list[str]]:
+        """Update a look and move its image references in the same transaction.
+        
+        Args:
+            instance_id (int): ID of the look to update
+            data (dict[str, Any]): Field values to update, including "image_urls"
+            
+        Returns:
+            tuple[dict[str, Any], list[str]]: Updated look data and keys that have no
+                references left and whose files can be removed
+        """
+        raise NotImplementedError
+
     async def add_clothes_to_clothes_category(
         self, category_id: int, clothes_id: int
     ) -> dict[str, Any]:
@@ -156,3 +190,298 @@ class LooksRepositoryInterface(BaseRepositoryInterface, abc.ABC):
             dict[str, Any]: Updated look data
         """
         raise NotImplementedError
+
+    @abc.abstractmethod
+    async def release_images(self, keys: list[str]) -> list[str]:
+        """Remove one reference per given key from stored images.
+
+        Args:
+            keys (list[str]): Storage names of the images, repeated once per reference
+
+        Returns:
+            list[str]: Keys that have no references left, to be passed to
+                ``purge_released_images``
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def reserve_image(self, key: str) -> bool:
+        """Keep a registered image from being deleted before it is referenced again.
+
+        Args:
+            key (str): Storage name of the image
+
+        Returns:
+            bool: True if the image is registered and kept, False if its files
+                have to be stored again
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def purge_released_images(
+        self,
+        keys: list[str],
+        remove_files: Callable[[list[str]], Awaitable[set[str]]],
+    ) -> list[str]:
+        """Remove the files of released images that are still unused, then unregister them.
+
+        Args:
+            keys (list[str]): Storage names of released images
+            remove_files (Callable[[list[str]], Awaitable[set[str]]]): Coroutine function
+                removing the files of the given images and returning those it failed for
+
+        Returns:
+            list[str]: Keys whose files were removed
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def save_image_metadata(self, key: str, metadata: dict[str, Any]) -> None:
+        """Store metadata of a stored image, registering the image if it is new.
+
+        Args:
+            key (str): Storage name of the image
+            metadata (dict[str, Any]): Image metadata fields
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def get_image_metadata(self, keys: list[str]) -> dict[str, dict[str, Any]]:
+        """Get stored metadata of images.
+
+        Args:
+            keys (list[str]): Storage names of the images
+
+        Returns:
+            dict[str, dict[str, Any]]: Metadata by storage name, for images that have it
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def get_image_hashes(self, after_id: int = 0) -> list[tuple[int, str, str]]:
+        """Get perceptual hashes of images registered after the given row.
+
+        Args:
+            after_id (int): ID of the last image row already seen
+
+        Returns:
+            list[tuple[int, str, str]]: (row id, storage name, hash) in id order
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def get_look_ids_by_images(self, keys: list[str]) -> dict[str, list[int]]:
+        """Find the looks that contain any of the given images.
+
+        Args:
+            keys (list[str]): Storage names of full-size images
+
+        Returns:
+            dict[str, list[int]]: Look IDs by storage name, for images used by any look
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def referenced_images(self, keys: list[str], grace_seconds: int = 0) -> set[str]:
+        """Find which of the given images are still referenced by any look.
+
+        Args:
+            keys (list[str]): Storage names of full-size images
+            grace_seconds (int): How long a registration or reservation keeps an image
+
+        Returns:
+            set[str]: Subset of keys that are in use
+        """
+        raise NotImplementedError
+
+
+class ImageProcessorInterface(abc.ABC):
+    """Interface for CPU-bound image decoding and encoding.
+
+    Implementations take raw uploaded bytes or a spooled upload file and return the
+    encoded derivatives, so the work can run outside the event loop's process.
+    """
+
+    @abc.abstractmethod
+    async def encode_image(self, source: bytes | Path) -> EncodedImage:
+        """Decode an uploaded image, encode all its derivatives and extract its metadata.
+
+        Args:
+            source (bytes | Path): Raw image bytes or path of a spooled upload
+
+        Returns:
+            EncodedImage: Encoded derivatives and image metadata
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def resize(self, source: Path, width: int | None, height: int | None, fmt: str) -> bytes:
+        """Downscale a stored image to fit the given box and encode it.
+
+        Args:
+            source (Path): Path of the stored image
+            width (int | None): Maximum width, unbounded if None
+            height (int | None): Maximum height, unbounded if None
+            fmt (str): Output format
+
+        Returns:
+            bytes: Encoded image
+        """
+        raise NotImplementedError
+
+
+class ImageStorageInterface(abc.ABC):
+    """Interface for the storage of image files.
+
+    Images are addressed by storage keys such as "ab/cd/<sha256>.webp" and are
+    publicly available under ``public_base_url``.
+    """
+
+    @property
+    @abc.abstractmethod
+    def public_base_url(self) -> str:
+        """Get the URL prefix under which stored images are publicly served.
+
+        Returns:
+            str: URL prefix ending with a slash
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def exists(self, key: str) -> bool:
+        """Check whether an image is stored.
+
+        Args:
+            key (str): Storage key of the image
+
+        Returns:
+            bool: True if the image exists
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def save(self, key: str, data: bytes) -> None:
+        """Store an image, replacing it atomically if it exists.
+
+        Args:
+            key (str): Storage key of the image
+            data (bytes): Encoded image bytes
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def delete(self, key: str) -> bool:
+        """Delete an image.
+
+        Args:
+            key (str): Storage key of the image
+
+        Returns:
+            bool: True if the image existed and was deleted
+        """
+        raise NotImplementedError
+
+    async def delete_many(self, keys: list[str]) -> list[str]:
+        """Delete several images, continuing past failures.
+
+        Args:
+            keys (list[str]): Storage keys of the images
+
+        Returns:
+            list[str]: Keys that could not be deleted
+        """
+        failed = []
+        for key in keys:
+            try:
+                await self.delete(key)
+            except Exception:
+                failed.append(key)
+        return failed
+
+    async def close(self) -> None:
+        """Release connections held by the storage."""
+
+
+class ImageDeletionQueueInterface(abc.ABC):
+    """Interface for deleting image files after the response is sent."""
+
+    @abc.abstractmethod
+    def enqueue(self, image_names: list[str]) -> None:
+        """Schedule released images and all their derivatives for deletion.
+
+        Args:
+            image_names (list[str]): Storage names of full-size images
+        """
+        raise NotImplementedError
+
+
+class ImageHashIndexInterface(abc.ABC):
+    """Interface for a searchable index of perceptual image hashes."""
+
+    @abc.abstractmethod
+    async def sync(self, repository: LooksRepositoryInterface) -> None:
+        """Add images registered since the last sync to the index.
+
+        Args:
+            repository (LooksRepositoryInterface): Repository to read image hashes from
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def add(self, name: str, image_hash: str) -> None:
+        """Add a newly stored image to the index.
+
+        Args:
+            name (str): Storage name of the image
+            image_hash (str): Perceptual hash as hex digits
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def search(self, image_hash: str, max_distance: int) -> list[tuple[str, int]]:
+        """Find images whose hash is within a Hamming distance of the given one.
+
+        Args:
+            image_hash (str): Perceptual hash as hex digits
+            max_distance (int): Maximum Hamming distance
+
+        Returns:
+            list[tuple[str, int]]: Storage names with their distances
+        """
+        raise NotImplementedError
+
+
+class ProductPageFetcherInterface(abc.ABC):
+    """Interface for fetching product pages of online shops."""
+
+    @abc.abstractmethod
+    async def fetch(self, url: str) -> str:
+        """Fetch the HTML of a product page.
+
+        Args:
+            url (str): URL of the product page
+
+        Returns:
+            str: HTML of the page
+        """
+        raise NotImplementedError
+
+
+class ProductExtractorInterface(abc.ABC):
+    """Interface for extracting clothes data from product pages."""
+
+    @abc.abstractmethod
+    def extract(self, url: str, html: str) -> ClothesCreate:
+        """Extract a clothing item from the HTML of its product page.
+
+        Args:
+            url (str): URL of the product page
+            html (str): HTML of the page
+
+        Returns:
+            ClothesCreate: Data of the clothing item
+
+        Raises:
+            ProductPageError: If the page does not describe a product
+        """
+        raise NotImplementedError
@@ -1,14 +1,23 @@
 import asyncio
+import time
+from itertools import islice
+from pathlib import PurePosixPath
 
-from PIL import Image, UnidentifiedImageError
-from io import BytesIO
+from PIL import UnidentifiedImageError
+from PIL.Image import DecompressionBombError
 
 from app.application.base_use_cases import CRUDUseCase
-from app.application.exceptions import InvalidFileError, UnknownError
+from app.application.exceptions import InvalidFileError, UnknownError, ImageTooLargeError
 from app.application.interfaces import (
-    LooksRepositoryInterface, BaseRepositoryInterface,
+    LooksRepositoryInterface, BaseRepositoryInterface, ImageProcessorInterface,
+    ImageDeletionQueueInterface, ImageHashIndexInterface, ProductPageFetcherInterface,
+    ProductExtractorInterface,
 )
-from app.application.utils import save_image, delete_image
+from app.application.utils import (
+    save_derivatives, delete_image, encode_image_source, image_exists,
+    iter_image_files, remove_image_files,
+)
+from app.config import IMAGE_GC_GRACE_SECONDS, IMAGE_GC_BATCH_SIZE, IMAGE_DUPLICATE_MAX_DISTANCE, IMAGE_MAX_PIXELS
 from app.domain.entities.categories import ClothesCategory, ClothesCategoryCreate
 from app.domain.entities.clothes import (
     ClothesCreate,
@@ -17,7 +26,10 @@ from app.domain.entities.clothes import (
     Clothes,
 )
 from app.domain.entities.enums import GenderEnum
-from app.domain.entities.looks import LookCreate, LookUpdate, LookRead
+from app.domain.entities.images import (
+    EncodedImage, ImageMetadata, ImageUpload, content_key, source_name,
+)
+from app.domain.entities.looks import LookCreate, LookUpdate, LookRead, LookDuplicate
 
 import logging
 
@@ -41,14 +53,36 @@ class ClothesUseCase(CRUDUseCase[ClothesCreate, ClothesUpdate, ClothesRead]):
     def __init__(
         self,
         clothes_repository: BaseRepositoryInterface,
+        page_fetcher: ProductPageFetcherInterface | None = None,
+        product_extractor: ProductExtractorInterface | None = None,
     ):
         """Initialize the clothes use case.
         
         Args:
             clothes_repository (ClothesRepositoryInterface): Repository for clothes data
+            page_fetcher (ProductPageFetcherInterface | None): Fetcher of shop product pages
+            product_extractor (ProductExtractorInterface | None): Parser of clothes data from product pages
         """
         super().__init__(clothes_repository)
         self.clothes_repository = clothes_repository
+        self.page_fetcher = page_fetcher
+        self.product_extractor = product_extractor
+
+    async def add_one_from_link(self, link: str) -> ClothesRead:
+        """Create a clothing item from the product page of an online shop.
+        
+        Args:
+            link (str): URL of the product page
+            
+        Returns:
+            ClothesRead: Created clothing item
+            
+        Raises:
+            ProductPageError: If the page cannot be fetched or does not describe a product
+        """
+        html = await self.page_fetcher.fetch(link)
+        clothes = self.product_extractor.extract(link, html)
+        return await self.add_one(clothes)
 
 
 class LooksUseCase(CRUDUseCase[LookCreate, LookUpdate, LookRead]):
@@ -69,30 +103,70 @@ class LooksUseCase(CRUDUseCase[LookCreate, LookUpdate, LookRead]):
         self,
         look_repository: LooksRepositoryInterface,
         clothes_repository: BaseRepositoryInterface,
+        image_processor: ImageProcessorInterface | None = None,
+        image_deletion_queue: ImageDeletionQueueInterface | None = None,
+        image_index: ImageHashIndexInterface | None = None,
     ):
         """Initialize the looks use case.
         
         Args:
             look_repository (LooksRepositoryInterface): Repository for looks data
             clothes_repository (ClothesRepositoryInterface): Repository for clothes data
+            image_processor (ImageProcessorInterface | None): Processor for uploaded images.
+                Images are processed in a thread if not provided.
+            image_deletion_queue (ImageDeletionQueueInterface | None): Queue for deleting
+                image files in the background. Files are deleted inline if not provided.
+            image_index (ImageHashIndexInterface | None): Index of perceptual image hashes,
+                required for finding duplicate looks.
         """
         super().__init__(look_repository)
         self.looks_repository = look_repository
         self.clothes_repository = clothes_repository
+        self.image_processor = image_processor
+        self.image_deletion_queue = image_deletion_queue
+        self.image_index = image_index
+
+    async def _encode_image(self, image: ImageUpload) -> EncodedImage:
+        """Decode a spooled upload, encode its derivatives and extract its metadata.
+
+        Args:
+            image (ImageUpload): Spooled uploaded image
+
+        Returns:
+            EncodedImage: Encoded derivatives and image metadata
+        """
+        if self.image_processor is None:
+            return await asyncio.to_thread(encode_image_source, image.path)
+        return await self.image_processor.encode_image(image.path)
 
     async def add_one(self, data: LookCreate) -> LookRead:
-        """Create a new entity.
+        """Create a new look.
+
+        The look is written like a bulk creation of one, so references to its
+        images are counted in the same transaction.
 
         Args:
-            data (EntityCreate): Data for creating the entity
+            data (LookCreate): Data of the new look; category clothes must be given as IDs
 
         Returns:
-            EntityRead: Created entity with full data
+            LookRead: Created look with full data
         """
-        instance = await self.repository.add_one(
-            data.model_dump(exclude_unset=True, exclude_defaults=True)
-        )
-        return self._entity_read.model_validate(instance)
+        look_id, = await self.looks_repository.add_many([data.model_dump()])
+        return await self.get_one_by_id(look_id)
+
+    async def add_many(self, data: list[LookCreate]) -> list[int]:
+        """Create several looks with their clothes categories in one transaction.
+
+        Args:
+            data (list[LookCreate]): Looks to create; category clothes must be given as IDs
+
+        Returns:
+            list[int]: IDs of the created looks, in input order
+
+        Raises:
+            ClothesNotFoundError: If categories refer to clothes that do not exist
+        """
+        return await self.looks_repository.add_many([look.model_dump() for look in data])
 
     async def add_clothes_categories(
         self, look_id: int, clothes_categories: list[ClothesCategoryCreate]
@@ -131,38 +205,99 @@ class LooksUseCase(CRUDUseCase[LookCreate, LookUpdate, LookRead]):
         )
         return LookRead.model_validate(look)
 
-    async def add_images(
-            self, look_id: int, images: list[bytes]) -> LookRead:
-        """Add images to look.
+    async def _store_images(
+        self, images: list[ImageUpload], known_metadata: dict[str, ImageMetadata] | None = None
+    ) -> tuple[list[str], dict[str, ImageMetadata]]:
+        """Process and store uploaded images in parallel, each distinct content once.
 
         Args:
-            look_id (int): ID of the look
-            images (list[bytes]): list of image files
+            images (list[ImageUpload]): list of spooled image uploads
+            known_metadata (dict[str, ImageMetadata] | None): Metadata already at hand,
+                not fetched again for images that were stored before
 
         Returns:
-            LookRead: Updated look with added images
+            tuple[list[str], dict[str, ImageMetadata]]: Storage names in upload order
+                and metadata of the stored images
         """
-        look = await self.get_one_by_id(look_id)
-        look_images = look.get_storage_paths()
+        known_metadata = known_metadata or {}
 
-        async def process_image(image_data: bytes) -> str:
+        async def process_image(image: ImageUpload) -> tuple[str, ImageMetadata | None]:
             try:
-                valid_image = await asyncio.to_thread(Image.open, BytesIO(image_data))
-                return await save_image(valid_image, str(look_id))
+                # Identical content is already stored under the same address,
+                # unless it was released and is being deleted
+                image_name = content_key(image.sha256)
+                if await image_exists(image_name) and await self.looks_repository.reserve_image(image_name):
+                    return image_name, None
+                encoded = await self._encode_image(image)
+                image_name = await save_derivatives(encoded.derivatives, image.sha256)
+                await self.looks_repository.save_image_metadata(image_name, encoded.metadata.model_dump())
+                if self.image_index is not None and encoded.metadata.dhash:
+                    self.image_index.add(image_name, encoded.metadata.dhash)
+                return image_name, encoded.metadata
             except UnidentifiedImageError as e:
                 raise InvalidFileError from e
+            except DecompressionBombError as e:
+                raise ImageTooLargeError(IMAGE_MAX_PIXELS) from e
             except Exception as e:
                 raise UnknownError from e
 
-        # Параллельная обработка всех изображений
-        results = await asyncio.gather(*(process_image(img) for img in images))
-        look_images.extend(results)
+        # Параллельная обработка всех изображений, одинаковые файлы обрабатываются один раз
+        unique_images = list({image.sha256: image for image in images}.values())
+        results = await asyncio.gather(*(process_image(img) for img in unique_images))
+        names = {image.sha256: name for image, (name, _) in zip(unique_images, results)}
+
+        # Metadata of already stored images was saved by their first upload
+        image_metadata = {name: metadata for name, metadata in results if metadata}
+        stored = [name for name, metadata in results if not metadata and name not in known_metadata]
+        if stored:
+            for name, metadata in (await self.looks_repository.get_image_metadata(stored)).items():
+                image_metadata[name] = ImageMetadata(**metadata)
+        return [names[image.sha256] for image in images], image_metadata
+
+    async def add_images(
+            self, look_id: int, images: list[ImageUpload]) -> LookRead:
+        """Add images to look.
+
+        Args:
+            look_id (int): ID of the look
+            images (list[ImageUpload]): list of spooled image uploads
+
+        Returns:
+            LookRead: Updated look with added images
+        """
+        look = await self.get_one_by_id(look_id)
+        names, image_metadata = await self._store_images(images, look.image_metadata)
 
         updated_look = await self.update_one(
-            look_id, data=LookUpdate(image_urls=look_images)
+            look_id,
+            data=LookUpdate(
+                image_urls=[*look.get_storage_paths(), *names],
+                image_metadata={**look.image_metadata, **image_metadata},
+            ),
         )
         return updated_look
 
+    async def add_one_with_images(self, data: LookCreate, images: list[ImageUpload]) -> LookRead:
+        """Create a look with its clothes categories and images at once.
+
+        The images are processed in parallel, then the look, its categories and
+        its image references are written in a single transaction.
+
+        Args:
+            data (LookCreate): Data of the new look; category clothes must be given as IDs
+            images (list[ImageUpload]): list of spooled image uploads, appended to data.image_urls
+
+        Returns:
+            LookRead: Created look with full data
+        """
+        names, image_metadata = await self._store_images(images, data.image_metadata)
+        look = data.model_copy(update={
+            "image_urls": [*data.image_urls, *names],
+            "image_metadata": {**data.image_metadata, **image_metadata},
+        })
+        look_id, = await self.looks_repository.add_many([look.model_dump()])
+        return await self.get_one_by_id(look_id)
+
     async def delete_clothes_category(
         self, look_id: int, clothes_category_id: int
     ) -> LookRead:
@@ -198,15 +333,132 @@ class LooksUseCase(CRUDUseCase[LookCreate, LookUpdate, LookRead]):
         )
         return LookRead.model_validate(look)
 
-    @staticmethod
-    async def _delete_images(image_paths: list[str]) -> None:
-        """Delete image files from storage.
+    async def _delete_images(self, image_paths: list[str]) -> None:
+        """Release image references and delete files that are no longer referenced.
         
         Args:
-            image_paths (list[str]): List of image paths to delete
+            image_paths (list[str]): List of image paths to release, once per reference
+        """
+        released = await self.looks_repository.release_images(image_paths)
+        await self._remove_images(released)
+
+    async def _remove_images(self, released: list[str]) -> None:
+        """Delete files of images that have no references left.
+
+        Images reused since their release are kept, see ``purge_released_images``.
+
+        Args:
+            released (list[str]): Storage names of the released images
+        """
+        if self.image_deletion_queue is not None:
+            self.image_deletion_queue.enqueue(released)
+            return
+
+        async def remove_files(image_paths: list[str]) -> set[str]:
+            # Errors are logged by delete_image, leftovers go to the orphan collector
+            for image_path in image_paths:
+                await delete_image(image_path)
+            return set()
+
+        await self.looks_repository.purge_released_images(released, remove_files)
+
+    async def collect_orphan_images(
+        self,
+        grace_seconds: int = IMAGE_GC_GRACE_SECONDS,
+        batch_size: int = IMAGE_GC_BATCH_SIZE,
+    ) -> dict[str, int]:
+        """Delete stored image files that no look refers to.
+
+        The upload directory is walked lazily and checked against the database one
+        batch at a time, so memory use does not grow with the number of files.
+        Files younger than the grace period are kept, as they may belong to an
+        upload whose look is not updated yet. So are images reserved within the
+        grace period for an upload of content that was already stored.
+
+        Args:
+            grace_seconds (int): Minimum age of a file to be deleted
+            batch_size (int): Number of files checked at a time
+
+        Returns:
+            dict[str, int]: Numbers of scanned and deleted files and reclaimed bytes
         """
-        for image_path in image_paths:
-            await delete_image(image_path)
+        files = iter_image_files()
+        cutoff = time.time() - grace_seconds
+        stats = {"scanned": 0, "deleted": 0, "reclaimed_bytes": 0}
+
+        while batch := await asyncio.to_thread(lambda: list(islice(files, batch_size))):
+            stats["scanned"] += len(batch)
+            expired = [file.key for file in batch if file.mtime < cutoff]
+            # Hidden files are leftovers of interrupted writes
+            sources = {
+                key: source_name(key)
+                for key in expired
+                if not PurePosixPath(key).name.startswith(".")
+            }
+            referenced = (
+                await self.looks_repository.referenced_images(list(set(sources.values())), grace_seconds)
+                if sources else set()
+            )
+            orphans = [key for key in expired if sources.get(key) not in referenced]
+            if orphans:
+                stats["reclaimed_bytes"] += await asyncio.to_thread(remove_image_files, orphans)
+                stats["deleted"] += len(orphans)
+
+        logger.info(
+            f"Collected orphan images: scanned={stats['scanned']}, deleted={stats['deleted']}, "
+            f"reclaimed={stats['reclaimed_bytes']} bytes"
+        )
+        return stats
+
+    async def find_duplicates(
+        self, look_id: int, max_distance: int = IMAGE_DUPLICATE_MAX_DISTANCE
+    ) -> list[LookDuplicate]:
+        """Find other looks with images that look like the images of a look.
+
+        Images are compared by the Hamming distance of their perceptual hashes,
+        so re-encoded, resized or slightly edited copies are found as well.
+        Images without a stored hash are skipped.
+
+        Args:
+            look_id (int): ID of the look
+            max_distance (int): Maximum Hamming distance of similar images
+
+        Returns:
+            list[LookDuplicate]: Similar images of other looks, closest first
+
+        Raises:
+            RuntimeError: If the use case was created without an image index
+        """
+        if self.image_index is None:
+            raise RuntimeError("Finding duplicates requires an image hash index")
+        look = await self.get_one_by_id(look_id)
+        own_images = set(look.get_storage_paths())
+        hashes = {
+            name: metadata.dhash
+            for name, metadata in look.image_metadata.items()
+            if name in own_images and metadata.dhash
+        }
+        if not hashes:
+            return []
+
+        matches = {
+            (image, match): distance
+            for image, image_hash in hashes.items()
+            for match, distance in self.image_index.search(image_hash, max_distance)
+        }
+        if not matches:
+            return []
+
+        looks_by_image = await self.looks_repository.get_look_ids_by_images(
+            list({match for _, match in matches})
+        )
+        duplicates = [
+            LookDuplicate(look_id=other_id, image=image, duplicate_image=match, distance=distance)
+            for (image, match), distance in matches.items()
+            for other_id in looks_by_image.get(match, [])
+            if other_id != look_id
+        ]
+        return sorted(duplicates, key=lambda duplicate: (duplicate.distance, duplicate.look_id))
 
     async def delete_one(self, instance_id: int) -> bool:
         """Delete a look and its associated images.
@@ -218,9 +470,10 @@ class LooksUseCase(CRUDUseCase[LookCreate, LookUpdate, LookRead]):
             bool: True if deletion was successful, False otherwise
         """
         look = await self.get_one_by_id(instance_id)
+        deleted = await super().delete_one(instance_id)
         if look.image_urls:
             await self._delete_images(look.get_storage_paths())
-        return await super().delete_one(instance_id)
+        return deleted
 
     async def update_one(self, instance_id: int, data: LookUpdate) -> LookRead:
         """Update a look and handle associated image changes.
@@ -237,15 +490,21 @@ class LooksUseCase(CRUDUseCase[LookCreate, LookUpdate, LookRead]):
 
         # Get updated look data
         updated_data = data.model_dump(exclude_unset=True, exclude_defaults=True)
-        updated_look = await self.repository.update_one(instance_id, updated_data)
-        valid_look = LookRead.model_validate(updated_look)
-
-        # Handle image deletion
-        if "image_urls" in updated_data:
-            current_paths = set(current_look.get_storage_paths())
-            new_paths = set(valid_look.get_storage_paths())
-            deleted_paths = current_paths - new_paths
-            if deleted_paths:
-                await self._delete_images(list(deleted_paths))
-
-        return valid_look
+        if "image_urls" in updated_data and "image_metadata" not in updated_data:
+            kept = set(updated_data["image_urls"])
+            updated_data["image_metadata"] = {
+                path: metadata.model_dump()
+                for path, metadata in current_look.image_metadata.items()
+                if path in kept
+            }
+        if "image_urls" not in updated_data:
+            updated_look = await self.repository.update_one(instance_id, updated_data)
+            return LookRead.model_validate(updated_look)
+
+        # Image references move in the same transaction as the look itself
+        updated_look, released = await self.looks_repository.update_with_images(
+            instance_id, updated_data
+        )
+        if released:
+            await self._remove_images(released)
+        return LookRead.model_validate(updated_look)
@@ -1,29 +1,445 @@
 import asyncio
+import logging
 import uuid
 import os
-from app.config import UPLOAD_IMAGES_DIR
+from io import BytesIO
+from contextlib import contextmanager
+from typing import Iterator, NamedTuple
+from pathlib import Path, PurePosixPath
 
+from app.application.exceptions import EntityNotFoundError
+from app.application.interfaces import ImageStorageInterface
+from app.config import (
+    API_HOST, UPLOAD_IMAGES_DIR, IMAGE_CONTENT_TYPES, IMAGE_VARIANTS, IMAGE_FORMAT, IMAGE_QUALITY, IMAGE_AVIF_ENABLED,
+    IMAGE_MAX_PIXELS, IMAGE_UPLOAD_FORMATS,
+)
+from app.application.image_metadata import extract_metadata
+from app.domain.entities.images import (
+    EncodedImage, content_key, derivative_name, derivative_names, image_url_resolver,
+)
+
+from PIL import Image as PILImage
 from PIL.Image import Image
 
+logger = logging.getLogger(__name__)
+
+# Pillow refuses to open images above twice this size, before any pixel is decoded
+PILImage.MAX_IMAGE_PIXELS = IMAGE_MAX_PIXELS
+
+
+def _avif_supported() -> bool:
+    """Check whether the installed Pillow can encode AVIF."""
+    PILImage.init()
+    return "AVIF" in PILImage.SAVE
+
+
+def _encode_variants(image: Image) -> tuple[dict[tuple[str, str], bytes], tuple[int, int], Image]:
+    """Encode all derivatives, returning also the full size and the smallest derivative."""
+    formats = [IMAGE_FORMAT]
+    if IMAGE_AVIF_ENABLED:
+        if _avif_supported():
+            formats.append("avif")
+        else:
+            logger.error("IMAGE_AVIF_ENABLED is set but Pillow has no AVIF encoder")
+
+    mode = "RGBA" if "A" in image.getbands() or "transparency" in image.info else "RGB"
+    current = image.convert(mode) if image.mode != mode else image.copy()
+
+    outputs = {}
+    full_size = None
+    for variant, size in sorted(IMAGE_VARIANTS.items(), key=lambda item: -item[1]):
+        current.thumbnail((size, size), PILImage.Resampling.LANCZOS)
+        full_size = full_size or current.size
+        for fmt in formats:
+            buffer = BytesIO()
+            current.save(buffer, format=fmt, quality=IMAGE_QUALITY)
+            outputs[(variant, fmt)] = buffer.getvalue()
+    return outputs, full_size, current
 
-async def save_image(image: Image, filename: str) -> str:
-    """Save an image to the upload directory with a unique filename.
+
+def encode_derivatives(image: Image) -> dict[tuple[str, str], bytes]:
+    """Encode all configured derivatives of an image.
+
+    Each derivative is downscaled (never upscaled) so that its long edge fits the
+    size from IMAGE_VARIANTS. Derivatives are produced from the largest to the
+    smallest, each one resized from the previous, to keep resampling cheap.
 
     Args:
-        image (Image): PIL Image object to save
-        filename (str): Base filename to use (will be combined with UUID)
+        image (Image): Decoded PIL image
+
+    Returns:
+        dict[tuple[str, str], bytes]: Encoded bytes by (variant, format)
+    """
+    return _encode_variants(image)[0]
+
+
+def encode_image(image: Image) -> EncodedImage:
+    """Encode all derivatives of an image and extract its metadata in one pass.
+
+    The metadata is computed from the smallest derivative, which is already in
+    memory once the derivatives are encoded.
+
+    Args:
+        image (Image): Decoded PIL image
 
     Returns:
-        str: The generated filename of the saved image
+        EncodedImage: Encoded derivatives and image metadata
+    """
+    derivatives, full_size, smallest = _encode_variants(image)
+    return EncodedImage(derivatives, extract_metadata(smallest, full_size))
+
+
+@contextmanager
+def open_image(
+    source: bytes | Path, max_size: tuple[int, int] | None = None, formats: list[str] | None = IMAGE_UPLOAD_FORMATS,
+) -> Iterator[Image]:
+    """Open an untrusted image with bounded decoding memory.
+
+    Only the header is read before the checks: the format must be one of the
+    allowed decoders and the pixel count must fit IMAGE_MAX_PIXELS. With
+    ``max_size``, JPEG files are decoded at a reduced scale via ``draft``, so a
+    full-resolution copy is never kept. Other formats (PNG, WebP, AVIF) have no
+    reduced decoding: ``thumbnail`` loads them at full resolution before
+    downscaling, so their decoding memory is bounded by IMAGE_MAX_PIXELS only.
+
+    Args:
+        source (bytes | Path): Raw image bytes or path of the image file
+        max_size (tuple[int, int] | None): Box the decoded image has to fit, the full size if None
+        formats (list[str] | None): Pillow decoders to try, any if None
+
+    Yields:
+        Image: Decoded image
+
+    Raises:
+        UnidentifiedImageError: If the source is not an image in an allowed format
+        DecompressionBombError: If the image has more pixels than allowed
     """
-    image_name = f"{filename}-{uuid.uuid4()}.png"
-    path = UPLOAD_IMAGES_DIR / image_name
-    await asyncio.to_thread(image.save, path)
+    if formats is not None:
+        # Skip decoders this Pillow build lacks, e.g. AVIF
+        PILImage.init()
+        formats = [fmt for fmt in formats if fmt in PILImage.OPEN]
+    with PILImage.open(BytesIO(source) if isinstance(source, bytes) else source, formats=formats) as image:
+        if image.width * image.height > IMAGE_MAX_PIXELS:
+            raise PILImage.DecompressionBombError(
+                f"Image size ({image.width * image.height} pixels) exceeds the limit of {IMAGE_MAX_PIXELS} pixels"
+            )
+        if max_size is not None:
+            image.draft(image.mode, max_size)
+            image.thumbnail(max_size, PILImage.Resampling.LANCZOS)
+        yield image
+
+
+def encode_image_source(source: bytes | Path) -> EncodedImage:
+    """Decode an image from raw bytes or a file, encode its derivatives and extract its metadata.
+
+    This is a module-level function so it can be sent to a process pool. Passing a
+    path lets the worker read the file itself instead of receiving its bytes. The
+    image is decoded no larger than the largest derivative, see ``open_image``.
+
+    Args:
+        source (bytes | Path): Raw image bytes or path of a spooled upload
+
+    Returns:
+        EncodedImage: Encoded derivatives and image metadata
+
+    Raises:
+        UnidentifiedImageError: If the source is not a supported image
+        DecompressionBombError: If the image has more pixels than allowed
+    """
+    largest = max(IMAGE_VARIANTS.values())
+    with open_image(source, (largest, largest)) as image:
+        return encode_image(image)
+
+
+def resize_image_source(source: Path, width: int | None, height: int | None, fmt: str) -> bytes:
+    """Downscale an image file to fit the given box and encode it.
+
+    The image is never upscaled. This is a module-level function so it can be
+    sent to a process pool.
+
+    Args:
+        source (Path): Path of the stored image
+        width (int | None): Maximum width, unbounded if None
+        height (int | None): Maximum height, unbounded if None
+        fmt (str): Output format
+
+    Returns:
+        bytes: Encoded image
+
+    Raises:
+        UnidentifiedImageError: If the source is not a supported image
+    """
+    with open_image(source, formats=None) as image:
+        # thumbnail() decodes JPEG files at a reduced scale via draft()
+        image.thumbnail((width or image.width, height or image.height), PILImage.Resampling.LANCZOS)
+        if fmt == "jpeg" and image.mode != "RGB":
+            image = image.convert("RGB")
+        buffer = BytesIO()
+        image.save(buffer, format=fmt, quality=IMAGE_QUALITY)
+        return buffer.getvalue()
+
+
+class LocalImageStorage(ImageStorageInterface):
+    """Image storage in the local UPLOAD_IMAGES_DIR, served by the app under /images/."""
+
+    @property
+    def public_base_url(self) -> str:
+        """Get the URL prefix under which stored images are publicly served.
+
+        Returns:
+            str: URL prefix ending with a slash
+        """
+        return f"{API_HOST}/images/"
+
+    async def exists(self, key: str) -> bool:
+        """Check whether an image file is present in the upload directory.
+
+        Args:
+            key (str): Storage key of the image
+
+        Returns:
+            bool: True if the file exists
+        """
+        return await asyncio.to_thread((UPLOAD_IMAGES_DIR / key).exists)
+
+    async def save(self, key: str, data: bytes) -> None:
+        """Write an image file under a temporary name and rename it into place.
+
+        Concurrent writers of the same key never expose a partial file.
+
+        Args:
+            key (str): Storage key of the image
+            data (bytes): Encoded image bytes
+        """
+        await asyncio.to_thread(self._write, UPLOAD_IMAGES_DIR / key, data)
+
+    async def delete(self, key: str) -> bool:
+        """Delete an image file from the upload directory.
+
+        Args:
+            key (str): Storage key of the image
+
+        Returns:
+            bool: True if the file existed and was deleted
+        """
+        return await asyncio.to_thread(self._remove, UPLOAD_IMAGES_DIR / key)
+
+    async def resolve(self, key: str) -> Path:
+        """Resolve a storage key to the path of a servable image file.
+
+        Hidden files, such as partially written temporary files, and paths that
+        point outside the upload directory are never resolved.
+
+        Args:
+            key (str): Storage key of the image
+
+        Returns:
+            Path: Path of the existing image file
+
+        Raises:
+            EntityNotFoundError: If the key does not name a stored image
+        """
+        parts = PurePosixPath(key).parts
+        if (
+            not parts
+            or any(part.startswith(".") or part == "/" for part in parts)
+            or PurePosixPath(key).suffix.lstrip(".").lower() not in IMAGE_CONTENT_TYPES
+        ):
+            raise EntityNotFoundError("Image")
+        path = UPLOAD_IMAGES_DIR.joinpath(*parts)
+        if not await asyncio.to_thread(path.is_file):
+            raise EntityNotFoundError("Image")
+        return path
+
+    async def delete_many(self, keys: list[str]) -> list[str]:
+        """Delete several image files in a single worker thread.
+
+        Args:
+            keys (list[str]): Storage keys of the images
+
+        Returns:
+            list[str]: Keys that could not be deleted
+        """
+        return await asyncio.to_thread(self._remove_many, keys)
+
+    @classmethod
+    def _remove_many(cls, keys: list[str]) -> list[str]:
+        failed = []
+        for key in keys:
+            try:
+                cls._remove(UPLOAD_IMAGES_DIR / key)
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                logger.error(f"Error deleting image {key}: {e}")
+                failed.append(key)
+        return failed
+
+    @staticmethod
+    def _write(path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _remove(path: Path) -> bool:
+        if path.exists():
+            os.remove(path)
+            return True
+        return False
+
+
+_image_storage: ImageStorageInterface = LocalImageStorage()
+
+
+def get_image_storage() -> ImageStorageInterface:
+    """Get the configured image storage.
+
+    Returns:
+        ImageStorageInterface: Storage used by save_image and delete_image
+    """
+    return _image_storage
+
+
+def set_image_storage(storage: ImageStorageInterface) -> None:
+    """Replace the image storage and the public URL prefix of look images.
+
+    Args:
+        storage (ImageStorageInterface): Storage to use from now on
+    """
+    global _image_storage
+    _image_storage = storage
+    image_url_resolver.base_url = storage.public_base_url
+
+
+async def image_exists(image_name: str) -> bool:
+    """Check whether a full-size image is present in the image storage.
+
+    Args:
+        image_name (str): Storage name of the image
+
+    Returns:
+        bool: True if the image exists
+    """
+    return await get_image_storage().exists(image_name)
+
+
+async def save_derivatives(derivatives: dict[tuple[str, str], bytes], digest: str) -> str:
+    """Save already encoded image derivatives under their content address.
+
+    Derivatives that are already stored hold identical content and are skipped.
+    The full-size image is written last, so its presence means the whole set
+    is stored.
+
+    Args:
+        derivatives (dict[tuple[str, str], bytes]): Encoded bytes by (variant, format)
+        digest (str): SHA-256 digest of the uploaded image
+
+    Returns:
+        str: Storage name of the saved full-size image
+    """
+    storage = get_image_storage()
+    image_name = content_key(digest)
+
+    async def save(name: str, data: bytes) -> None:
+        if not await storage.exists(name):
+            await storage.save(name, data)
+
+    names = {
+        derivative_name(image_name, variant, fmt): data
+        for (variant, fmt), data in derivatives.items()
+    }
+    full_data = names.pop(image_name)
+    await asyncio.gather(*(save(name, data) for name, data in names.items()))
+    await save(image_name, full_data)
     return image_name
 
 
+async def save_image(image: Image, digest: str) -> str:
+    """Save an image and its derivatives to the upload directory under their content address.
+
+    Args:
+        image (Image): PIL Image object to save
+        digest (str): SHA-256 digest of the uploaded image
+
+    Returns:
+        str: Storage name of the saved full-size image
+    """
+    derivatives = await asyncio.to_thread(encode_derivatives, image)
+    return await save_derivatives(derivatives, digest)
+
+
+class StoredFile(NamedTuple):
+    """File found in the upload directory.
+
+    Attributes:
+        key (str): Storage name of the file
+        size (int): Size of the file in bytes
+        mtime (float): Modification time as a UNIX timestamp
+    """
+    key: str
+    size: int
+    mtime: float
+
+
+def iter_image_files(directory: Path | None = None) -> Iterator[StoredFile]:
+    """Lazily walk the upload directory, one directory listing at a time.
+
+    Args:
+        directory (Path | None): Directory to walk, UPLOAD_IMAGES_DIR by default
+
+    Yields:
+        StoredFile: Every file below the directory, including hidden temporary files
+    """
+    root = directory or UPLOAD_IMAGES_DIR
+    stack = [root]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except FileNotFoundError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(Path(entry.path))
+                elif entry.is_file(follow_symlinks=False):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    key = Path(entry.path).relative_to(root).as_posix()
+                    yield StoredFile(key, stat.st_size, stat.st_mtime)
+
+
+def remove_image_files(keys: list[str], directory: Path | None = None) -> int:
+    """Remove files from the upload directory.
+
+    Args:
+        keys (list[str]): Storage names of the files
+        directory (Path | None): Directory of the files, UPLOAD_IMAGES_DIR by default
+
+    Returns:
+        int: Number of bytes reclaimed
+    """
+    root = directory or UPLOAD_IMAGES_DIR
+    reclaimed = 0
+    for key in keys:
+        path = root / key
+        try:
+            size = path.stat().st_size
+            os.remove(path)
+        except FileNotFoundError:
+            continue
+        except OSError as e:
+            logger.error(f"Error deleting image {key}: {e}")
+            continue
+        reclaimed += size
+    return reclaimed
+
+
 async def delete_image(image_name: str) -> bool:
-    """Delete an image file from the upload directory.
+    """Delete an image and its derivatives from the image storage.
 
     Args:
         image_name (str): Name of the image file to delete
@@ -31,11 +447,11 @@ async def delete_image(image_name: str) -> bool:
     Returns:
         bool: True if deletion was successful, False otherwise
     """
-    try:
-        image_path = UPLOAD_IMAGES_DIR / image_name
-        if image_path.exists():
-            os.remove(image_path)
-            return True
-    except Exception as e:
-        print(f"Error deleting image {image_name}: {e}")
-    return False
+    storage = get_image_storage()
+    deleted = False
+    for name in derivative_names(image_name):
+        try:
+            deleted = await storage.delete(name) or deleted
+        except Exception as e:
+            logger.error(f"Error deleting image {name}: {e}")
+    return deleted
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -24,9 +25,98 @@ DB_PASS = os.environ.get("POSTGRES_PASSWORD")  # Database password
 UPLOAD_IMAGES_DIR = BASE_DIR / "app" / "static" / "images"  # Directory for uploaded images
 UPLOAD_IMAGES_DIR.mkdir(parents=True, exist_ok=True)  # Ensure directory exists
 
+# Upload spooling configuration
+UPLOAD_SPOOL_DIR = Path(os.environ.get("UPLOAD_SPOOL_DIR", Path(tempfile.gettempdir()) / "lookhub-uploads"))
+UPLOAD_SPOOL_DIR.mkdir(parents=True, exist_ok=True)  # Ensure directory exists
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # Bytes read from an upload at a time
+UPLOAD_MAX_FILE_BYTES = int(os.environ.get("UPLOAD_MAX_FILE_MB", "20")) * 1024 * 1024  # Per uploaded file
+UPLOAD_MAX_REQUEST_BYTES = int(os.environ.get("UPLOAD_MAX_REQUEST_MB", "100")) * 1024 * 1024  # Per request
+UPLOAD_FORM_OVERHEAD_BYTES = 1024 * 1024  # Multipart framing and form fields allowed on top of the files
+
+# Image derivatives configuration
+IMAGE_VARIANTS = {"thumbnail": 320, "medium": 960, "full": 1920}  # Variant name -> max long edge in px
+IMAGE_FORMAT = "webp"  # Format of the stored derivatives
+IMAGE_QUALITY = int(os.environ.get("IMAGE_QUALITY", "80"))  # WebP/AVIF encoder quality
+IMAGE_AVIF_ENABLED = os.environ.get("IMAGE_AVIF_ENABLED", "false").lower() == "true"  # Also write AVIF derivatives
+IMAGE_MAX_PIXELS = int(os.environ.get("IMAGE_MAX_MEGAPIXELS", "50")) * 1_000_000  # Larger uploads are not decoded
+IMAGE_UPLOAD_FORMATS = ["JPEG", "PNG", "WEBP", "GIF", "BMP", "TIFF", "MPO", "AVIF"]  # Decoders tried on uploads
+
+# Application server
+APP_WORKERS = int(os.environ.get("WORKERS", "2"))  # gunicorn worker processes, see docker/app.sh
+
+# Metrics shared between the app workers
+METRICS_DIR = Path(os.environ.get("METRICS_DIR", Path(tempfile.gettempdir()) / "lookhub-metrics"))
+METRICS_FLUSH_SECONDS = 10  # How often each worker writes its snapshot
+METRICS_STALE_SECONDS = 60  # Snapshots older than this belong to exited workers
+
+# Image processing pool configuration
+IMAGE_PROCESS_WORKERS = int(  # Processes per app worker, all of them share the CPUs
+    os.environ.get("IMAGE_PROCESS_WORKERS", max(1, (os.cpu_count() or 1) // APP_WORKERS))
+)
+IMAGE_MAX_CONCURRENCY = int(os.environ.get("IMAGE_MAX_CONCURRENCY", IMAGE_PROCESS_WORKERS * 2))  # Images in flight
+IMAGE_MAX_TASKS_PER_CHILD = 100  # Recycle pool processes to cap memory growth
+
+# Background image deletion
+IMAGE_DELETE_BATCH_SIZE = 100  # Files deleted from the storage at a time
+IMAGE_DELETE_MAX_ATTEMPTS = 5  # Attempts per file before it is left to the garbage collector
+IMAGE_DELETE_RETRY_SECONDS = 2  # First retry delay, doubled on every attempt
+
+# Orphan image garbage collection
+IMAGE_GC_GRACE_SECONDS = int(os.environ.get("IMAGE_GC_GRACE_HOURS", "24")) * 3600  # Younger files may be in upload
+IMAGE_GC_BATCH_SIZE = 1000  # Files checked against the database at a time
+IMAGE_GC_SCHEDULE_HOUR = os.environ.get("IMAGE_GC_SCHEDULE_HOUR", "4")
+
+# Duplicate image detection
+IMAGE_DUPLICATE_MAX_DISTANCE = 10  # Default Hamming distance of 64-bit hashes of similar images
+IMAGE_INDEX_SYNC_SECONDS = 60  # How often a worker indexes hashes of images stored by the other workers
+
+# Image serving configuration
+IMAGE_ACCEL_REDIRECT_PREFIX = os.environ.get("IMAGE_ACCEL_REDIRECT_PREFIX")  # Internal nginx location, unset to send files from the app
+IMAGE_CACHE_CONTROL = "public, max-age=31536000, immutable"  # Content-addressed images never change
+IMAGE_LEGACY_CACHE_CONTROL = "public, max-age=86400"  # Images stored under non-content names
+IMAGE_CDN_URLS = [url.strip() for url in os.environ.get("IMAGE_CDN_URLS", "").split(",") if url.strip()]  # Image hosts
+IMAGE_URL_CACHE_SIZE = 65536  # Storage keys whose public URLs are kept per worker
+IMAGE_CONTENT_TYPES = {"webp": "image/webp", "avif": "image/avif", "png": "image/png", "jpg": "image/jpeg", "jpeg": "image/jpeg"}
+
+# On-demand resize configuration
+IMAGE_CACHE_DIR = Path(os.environ.get("IMAGE_CACHE_DIR", BASE_DIR / "app" / "static" / "image-cache"))  # Resized images
+IMAGE_CACHE_DIR.mkdir(parents=True, exist_ok=True)  # Ensure directory exists
+IMAGE_CACHE_MAX_BYTES = int(os.environ.get("IMAGE_CACHE_MAX_MB", "1024")) * 1024 * 1024  # LRU budget of all workers together, split evenly
+IMAGE_CACHE_ACCEL_REDIRECT_PREFIX = os.environ.get("IMAGE_CACHE_ACCEL_REDIRECT_PREFIX")  # Internal nginx location
+IMAGE_RESIZE_MAX_DIMENSION = max(IMAGE_VARIANTS.values())  # Stored images are never larger
+IMAGE_RESIZE_SIZES = [160, 320, 640, 960, 1280, IMAGE_RESIZE_MAX_DIMENSION]  # Requested w/h are rounded up to one of these
+IMAGE_RESIZE_FORMATS = ["webp", "jpeg", "png"] + (["avif"] if IMAGE_AVIF_ENABLED else [])
+
+# Image storage configuration
+IMAGE_STORAGE_BACKEND = os.environ.get("IMAGE_STORAGE_BACKEND", "local")  # "local" or "s3"
+S3_ENDPOINT_URL = os.environ.get("S3_ENDPOINT_URL")  # S3-compatible endpoint, None for AWS
+S3_REGION = os.environ.get("S3_REGION", "us-east-1")
+S3_BUCKET = os.environ.get("S3_BUCKET", "lookhub-images")
+S3_ACCESS_KEY = os.environ.get("S3_ACCESS_KEY")
+S3_SECRET_KEY = os.environ.get("S3_SECRET_KEY")
+S3_PUBLIC_URL = os.environ.get("S3_PUBLIC_URL")  # Public URL prefix of the bucket, e.g. a CDN host
+S3_MULTIPART_THRESHOLD = 8 * 1024 * 1024  # Objects larger than this are uploaded in parts
+S3_MULTIPART_CHUNK_SIZE = 8 * 1024 * 1024  # Part size, S3 requires at least 5 MB
+
 # API configuration
 API_HOST = os.environ.get("DOMAIN", "http://127.0.0.1")  # API base URL
 API_KEY = os.environ.get("API_KEY", "supersecretapikey")
+API_BATCH_MAX_IDS = 100  # Maximum number of IDs in a batch GET request
+API_BULK_MAX_LOOKS = 1000  # Maximum number of looks in a bulk create request
+
+# Admission control per app worker: route class -> (requests in progress, requests waiting);
+# keep the sum of in-progress requests near the DB pool size (5 + 10 overflow connections)
+ADMISSION_LIMITS = {
+    "read": (int(os.environ.get("ADMISSION_READ_CONCURRENCY", "10")), 100),  # Public GETs
+    "admin": (int(os.environ.get("ADMISSION_ADMIN_CONCURRENCY", "4")), 20),  # Admin pages and API writes
+    "upload": (int(os.environ.get("ADMISSION_UPLOAD_CONCURRENCY", "2")), 10),  # Image uploads
+}
+ADMISSION_MAX_WAIT_SECONDS = float(os.environ.get("ADMISSION_MAX_WAIT_SECONDS", "5"))  # Then 503, well below nginx's 60s
+ADMISSION_RETRY_AFTER_SECONDS = 2  # Retry-After sent with 503 responses
+
+# Request deadlines by admission route class, in seconds; DB statements are cancelled past them
+REQUEST_TIMEOUTS = {"read": 10, "admin": 30, "upload": 55}  # Below nginx's 60s proxy_read_timeout
+REQUEST_TIMEOUT_HEADER = "x-request-timeout"  # Lets a client ask for a shorter deadline, in seconds
 
 # Redis configuration
 REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
@@ -36,6 +126,8 @@ REDIS_PORT = os.getenv("REDIS_PORT", '6379')
 SECRET_KEY = os.environ.get("ADMIN_JWT_SECRET", "supersecretkey")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 120
+TOKEN_CACHE_MAX_SIZE = 10000  # Max number of verified tokens kept in memory per worker
+TOKEN_REVOCATION_CHECK_SECONDS = 5  # How often a cached token is re-checked for revocation
 
 # Hardcoded admin credentials
 ADMIN_USERNAME = os.environ.get("ADMIN_USERNAME", "admin")
@@ -47,3 +139,27 @@ FLOWER_URL = "http://flower:5555/admin/flower"
 # Celery settings
 SENDING_LOOKS_SCHEDULE_HOURS = os.environ.get("SENDING_LOOKS_SCHEDULE_HOURS")
 SENDING_LOOKS_SCHEDULE_MINUTE = os.environ.get("SENDING_LOOKS_SCHEDULE_MINUTE")
+CELERY_BROKER_POOL_LIMIT = int(os.environ.get("CELERY_BROKER_POOL_LIMIT", "10"))  # Broker connections per app worker
+
+# Product page ingestion (clothes created from a shop link)
+INGEST_MAX_CONCURRENCY = int(os.environ.get("INGEST_MAX_CONCURRENCY", "8"))  # Pages fetched at once per worker
+INGEST_DOMAIN_DELAY_SECONDS = float(os.environ.get("INGEST_DOMAIN_DELAY_SECONDS", "1"))  # Between requests to a host
+INGEST_FETCH_TIMEOUT_SECONDS = 15  # Timeout of a single page request
+INGEST_MAX_PAGE_BYTES = 5 * 1024 * 1024  # Larger pages are rejected
+INGEST_PAGE_CACHE_SECONDS = int(os.environ.get("INGEST_PAGE_CACHE_HOURS", "24")) * 3600  # Fetched HTML kept in Redis
+INGEST_USER_AGENT = "Mozilla/5.0 (compatible; LookHubBot/1.0)"
+
+# Live events for the admin panel
+PUBLICATION_EVENTS_CHANNEL = "look_publication_events"  # Redis pub/sub channel, also used by SocialMediaPoster
+EVENTS_HEARTBEAT_SECONDS = 15  # Idle SSE streams get a comment this often to stay open behind proxies
+
+# Static assets built with content-hash names (python -m app.infrastructure.static_assets)
+STATIC_BUNDLES = {  # Bundle name -> directory with its source assets
+    "frontend": BASE_DIR / "app" / "frontend" / "static",
+    "admin": BASE_DIR / "app" / "admin" / "static",
+}
+STATIC_ASSETS_DIR = BASE_DIR / "app" / "static" / "assets"  # Build output, one subdirectory per bundle
+STATIC_ASSETS_URL = "/assets"  # URL prefix of the built assets
+STATIC_ASSETS_CACHE_CONTROL = "public, max-age=31536000, immutable"  # Names change with contents, never revalidate
+STATIC_ASSETS_COMPRESS_EXTENSIONS = {".css", ".js", ".svg", ".json", ".txt", ".html"}  # Get brotli/gzip variants
+STATIC_ASSETS_COMPRESS_MIN_BYTES = 256  # Smaller files are not worth compressing
@@ -0,0 +1,391 @@
+import re
+import zlib
+from functools import lru_cache
+from pathlib import Path, PurePosixPath
+from typing import NamedTuple
+
+from pydantic import BaseModel
+
+from app.config import (
+    API_HOST,
+    IMAGE_VARIANTS,
+    IMAGE_FORMAT,
+    IMAGE_AVIF_ENABLED,
+    IMAGE_CDN_URLS,
+    IMAGE_URL_CACHE_SIZE,
+)
+
+
+def content_key(digest: str) -> str:
+    """Get the content-addressed storage name of an image.
+
+    Images are sharded into two levels of directories by the first characters of
+    their digest, so no single directory grows too large.
+
+    Args:
+        digest (str): Hex SHA-256 digest of the uploaded image
+
+    Returns:
+        str: Storage name of the full-size image
+
+    Example:
+        >>> content_key("abcdef")
+        'ab/cd/abcdef.webp'
+    """
+    return f"{digest[:2]}/{digest[2:4]}/{digest}.{IMAGE_FORMAT}"
+
+
+CONTENT_KEY_PATTERN = re.compile(
+    r"[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}(_[a-z]+)?\.[a-z]+"
+)
+
+
+def is_content_addressed(storage_name: str) -> bool:
+    """Check whether an image or derivative is stored under its content address.
+
+    Content under such a name never changes, so it can be cached forever.
+
+    Args:
+        storage_name (str): Storage name of the image or derivative
+
+    Returns:
+        bool: True if the name is a content key or one of its derivatives
+    """
+    return CONTENT_KEY_PATTERN.fullmatch(storage_name) is not None
+
+
+def derivative_name(storage_name: str, variant: str, fmt: str = IMAGE_FORMAT) -> str:
+    """Get the storage name of an image derivative.
+
+    The full-size derivative in the default format is the stored image itself,
+    other derivatives get the variant name as a suffix.
+
+    Args:
+        storage_name (str): Storage name of the full-size image
+        variant (str): Variant name from IMAGE_VARIANTS
+        fmt (str): File format of the derivative
+
+    Returns:
+        str: Storage name of the derivative
+
+    Example:
+        >>> derivative_name("1-abc.webp", "thumbnail")
+        '1-abc_thumbnail.webp'
+    """
+    path = PurePosixPath(storage_name)
+    if variant == "full" and fmt == IMAGE_FORMAT:
+        return storage_name
+    return str(path.with_name(f"{path.stem}_{variant}.{fmt}"))
+
+
+def source_name(file_name: str) -> str:
+    """Get the storage name of the full-size image a stored file belongs to.
+
+    This is the inverse of ``derivative_name``.
+
+    Args:
+        file_name (str): Storage name of an image or one of its derivatives
+
+    Returns:
+        str: Storage name of the full-size image
+
+    Example:
+        >>> source_name("1-abc_thumbnail.avif")
+        '1-abc.webp'
+    """
+    path = PurePosixPath(file_name)
+    if path.suffix not in (f".{IMAGE_FORMAT}", ".avif"):
+        return file_name
+    stem = path.stem
+    for variant in IMAGE_VARIANTS:
+        if stem.endswith(f"_{variant}"):
+            stem = stem[: -len(variant) - 1]
+            break
+    return str(path.with_name(f"{stem}.{IMAGE_FORMAT}"))
+
+
+def has_derivatives(storage_name: str) -> bool:
+    """Check whether an image was stored together with its derivatives.
+
+    Images uploaded before the derivative pipeline are kept as a single file.
+
+    Args:
+        storage_name (str): Storage name of the image
+
+    Returns:
+        bool: True if the derivatives exist for the image
+    """
+    return storage_name.endswith(f".{IMAGE_FORMAT}")
+
+
+def derivative_names(storage_name: str) -> list[str]:
+    """Get storage names of all files that belong to an image.
+
+    AVIF derivatives are always included, whether IMAGE_AVIF_ENABLED is set
+    or not, so images stored while it was on are deleted completely.
+
+    Args:
+        storage_name (str): Storage name of the full-size image
+
+    Returns:
+        list[str]: Storage names of the image and all its derivatives
+    """
+    if not has_derivatives(storage_name):
+        return [storage_name]
+    formats = [IMAGE_FORMAT, "avif"]
+    return [
+        derivative_name(storage_name, variant, fmt)
+        for fmt in formats
+        for variant in IMAGE_VARIANTS
+    ]
+
+
+class ImageUrlResolver:
+    """Maps storage keys of look images to public URLs and back.
+
+    Looks keep storage keys; public URLs are only produced when a look is
+    serialized. The URL prefixes are compiled once when the base URL is set,
+    and resolved URLs are cached per key. With CDN URLs configured, each key
+    is served from one of them, always the same for a given key so browser
+    and CDN caches stay warm. URLs under the storage and default local
+    prefixes are still recognized, so looks stored before a switch keep
+    resolving to their keys.
+
+    Attributes:
+        base_url (str): Public URL prefix of the image storage
+    """
+
+    default_base_url = f"{API_HOST}/images/"
+
+    def __init__(
+        self,
+        base_url: str = default_base_url,
+        cdn_urls: list[str] | None = None,
+        cache_size: int = IMAGE_URL_CACHE_SIZE,
+    ):
+        """Initialize the resolver.
+
+        Args:
+            base_url (str): Public URL prefix of the image storage
+            cdn_urls (list[str] | None): URL prefixes of CDN hosts serving the images, IMAGE_CDN_URLS if None
+            cache_size (int): Number of resolved URLs kept
+        """
+        cdn_urls = IMAGE_CDN_URLS if cdn_urls is None else cdn_urls
+        self._cdn_urls = tuple(
+            url if url.endswith("/") else f"{url}/" for url in cdn_urls
+        )
+        self._cache_size = cache_size
+        self.base_url = base_url
+
+    @property
+    def base_url(self) -> str:
+        """Get the public URL prefix of the image storage.
+
+        Returns:
+            str: URL prefix ending with a slash
+        """
+        return self._base_url
+
+    @base_url.setter
+    def base_url(self, value: str) -> None:
+        """Set the public URL prefix of the image storage and recompile the prefixes.
+
+        Args:
+            value (str): URL prefix ending with a slash
+        """
+        self._base_url = value
+        self._public_prefixes = self._cdn_urls or (value,)
+        known = dict.fromkeys((*self._public_prefixes, value, self.default_base_url))
+        self._prefix_pattern = re.compile(
+            "|".join(re.escape(prefix) for prefix in known)
+        )
+        self._cached_public_url = lru_cache(maxsize=self._cache_size)(self._public_url)
+
+    def public_url(self, key: str) -> str:
+        """Get the public URL of a stored image.
+
+        Args:
+            key (str): Storage key, or an absolute URL that is returned as is
+
+        Returns:
+            str: Public URL of the image
+        """
+        return self._cached_public_url(key)
+
+    def _public_url(self, key: str) -> str:
+        if key.startswith("http"):
+            return key
+        prefixes = self._public_prefixes
+        if len(prefixes) == 1:
+            return f"{prefixes[0]}{key}"
+        return f"{prefixes[zlib.crc32(key.encode()) % len(prefixes)]}{key}"
+
+    def public_urls(self, keys: list[str]) -> list[str]:
+        """Get the public URLs of stored images.
+
+        Args:
+            keys (list[str]): Storage keys or absolute URLs
+
+        Returns:
+            list[str]: Public URLs of the images
+        """
+        public_url = self._cached_public_url
+        return [public_url(key) for key in keys]
+
+    def storage_key(self, url: str) -> str:
+        """Get the storage key of an image from its public URL.
+
+        Args:
+            url (str): Public URL of the image, or a storage key
+
+        Returns:
+            str: Storage key, or the URL itself for external images
+        """
+        match = self._prefix_pattern.match(url)
+        return url[match.end() :] if match else url
+
+
+image_url_resolver = ImageUrlResolver()
+
+
+class ImageMetadata(BaseModel):
+    """Layout and placeholder metadata of a stored image.
+
+    Attributes:
+        width (int): Width of the full-size image in pixels
+        height (int): Height of the full-size image in pixels
+        dominant_color (str): Most frequent colour as "#rrggbb"
+        blurhash (str): BlurHash placeholder string
+        dhash (str | None): Perceptual difference hash as 16 hex digits
+    """
+
+    width: int
+    height: int
+    dominant_color: str
+    blurhash: str
+    dhash: str | None = None
+
+
+def _derivative_widths(metadata: ImageMetadata | None) -> dict[str, int]:
+    """Get the widths of the derivatives of an image, in IMAGE_VARIANTS order.
+
+    Derivatives are downscaled to fit their long edge and never upscaled, so
+    their widths follow from the size of the full-size image. The long edges
+    of IMAGE_VARIANTS are used while the size is not known.
+    """
+    if metadata is None:
+        return dict(IMAGE_VARIANTS)
+    long_edge = max(metadata.width, metadata.height)
+    return {
+        variant: max(1, round(metadata.width * min(1, size / long_edge)))
+        for variant, size in IMAGE_VARIANTS.items()
+    }
+
+
+def _srcset(urls: dict[str, str], widths: dict[str, int]) -> str:
+    """Join derivative URLs into a ``srcset`` value, one candidate per width."""
+    candidates: dict[int, str] = {}
+    for variant, width in widths.items():
+        # Derivatives of a small image have the same width, keep the smallest file
+        candidates.setdefault(width, urls[variant])
+    return ", ".join(f"{url} {width}w" for width, url in candidates.items())
+
+
+class ImageSrcset(BaseModel):
+    """Responsive set of URLs of a single look image.
+
+    Attributes:
+        src (str): URL of the full-size image
+        thumbnail (str): URL of the thumbnail derivative
+        medium (str): URL of the medium derivative
+        full (str): URL of the full-size derivative
+        srcset (str): ``srcset`` attribute value with all derivatives
+        avif_srcset (str | None): ``srcset`` attribute value with AVIF derivatives
+        width (int | None): Width of the full-size image, if known
+        height (int | None): Height of the full-size image, if known
+        dominant_color (str | None): Placeholder background colour, if known
+        blurhash (str | None): BlurHash placeholder, if known
+    """
+
+    src: str
+    thumbnail: str
+    medium: str
+    full: str
+    srcset: str
+    avif_srcset: str | None = None
+    width: int | None = None
+    height: int | None = None
+    dominant_color: str | None = None
+    blurhash: str | None = None
+
+    @classmethod
+    def from_storage_name(
+        cls,
+        storage_name: str,
+        resolver: ImageUrlResolver,
+        metadata: ImageMetadata | None = None,
+    ) -> "ImageSrcset":
+        """Build a srcset from the storage name of a full-size image.
+
+        The ``w`` descriptors are the real widths of the derivatives when the
+        metadata is known, so portrait and small images get the right candidates.
+
+        Args:
+            storage_name (str): Storage name of the full-size image
+            resolver (ImageUrlResolver): Resolver of public image URLs
+            metadata (ImageMetadata | None): Metadata of the image, if known
+
+        Returns:
+            ImageSrcset: URLs of the image derivatives
+        """
+        extra = metadata.model_dump() if metadata else {}
+        if not has_derivatives(storage_name):
+            url = resolver.public_url(storage_name)
+            return cls(
+                src=url, thumbnail=url, medium=url, full=url, srcset=url, **extra
+            )
+
+        urls = {
+            variant: resolver.public_url(derivative_name(storage_name, variant))
+            for variant in IMAGE_VARIANTS
+        }
+        widths = _derivative_widths(metadata)
+        srcset = _srcset(urls, widths)
+        avif_srcset = None
+        if IMAGE_AVIF_ENABLED:
+            avif_urls = {
+                variant: resolver.public_url(
+                    derivative_name(storage_name, variant, "avif")
+                )
+                for variant in IMAGE_VARIANTS
+            }
+            avif_srcset = _srcset(avif_urls, widths)
+        return cls(
+            src=urls["full"], srcset=srcset, avif_srcset=avif_srcset, **urls, **extra
+        )
+
+
+class ImageUpload(BaseModel):
+    """Uploaded image spooled to a local file.
+
+    Attributes:
+        path (Path): Path of the spooled file
+        size (int): Size of the file in bytes
+        sha256 (str): Hex SHA-256 digest of the file contents
+    """
+
+    path: Path
+    size: int
+    sha256: str
+
+
+class EncodedImage(NamedTuple):
+    """Result of decoding an uploaded image once.
+
+    Attributes:
+        derivatives (dict[tuple[str, str], bytes]): Encoded bytes by (variant, format)
+        metadata (ImageMetadata): Dimensions and placeholder of the full-size image
+    """
+
+    derivatives: dict[tuple[str, str], bytes]
+    metadata: ImageMetadata
@@ -1,6 +1,6 @@
 from typing import Any
 
-from pydantic import BaseModel, ConfigDict, field_validator
+from pydantic import BaseModel, ConfigDict, field_validator, field_serializer, computed_field
 
 from app.domain.entities.categories import (
     ClothesCategory,
@@ -8,7 +8,7 @@ from app.domain.entities.categories import (
     ClothesCategoryRead,
 )
 from app.domain.entities.enums import GenderEnum
-from app.config import API_HOST
+from app.domain.entities.images import ImageMetadata, ImageSrcset, image_url_resolver
 
 
 class Look(BaseModel):
@@ -22,7 +22,8 @@ class Look(BaseModel):
         description (str): Description of the look
         clothes_categories (list[ClothesCategory]): List of clothing categories in the look
         image_prompts (list[str]): List of prompts used to generate images
-        image_urls (list[str]): List of URLs to the look's images
+        image_urls (list[str]): Storage keys of the look's images, public URLs in JSON output
+        image_metadata (dict[str, ImageMetadata]): Metadata of the look's images by storage path
         content_json (str | None): Optional JSON content for the look
         checked (bool): Whether the look has been verified
         pushed (bool): Whether the look has been published
@@ -33,6 +34,7 @@ class Look(BaseModel):
     clothes_categories: list[ClothesCategory] = []
     image_prompts: list[str]
     image_urls: list[str] = []
+    image_metadata: dict[str, ImageMetadata] = {}
     content_json: str | None = None
     checked: bool | None = False
     pushed: bool | None = False
@@ -42,54 +44,39 @@ class Look(BaseModel):
     )
 
     @field_validator("image_urls", mode="after")
-    def add_api_host(cls, value):
-        """Adds API_HOST prefix to image URLs during serialization.
+    def normalize_image_urls(cls, value):
+        """Keeps image storage keys, turning public image URLs back into keys.
 
         Args:
-            value (list[str]): List of image URLs
+            value (list[str]): List of image storage keys or URLs
 
         Returns:
-            list[str]: List of image URLs with API_HOST prefix
+            list[str]: List of image storage keys, external URLs are kept as is
         """
         if not value:
             return []
-        return [
-            f"{API_HOST}/images/{url}"
-            if isinstance(url, str) and not url.startswith("http")
-            else url
-            for url in value
-        ]
+        storage_key = image_url_resolver.storage_key
+        return [storage_key(url) if isinstance(url, str) else url for url in value]
 
-    def model_dump(self, **kwargs):
-        """Removes API_HOST prefix from image URLs during deserialization.
+    @field_serializer("image_urls", when_used="json")
+    def serialize_image_urls(self, value: list[str]) -> list[str]:
+        """Resolves image storage keys to public URLs in JSON output.
+
+        Args:
+            value (list[str]): List of image storage keys
 
         Returns:
-            list[str]: List of image URLs without API_HOST prefix
+            list[str]: List of public image URLs
         """
-        data = super().model_dump(**kwargs)
-        prefix = f"{API_HOST}/images/"
-        data["image_urls"] = [
-            url.replace(prefix, "")
-            if isinstance(url, str) and url.startswith(prefix)
-            else url
-            for url in data.get("image_urls", [])
-        ]
-        return data
+        return image_url_resolver.public_urls(value)
 
     def get_storage_paths(self) -> list[str]:
-        """Get the storage paths of images without API_HOST prefix.
+        """Get the storage paths of the look images.
 
         Returns:
             list[str]: List of image storage paths
         """
-        return [
-            (
-                url.replace(f"{API_HOST}/images/", "")
-                if url.startswith(f"{API_HOST}/images/")
-                else url
-            )
-            for url in self.image_urls
-        ]
+        return list(self.image_urls)
 
 
 class LookCreate(Look):
@@ -129,6 +116,37 @@ class LookRead(Look):
     Attributes:
         id (int): The unique identifier of the look
         clothes_categories (list[ClothesCategoryRead]): List of clothing categories with full data
+        images (list[ImageSrcset]): Responsive derivative URLs for each image in image_urls
     """
     id: int
     clothes_categories: list[ClothesCategoryRead] = []
+
+    @computed_field
+    @property
+    def images(self) -> list[ImageSrcset]:
+        """Get responsive derivative URLs for each look image.
+
+        Returns:
+            list[ImageSrcset]: Srcset structure per image, in image_urls order
+        """
+        return [
+            ImageSrcset.from_storage_name(path, image_url_resolver, self.image_metadata.get(path))
+            if not path.startswith("http")
+            else ImageSrcset(src=path, thumbnail=path, medium=path, full=path, srcset=path)
+            for path in self.get_storage_paths()
+        ]
+
+
+class LookDuplicate(BaseModel):
+    """Model for an image of another look that looks like an image of this one.
+
+    Attributes:
+        look_id (int): ID of the other look
+        image (str): Storage name of the image of this look
+        duplicate_image (str): Storage name of the similar image of the other look
+        distance (int): Hamming distance between the perceptual hashes, 0 for identical images
+    """
+    look_id: int
+    image: str
+    duplicate_image: str
+    distance: int
@@ -2,11 +2,14 @@ from fastapi import APIRouter, Request
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
 
+from app.infrastructure.static_assets import AssetManifest
+
 # Router for frontend pages
 router = APIRouter(prefix="", tags=["Frontend"])
 
 # Initialize Jinja2 templates for frontend pages
 templates = Jinja2Templates(directory="app/frontend/templates")
+templates.env.globals["static_url"] = AssetManifest("frontend", "/frontend/static").url
 
 
 @router.get("/", response_class=HTMLResponse)
@@ -14,8 +14,13 @@ async function loadLooks(page = 1) {
 }
 
 function createLookCard(look) {
-    // Берём первое изображение из массива
-    const previewImg = Array.isArray(look.image_urls) && look.image_urls.length > 0 ? look.image_urls[0] : '';
+    // Берём миниатюру первого изображения из массива
+    const preview = Array.isArray(look.images) && look.images.length > 0 ? look.images[0] : null;
+    const previewImg = preview ? preview.thumbnail : '';
+    const previewSrcset = preview ? preview.srcset : '';
+    // Reserve the image box and paint its dominant colour until the image arrives
+    const previewSize = preview && preview.width ? `width="${preview.width}" height="${preview.height}"` : '';
+    const previewStyle = preview && preview.dominant_color ? `style="background-color: ${preview.dominant_color}"` : '';
     // Обрезаем описание до первого предложения
     let description = look.description || '';
     const firstDotIdx = description.indexOf('.') !== -1 ? description.indexOf('.') + 1 : description.length;
@@ -23,7 +28,7 @@ function createLookCard(look) {
     const card = document.createElement('li');
     card.innerHTML = `
         <div class="card" data-aos="zoom-in-up">
-            <a href="/looks/${look.id}"><img src="${previewImg}" alt="Image"></a>
+            <a href="/looks/${look.id}"><img src="${previewImg}" srcset="${previewSrcset}" sizes="(max-width: 600px) 100vw, 320px" ${previewSize} ${previewStyle} loading="lazy" alt="Image"></a>
             <div class="card__info">
                 <a class="link" href="/looks/${look.id}"><h3 class="card__title">${look.name || ''}</h3></a>
                 <p class="card__description">${description}</p>
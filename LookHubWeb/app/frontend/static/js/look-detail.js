@@ -16,13 +16,16 @@ function renderLookDetail(look) {
     // Рендерим все изображения
     const imagesList = document.getElementById('look-images-list');
     imagesList.innerHTML = '';
-    if (Array.isArray(look.image_urls)) {
-        look.image_urls.forEach((url, index) => {
+    if (Array.isArray(look.images)) {
+        look.images.forEach((image, index) => {
             const li = document.createElement('li');
             li.className = 'image__item';
             li.setAttribute('data-aos', 'fade-up');
             li.setAttribute('data-aos-delay', `${index * 100}`); // Каждое следующее изображение появляется с задержкой 100мс
-            li.innerHTML = `<img src="${url}" alt="Look image">`;
+            const avifSource = image.avif_srcset ? `<source type="image/avif" srcset="${image.avif_srcset}" sizes="(max-width: 960px) 100vw, 960px">` : '';
+            const size = image.width ? `width="${image.width}" height="${image.height}"` : '';
+            const style = image.dominant_color ? `style="background-color: ${image.dominant_color}"` : '';
+            li.innerHTML = `<picture>${avifSource}<img src="${image.medium}" srcset="${image.srcset}" sizes="(max-width: 960px) 100vw, 960px" ${size} ${style} alt="Look image"></picture>`;
             imagesList.appendChild(li);
         });
     }
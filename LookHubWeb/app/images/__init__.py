@@ -0,0 +1,3 @@
+"""
+Images package for serving stored look images.
+"""
@@ -0,0 +1,113 @@
+import logging
+from bisect import bisect_left
+from pathlib import Path
+from urllib.parse import quote
+
+from fastapi import APIRouter, Query, Response
+from fastapi.responses import FileResponse
+from PIL import UnidentifiedImageError
+from PIL.Image import DecompressionBombError
+
+from app.application.exceptions import UnknownError
+from app.application.utils import LocalImageStorage
+from app.config import (
+    IMAGE_ACCEL_REDIRECT_PREFIX,
+    IMAGE_CACHE_ACCEL_REDIRECT_PREFIX,
+    IMAGE_CACHE_CONTROL,
+    IMAGE_LEGACY_CACHE_CONTROL,
+    IMAGE_CONTENT_TYPES,
+    IMAGE_RESIZE_MAX_DIMENSION,
+    IMAGE_RESIZE_FORMATS,
+    IMAGE_RESIZE_SIZES,
+)
+from app.domain.entities.images import is_content_addressed
+from app.infrastructure.image_cache import derivative_cache
+from app.infrastructure.image_processing import image_processor
+
+logger = logging.getLogger(__name__)
+
+# Router for stored images
+router = APIRouter(prefix="/images", tags=["Images"])
+
+local_image_storage = LocalImageStorage()
+
+
+def _file_response(
+    path: Path, relative_name: str, accel_prefix: str | None, cache_control: str
+) -> Response:
+    """Send a file, or hand it off to nginx when an internal location is configured."""
+    headers = {"Cache-Control": cache_control}
+    media_type = IMAGE_CONTENT_TYPES[path.suffix.lstrip(".").lower()]
+    if accel_prefix:
+        headers["X-Accel-Redirect"] = f"{accel_prefix}{quote(relative_name)}"
+        return Response(headers=headers, media_type=media_type)
+    return FileResponse(path, headers=headers, media_type=media_type)
+
+
+def _snap_size(size: int | None) -> int | None:
+    """Round a requested dimension up to the nearest allowed size.
+
+    Only a few derivatives per image and format can be requested, so the route
+    cannot be used to fill the derivative cache or keep the process pool busy.
+    """
+    if size is None:
+        return None
+    return IMAGE_RESIZE_SIZES[bisect_left(IMAGE_RESIZE_SIZES, size)]
+
+
+@router.get("/{name:path}", include_in_schema=False)
+async def get_image(
+    name: str,
+    w: int | None = Query(None, ge=1, le=IMAGE_RESIZE_MAX_DIMENSION),
+    h: int | None = Query(None, ge=1, le=IMAGE_RESIZE_MAX_DIMENSION),
+    fmt: str | None = Query(None, pattern=f"^({'|'.join(IMAGE_RESIZE_FORMATS)})$"),
+):
+    """Serve a stored image, optionally resized.
+
+    The app only checks and resolves the image name. With IMAGE_ACCEL_REDIRECT_PREFIX
+    set, the file itself is sent by nginx from its internal location via
+    X-Accel-Redirect, so image bytes never pass through a worker.
+
+    With any of ``w``, ``h`` or ``fmt``, the image is downscaled to fit the box
+    in the process pool on the first request and kept in the derivative cache,
+    from which later requests are served. ``w`` and ``h`` are rounded up to the
+    nearest of IMAGE_RESIZE_SIZES.
+
+    Args:
+        name (str): Storage name of the image
+        w (int | None): Maximum width of the resized image
+        h (int | None): Maximum height of the resized image
+        fmt (str | None): Format of the resized image, the source format by default
+
+    Returns:
+        Response: X-Accel-Redirect response, or the file when nginx is not in front
+
+    Raises:
+        EntityNotFoundError: If the name does not refer to a stored image
+        UnknownError: If the image cannot be resized
+    """
+    path = await local_image_storage.resolve(name)
+    cache_control = (
+        IMAGE_CACHE_CONTROL
+        if is_content_addressed(name)
+        else IMAGE_LEGACY_CACHE_CONTROL
+    )
+    if w is None and h is None and fmt is None:
+        return _file_response(path, name, IMAGE_ACCEL_REDIRECT_PREFIX, cache_control)
+
+    w, h = _snap_size(w), _snap_size(h)
+    fmt = fmt or path.suffix.lstrip(".").lower().replace("jpg", "jpeg")
+    cache_key = derivative_cache.key(name, w, h, fmt)
+    try:
+        cached_path = await derivative_cache.get_or_create(
+            cache_key, lambda: image_processor.resize(path, w, h, fmt)
+        )
+    except (UnidentifiedImageError, DecompressionBombError, OSError) as e:
+        logger.exception(f"Error resizing image {name}: {e}")
+        raise UnknownError from e
+    return _file_response(
+        cached_path,
+        cached_path.relative_to(derivative_cache.directory).as_posix(),
+        IMAGE_CACHE_ACCEL_REDIRECT_PREFIX,
+        cache_control,
+    )
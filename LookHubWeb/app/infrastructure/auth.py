@@ -0,0 +1,237 @@
+import hashlib
+import logging
+import time
+from typing import Any
+
+from jose import jwt, JWTError
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+
+from app.application.exceptions import AuthUnavailableError
+from app.config import (
+    SECRET_KEY,
+    ALGORITHM,
+    REDIS_HOST,
+    REDIS_PORT,
+    TOKEN_CACHE_MAX_SIZE,
+    TOKEN_REVOCATION_CHECK_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+REVOKED_TOKEN_KEY_PREFIX = "revoked_token:"
+
+
+def token_digest(token: str) -> str:
+    """Get a stable digest of a token to use as a cache and revocation key.
+
+    Args:
+        token (str): Raw JWT token
+
+    Returns:
+        str: Hex SHA-256 digest of the token
+    """
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class VerifiedTokenCache:
+    """In-process cache of already verified JWT payloads.
+
+    Entries are keyed by token digest and expire together with the token's ``exp``
+    claim, so a cache hit never outlives the token itself. Each entry also remembers
+    when its revocation status was last confirmed.
+
+    Attributes:
+        max_size (int): Maximum number of cached tokens
+    """
+
+    def __init__(self, max_size: int = TOKEN_CACHE_MAX_SIZE):
+        """Initialize an empty cache.
+
+        Args:
+            max_size (int): Maximum number of cached tokens
+        """
+        self.max_size = max_size
+        self._entries: dict[str, tuple[dict[str, Any], float, float]] = {}
+
+    def get(self, digest: str, now: float) -> tuple[dict[str, Any], float] | None:
+        """Get a cached payload if the token has not expired yet.
+
+        Args:
+            digest (str): Token digest
+            now (float): Current UNIX timestamp
+
+        Returns:
+            tuple[dict, float] | None: Payload and last revocation check time, or None
+        """
+        entry = self._entries.get(digest)
+        if entry is None:
+            return None
+        payload, expires_at, checked_at = entry
+        if expires_at <= now:
+            del self._entries[digest]
+            return None
+        return payload, checked_at
+
+    def set(
+        self, digest: str, payload: dict[str, Any], expires_at: float, checked_at: float
+    ) -> None:
+        """Store a verified payload.
+
+        Args:
+            digest (str): Token digest
+            payload (dict): Decoded token claims
+            expires_at (float): UNIX timestamp of the token's ``exp`` claim
+            checked_at (float): UNIX timestamp of the last revocation check
+        """
+        if digest not in self._entries and len(self._entries) >= self.max_size:
+            self._evict(checked_at)
+        self._entries[digest] = (payload, expires_at, checked_at)
+
+    def discard(self, digest: str) -> None:
+        """Remove a token from the cache.
+
+        Args:
+            digest (str): Token digest
+        """
+        self._entries.pop(digest, None)
+
+    def clear(self) -> None:
+        """Remove all cached tokens."""
+        self._entries.clear()
+
+    def _evict(self, now: float) -> None:
+        """Drop expired entries, or the oldest one if none have expired."""
+        expired = [d for d, (_, exp, _) in self._entries.items() if exp <= now]
+        for digest in expired:
+            del self._entries[digest]
+        if not expired and self._entries:
+            del self._entries[next(iter(self._entries))]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class TokenRevocationStore:
+    """Redis-backed store of revoked tokens shared by all workers.
+
+    Every revoked token is kept as its own key that expires at the token's ``exp``,
+    so the set of revoked tokens never grows beyond the currently valid ones.
+    """
+
+    def __init__(self, redis_client: aioredis.Redis):
+        """Initialize the store.
+
+        Args:
+            redis_client (aioredis.Redis): Async Redis client
+        """
+        self.redis = redis_client
+
+    async def revoke(self, digest: str, expires_at: float) -> None:
+        """Mark a token as revoked until it expires.
+
+        Args:
+            digest (str): Token digest
+            expires_at (float): UNIX timestamp of the token's ``exp`` claim
+        """
+        ttl = int(expires_at - time.time()) + 1
+        if ttl > 0:
+            await self.redis.set(f"{REVOKED_TOKEN_KEY_PREFIX}{digest}", 1, ex=ttl)
+
+    async def is_revoked(self, digest: str) -> bool:
+        """Check whether a token has been revoked.
+
+        Args:
+            digest (str): Token digest
+
+        Returns:
+            bool: True if the token was revoked
+        """
+        return bool(await self.redis.exists(f"{REVOKED_TOKEN_KEY_PREFIX}{digest}"))
+
+
+verified_token_cache = VerifiedTokenCache()
+revocation_store = TokenRevocationStore(
+    aioredis.Redis(host=REDIS_HOST, port=REDIS_PORT, db=0)
+)
+
+
+async def _is_revoked(digest: str, fail_closed: bool) -> bool:
+    """Check revocation.
+
+    An unavailable Redis counts as "not revoked", or raises AuthUnavailableError
+    if ``fail_closed`` is set.
+    """
+    try:
+        return await revocation_store.is_revoked(digest)
+    except RedisError as e:
+        if fail_closed:
+            raise AuthUnavailableError() from e
+        logger.warning(f"Token revocation check failed: {e}")
+        return False
+
+
+async def decode_token(token: str, fail_closed: bool = False) -> dict[str, Any]:
+    """Decode and verify a JWT token, using the verified-token cache.
+
+    A cache hit skips signature and claim verification. The revocation status of a
+    cached token is re-checked in Redis at most every
+    ``TOKEN_REVOCATION_CHECK_SECONDS``.
+
+    Args:
+        token (str): Raw JWT token
+        fail_closed (bool): Reject the token if its revocation cannot be checked
+
+    Returns:
+        dict[str, Any]: Token claims
+
+    Raises:
+        JWTError: If the token is invalid, expired or revoked
+        AuthUnavailableError: If fail_closed is set and Redis is unavailable
+    """
+    digest = token_digest(token)
+    now = time.time()
+
+    cached = verified_token_cache.get(digest, now)
+    if cached is not None:
+        payload, checked_at = cached
+        if now - checked_at < TOKEN_REVOCATION_CHECK_SECONDS:
+            return payload
+    else:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+
+    if await _is_revoked(digest, fail_closed):
+        verified_token_cache.discard(digest)
+        raise JWTError("Token has been revoked")
+
+    expires_at = payload.get("exp")
+    if expires_at is not None:
+        verified_token_cache.set(digest, payload, float(expires_at), now)
+    return payload
+
+
+async def revoke_token(token: str) -> None:
+    """Revoke a token for all workers until it expires.
+
+    Tokens that fail verification are ignored, since they are already unusable.
+
+    Args:
+        token (str): Raw JWT token
+
+    Raises:
+        AuthUnavailableError: If the revocation could not be stored
+    """
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        return
+    digest = token_digest(token)
+    verified_token_cache.discard(digest)
+    expires_at = payload.get("exp")
+    if expires_at is None:
+        return
+    try:
+        await revocation_store.revoke(digest, float(expires_at))
+    except RedisError as e:
+        logger.warning(f"Token revocation failed: {e}")
+        raise AuthUnavailableError() from e
@@ -1,26 +1,65 @@
+import time
 from asyncio import current_task
 from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from typing import AsyncGenerator, Callable, AsyncContextManager
 
+import orjson
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import (
     create_async_engine,
     AsyncSession,
     async_scoped_session,
     async_sessionmaker,
 )
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 
+from app.application.exceptions import RequestTimeoutError
 from app.config import DB_HOST, DB_PORT, DB_USER, DB_PASS, DB_NAME
 
 # Construct database URL from configuration
 DATABASE_URL = f"postgresql+asyncpg://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 
-# Create async engine with default settings
-engine = create_async_engine(DATABASE_URL)
+
+def _json_serializer(value) -> str:
+    """Encode JSON column values with orjson."""
+    return orjson.dumps(value).decode()
+
+
+# Create async engine; JSON columns (content_json, image_metadata) go through
+# the asyncpg json codec with orjson instead of the stdlib json module
+engine = create_async_engine(
+    DATABASE_URL, json_serializer=_json_serializer, json_deserializer=orjson.loads
+)
+
+# Monotonic time by which the current request must finish, None outside requests
+request_deadline: ContextVar[float | None] = ContextVar("request_deadline", default=None)
+
+
+class DeadlineSession(Session):
+    """Session whose transactions are limited by the deadline of the current request."""
+
+
+@event.listens_for(DeadlineSession, "after_begin")
+def _set_statement_timeout(session, transaction, connection) -> None:
+    """Limit the statements of a new transaction to the time left until the request deadline.
+
+    Raises:
+        RequestTimeoutError: If the deadline has already passed
+    """
+    deadline = request_deadline.get()
+    if deadline is None:
+        return
+    remaining_ms = int((deadline - time.monotonic()) * 1000)
+    if remaining_ms <= 0:
+        raise RequestTimeoutError
+    # SET does not take bind parameters; the value is an int computed above
+    connection.exec_driver_sql(f"SET LOCAL statement_timeout = {remaining_ms}")
+
 
 # Create async session factory
 async_session_maker = async_sessionmaker(
-    engine, class_=AsyncSession, expire_on_commit=False
+    engine, class_=AsyncSession, sync_session_class=DeadlineSession, expire_on_commit=False
 )
 
 
@@ -0,0 +1,56 @@
+import json
+import logging
+from typing import AsyncIterator
+
+from redis import asyncio as aioredis
+
+from app.config import (
+    REDIS_HOST,
+    REDIS_PORT,
+    PUBLICATION_EVENTS_CHANNEL,
+    EVENTS_HEARTBEAT_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+events_redis = aioredis.Redis(host=REDIS_HOST, port=REDIS_PORT, db=0)
+
+
+async def subscribe_events(
+    channel: str = PUBLICATION_EVENTS_CHANNEL,
+    heartbeat: float = EVENTS_HEARTBEAT_SECONDS,
+    redis_client: aioredis.Redis | None = None,
+) -> AsyncIterator[dict | None]:
+    """Subscribe to JSON events published to a Redis channel.
+
+    Every subscriber holds its own pub/sub connection until the iterator is
+    closed. Messages that are not JSON objects are skipped.
+
+    Args:
+        channel (str): Redis channel
+        heartbeat (float): Seconds without events after which None is yielded
+        redis_client (aioredis.Redis | None): Client to subscribe with, the shared one if None
+
+    Yields:
+        dict | None: Published event, or None when the channel was idle for a heartbeat
+    """
+    pubsub = (redis_client or events_redis).pubsub(ignore_subscribe_messages=True)
+    await pubsub.subscribe(channel)
+    try:
+        while True:
+            message = await pubsub.get_message(timeout=heartbeat)
+            if message is None:
+                yield None
+                continue
+            try:
+                event = json.loads(message["data"])
+            except ValueError:
+                logger.warning(
+                    f"Skipping malformed event on {channel}: {message['data']!r}"
+                )
+                continue
+            if isinstance(event, dict):
+                yield event
+    finally:
+        await pubsub.unsubscribe(channel)
+        await pubsub.aclose()
@@ -0,0 +1,218 @@
+import asyncio
+import fcntl
+import hashlib
+import logging
+import os
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Awaitable, Callable
+
+from app.config import APP_WORKERS, IMAGE_CACHE_DIR, IMAGE_CACHE_MAX_BYTES
+from app.infrastructure.metrics import register_collector
+
+logger = logging.getLogger(__name__)
+
+
+class DerivativeCache:
+    """On-disk cache of resized images with an LRU size budget.
+
+    On first use, a worker locks one of the ``worker-<n>`` slots of the cache
+    directory for as long as it runs, and only reads, writes and evicts files
+    in that slot. Its recency index is built from the modification times of
+    the slot's files, so a restarted worker takes over the files of the slot
+    it gets. When the slot exceeds its budget, the least recently used files
+    are removed. Concurrent requests for the same derivative wait for a
+    single producer.
+
+    By default each of the WORKERS slots gets an even share of
+    IMAGE_CACHE_MAX_BYTES, so all workers together stay within it.
+
+    Attributes:
+        directory (Path): Cache directory shared by all workers
+        max_bytes (int): Size budget of this worker's slot
+        slots (int): Number of worker slots sharing the budget
+    """
+
+    def __init__(
+        self,
+        directory: Path = IMAGE_CACHE_DIR,
+        max_bytes: int = IMAGE_CACHE_MAX_BYTES // APP_WORKERS,
+        slots: int = APP_WORKERS,
+    ):
+        """Initialize the cache without claiming a slot or scanning the directory.
+
+        Args:
+            directory (Path): Cache directory shared by all workers
+            max_bytes (int): Size budget of this worker's slot
+            slots (int): Number of worker slots sharing the budget
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.slots = slots
+        self._slot_dir: Path | None = None
+        self._slot_lock = None
+        self._index: OrderedDict[str, int] | None = None
+        self._size = 0
+        self._pending: dict[str, asyncio.Future] = {}
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def key(*parts) -> str:
+        """Build a sharded cache file name from the parameters of a derivative.
+
+        Args:
+            *parts: Source name, dimensions and format; the last part is the file extension
+
+        Returns:
+            str: Relative path of the cached file
+        """
+        digest = hashlib.sha256(
+            "|".join(str(part) for part in parts).encode()
+        ).hexdigest()
+        return f"{digest[:2]}/{digest[2:4]}/{digest}.{parts[-1]}"
+
+    async def get_or_create(
+        self, key: str, produce: Callable[[], Awaitable[bytes]]
+    ) -> Path:
+        """Get the path of a cached file, producing it on a miss.
+
+        Args:
+            key (str): Relative path of the cached file
+            produce (Callable[[], Awaitable[bytes]]): Coroutine function producing the file contents
+
+        Returns:
+            Path: Path of the cached file
+        """
+        if self._slot_dir is None:
+            self._slot_dir = self._claim_slot()
+        if self._index is None:
+            await self._load_index()
+        path = self._slot_dir / key
+
+        if key in self._index:
+            if await asyncio.to_thread(path.is_file):
+                self._index.move_to_end(key)
+                self._hits += 1
+                return path
+            self._size -= self._index.pop(key)
+
+        if key in self._pending:
+            return await asyncio.shield(self._pending[key])
+
+        self._misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            data = await produce()
+            await asyncio.to_thread(self._write, path, data)
+            self._index[key] = len(data)
+            self._size += len(data)
+            await self._evict()
+            future.set_result(path)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved when nobody else waits for it
+            future.exception()
+            raise
+        finally:
+            del self._pending[key]
+        return path
+
+    def _claim_slot(self) -> Path:
+        """Lock the first free worker slot for the lifetime of this process.
+
+        The lock is released by the OS when the process exits, so the slot of
+        a worker that died is taken over by its replacement.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        slot = 0
+        while True:
+            lock_file = open(self.directory / f".worker-{slot}.lock", "w")
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                lock_file.close()
+                slot += 1
+                continue
+            if slot >= self.slots:
+                # Only while an old worker is still shutting down
+                logger.warning(
+                    f"All {self.slots} image cache slots are taken, using slot {slot}"
+                )
+            self._slot_lock = lock_file
+            return self.directory / f"worker-{slot}"
+
+    async def _load_index(self) -> None:
+        """Index existing cache files from the least to the most recently modified."""
+        entries = await asyncio.to_thread(self._scan)
+        if self._index is not None:
+            return
+        self._index = OrderedDict()
+        for key, size, _ in sorted(entries, key=lambda entry: entry[2]):
+            self._index[key] = size
+            self._size += size
+
+    def _scan(self) -> list[tuple[str, int, float]]:
+        entries = []
+        for root, _, files in os.walk(self._slot_dir):
+            for name in files:
+                if name.startswith("."):
+                    continue
+                path = Path(root) / name
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append(
+                    (
+                        path.relative_to(self._slot_dir).as_posix(),
+                        stat.st_size,
+                        stat.st_mtime,
+                    )
+                )
+        return entries
+
+    @staticmethod
+    def _write(path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+    async def _evict(self) -> None:
+        """Remove least recently used files until the cache fits its budget."""
+        evicted = []
+        while self._size > self.max_bytes and len(self._index) > 1:
+            key, size = self._index.popitem(last=False)
+            self._size -= size
+            evicted.append(self._slot_dir / key)
+        if evicted:
+            self._evictions += len(evicted)
+            await asyncio.to_thread(
+                lambda: [path.unlink(missing_ok=True) for path in evicted]
+            )
+            logger.info(f"Evicted {len(evicted)} resized images from the cache")
+
+    def metrics(self) -> dict[str, float]:
+        """Get current cache metrics.
+
+        Returns:
+            dict[str, float]: Metric name -> value
+        """
+        return {
+            "lookhub_image_cache_bytes": self._size,
+            "lookhub_image_cache_files": len(self._index or ()),
+            "lookhub_image_cache_hits_total": self._hits,
+            "lookhub_image_cache_misses_total": self._misses,
+            "lookhub_image_cache_evictions_total": self._evictions,
+        }
+
+
+derivative_cache = DerivativeCache()
+register_collector(derivative_cache.metrics)
@@ -0,0 +1,189 @@
+import asyncio
+import logging
+from typing import Callable
+
+from app.application.interfaces import (
+    ImageDeletionQueueInterface,
+    LooksRepositoryInterface,
+)
+from app.application.utils import get_image_storage
+from app.config import (
+    IMAGE_DELETE_BATCH_SIZE,
+    IMAGE_DELETE_MAX_ATTEMPTS,
+    IMAGE_DELETE_RETRY_SECONDS,
+)
+from app.domain.entities.images import derivative_names
+from app.infrastructure.database import scoped_session
+from app.infrastructure.metrics import register_collector
+from app.infrastructure.repositories.looks import LooksRepository
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundImageDeletionQueue(ImageDeletionQueueInterface):
+    """In-process queue that deletes image files in the background.
+
+    Requests only enqueue the names of released images and return. A single
+    drain task, started on the first enqueue, removes them in batches through
+    ``purge_released_images``, which skips images reused since their release.
+    Images whose files could not all be removed are requeued with exponential
+    backoff and, after the last attempt, left to the orphan image garbage
+    collector.
+
+    Attributes:
+        repository_factory (Callable[[], LooksRepositoryInterface]): Creates the
+            repository that claims released images
+        batch_size (int): Maximum number of images deleted at a time
+        max_attempts (int): Attempts per image
+        retry_delay (float): Delay before the first retry in seconds
+    """
+
+    def __init__(
+        self,
+        repository_factory: Callable[[], LooksRepositoryInterface],
+        batch_size: int = IMAGE_DELETE_BATCH_SIZE,
+        max_attempts: int = IMAGE_DELETE_MAX_ATTEMPTS,
+        retry_delay: float = IMAGE_DELETE_RETRY_SECONDS,
+    ):
+        """Initialize the queue without starting the drain task.
+
+        Args:
+            repository_factory (Callable[[], LooksRepositoryInterface]): Creates the
+                repository that claims released images
+            batch_size (int): Maximum number of images deleted at a time
+            max_attempts (int): Attempts per image
+            retry_delay (float): Delay before the first retry in seconds
+        """
+        self.repository_factory = repository_factory
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self._queue: asyncio.Queue[tuple[str, int]] | None = None
+        self._task: asyncio.Task | None = None
+        self._retries: dict[tuple[str, int], asyncio.TimerHandle] = {}
+        self._deleted = 0
+        self._failed = 0
+        self._retried = 0
+        self._skipped = 0
+
+    def enqueue(self, image_names: list[str]) -> None:
+        """Schedule released images and all their derivatives for deletion.
+
+        Args:
+            image_names (list[str]): Storage names of full-size images
+        """
+        if self._task is None:
+            self._queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._drain())
+        for image_name in image_names:
+            self._queue.put_nowait((image_name, 1))
+
+    async def stop(self, timeout: float = 10) -> None:
+        """Delete the images queued so far and stop the drain task.
+
+        Images waiting for a retry are left to the garbage collector.
+
+        Args:
+            timeout (float): Maximum time to wait for the queue to drain
+        """
+        if self._task is None:
+            return
+        for handle in self._retries.values():
+            handle.cancel()
+        self._retries.clear()
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Stopped with {self._queue.qsize()} images left to delete")
+        self._task.cancel()
+        self._task = None
+
+    async def _drain(self) -> None:
+        """Delete queued images batch by batch."""
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                await self._delete_batch(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _delete_batch(self, batch: list[tuple[str, int]]) -> None:
+        """Delete a batch of images and schedule retries for the failed ones.
+
+        Args:
+            batch (list[tuple[str, int]]): Storage names with their attempt numbers
+        """
+        failed: set[str] = set()
+
+        async def remove_files(image_names: list[str]) -> set[str]:
+            sources = {
+                name: image_name
+                for image_name in image_names
+                for name in derivative_names(image_name)
+            }
+            try:
+                failed_names = await get_image_storage().delete_many(list(sources))
+            except Exception as e:
+                logger.error(f"Error deleting {len(image_names)} images: {e}")
+                failed_names = list(sources)
+            failed.update(sources[name] for name in failed_names)
+            return failed
+
+        image_names = [name for name, _ in batch]
+        try:
+            removed = await self.repository_factory().purge_released_images(
+                image_names, remove_files
+            )
+        except Exception as e:
+            logger.error(f"Error claiming {len(batch)} images for deletion: {e}")
+            removed = []
+            failed = set(image_names)
+
+        self._deleted += len(removed)
+        self._skipped += len(batch) - len(removed) - len(failed)
+        loop = asyncio.get_running_loop()
+        for name, attempt in batch:
+            if name not in failed:
+                continue
+            if attempt >= self.max_attempts:
+                self._failed += 1
+                logger.error(
+                    f"Giving up deleting image {name} after {attempt} attempts"
+                )
+                continue
+            self._retried += 1
+            self._retries[(name, attempt + 1)] = loop.call_later(
+                self.retry_delay * 2 ** (attempt - 1), self._retry, name, attempt + 1
+            )
+
+    def _retry(self, name: str, attempt: int) -> None:
+        """Requeue an image whose deletion failed."""
+        self._retries.pop((name, attempt), None)
+        if self._task is not None:
+            self._queue.put_nowait((name, attempt))
+
+    def metrics(self) -> dict[str, float]:
+        """Get current queue metrics.
+
+        Returns:
+            dict[str, float]: Metric name -> value
+        """
+        return {
+            "lookhub_image_delete_queue_depth": self._queue.qsize()
+            if self._queue
+            else 0,
+            "lookhub_image_delete_retry_pending": len(self._retries),
+            "lookhub_image_deleted_total": self._deleted,
+            "lookhub_image_delete_retries_total": self._retried,
+            "lookhub_image_delete_skipped_total": self._skipped,
+            "lookhub_image_delete_failed_total": self._failed,
+        }
+
+
+image_deletion_queue = BackgroundImageDeletionQueue(
+    lambda: LooksRepository(scoped_session)
+)
+register_collector(image_deletion_queue.metrics)
@@ -0,0 +1,174 @@
+import asyncio
+import contextlib
+import logging
+
+from app.application.interfaces import ImageHashIndexInterface, LooksRepositoryInterface
+from app.config import IMAGE_INDEX_SYNC_SECONDS
+from app.infrastructure.metrics import register_collector
+
+logger = logging.getLogger(__name__)
+
+
+class BKTree:
+    """Burkhard-Keller tree of 64-bit hashes under the Hamming distance.
+
+    Each node keeps the names of all images with its hash. A search only
+    descends into children whose edge distance can hold a match by the
+    triangle inequality, so most of the tree is skipped for small radii.
+    """
+
+    def __init__(self):
+        """Initialize an empty tree."""
+        # Node: (hash, names, children by distance)
+        self._root: tuple[int, set[str], dict[int, tuple]] | None = None
+        self.size = 0
+
+    def add(self, value: int, name: str) -> None:
+        """Add an image hash to the tree.
+
+        Args:
+            value (int): Perceptual hash
+            name (str): Storage name of the image
+        """
+        if self._root is None:
+            self._root = (value, {name}, {})
+            self.size += 1
+            return
+        node = self._root
+        while True:
+            distance = (node[0] ^ value).bit_count()
+            if distance == 0:
+                # An image added on store is loaded again by the next sync
+                if name not in node[1]:
+                    node[1].add(name)
+                    self.size += 1
+                return
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = (value, {name}, {})
+                self.size += 1
+                return
+            node = child
+
+    def search(self, value: int, max_distance: int) -> list[tuple[str, int]]:
+        """Find images whose hash is within a Hamming distance of the given one.
+
+        Args:
+            value (int): Perceptual hash
+            max_distance (int): Maximum Hamming distance
+
+        Returns:
+            list[tuple[str, int]]: Storage names with their distances
+        """
+        found = []
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            node_value, names, children = stack.pop()
+            distance = (node_value ^ value).bit_count()
+            if distance <= max_distance:
+                found.extend((name, distance) for name in names)
+            for edge, child in children.items():
+                if distance - max_distance <= edge <= distance + max_distance:
+                    stack.append(child)
+        return found
+
+
+class ImageHashIndex(ImageHashIndexInterface):
+    """In-memory BK-tree index of perceptual hashes of stored images.
+
+    Each worker builds its own index from the database at startup, in the
+    background, and adds the images it stores as they are stored. Images
+    stored by other workers are loaded by a periodic sync, which only reads
+    rows registered since the previous one, so searches never query the
+    database. Entries of deleted images stay in the tree until the worker
+    restarts; callers drop them when resolving names to looks.
+    """
+
+    def __init__(self, interval: float = IMAGE_INDEX_SYNC_SECONDS):
+        """Initialize an empty index.
+
+        Args:
+            interval (float): Seconds between periodic syncs
+        """
+        self.interval = interval
+        self._tree = BKTree()
+        self._last_id = 0
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+        self._searches = 0
+
+    async def sync(self, repository: LooksRepositoryInterface) -> None:
+        """Add images registered since the last sync to the index.
+
+        Args:
+            repository (LooksRepositoryInterface): Repository to read image hashes from
+        """
+        async with self._lock:
+            rows = await repository.get_image_hashes(self._last_id)
+            for row_id, name, image_hash in rows:
+                self._tree.add(int(image_hash, 16), name)
+                self._last_id = row_id
+        if rows:
+            logger.info(f"Indexed {len(rows)} image hashes")
+
+    def add(self, name: str, image_hash: str) -> None:
+        """Add a newly stored image to the index.
+
+        Args:
+            name (str): Storage name of the image
+            image_hash (str): Perceptual hash as hex digits
+        """
+        self._tree.add(int(image_hash, 16), name)
+
+    async def _run(self, repository: LooksRepositoryInterface) -> None:
+        while True:
+            try:
+                await self.sync(repository)
+            except Exception as e:
+                logger.warning(f"Syncing image hash index failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self, repository: LooksRepositoryInterface) -> None:
+        """Start building the index and syncing it periodically.
+
+        Args:
+            repository (LooksRepositoryInterface): Repository to read image hashes from
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(repository))
+
+    async def stop(self) -> None:
+        """Stop syncing the index."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    def search(self, image_hash: str, max_distance: int) -> list[tuple[str, int]]:
+        """Find images whose hash is within a Hamming distance of the given one.
+
+        Args:
+            image_hash (str): Perceptual hash as hex digits
+            max_distance (int): Maximum Hamming distance
+
+        Returns:
+            list[tuple[str, int]]: Storage names with their distances
+        """
+        self._searches += 1
+        return self._tree.search(int(image_hash, 16), max_distance)
+
+    def metrics(self) -> dict[str, float]:
+        """Get current index metrics.
+
+        Returns:
+            dict[str, float]: Metric name -> value
+        """
+        return {
+            "lookhub_image_hash_index_size": self._tree.size,
+            "lookhub_image_hash_searches_total": self._searches,
+        }
+
+
+image_hash_index = ImageHashIndex()
+register_collector(image_hash_index.metrics, aggregate="max")
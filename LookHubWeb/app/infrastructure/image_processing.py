@@ -0,0 +1,146 @@
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from app.application.interfaces import ImageProcessorInterface
+from app.application.utils import encode_image_source, resize_image_source
+from app.domain.entities.images import EncodedImage
+from app.config import (
+    IMAGE_PROCESS_WORKERS,
+    IMAGE_MAX_CONCURRENCY,
+    IMAGE_MAX_TASKS_PER_CHILD,
+)
+from app.infrastructure.metrics import register_collector
+
+logger = logging.getLogger(__name__)
+
+
+class ProcessPoolImageProcessor(ImageProcessorInterface):
+    """Image processor that runs decoding and encoding in a process pool.
+
+    The pool is created by ``start`` during application startup. Until then, or
+    after ``shutdown``, images are processed in a thread as before. A semaphore
+    bounds the number of images in flight, and callers beyond the limit wait in
+    the queue reported by ``metrics``.
+
+    Attributes:
+        max_workers (int): Number of pool processes
+        max_concurrency (int): Maximum number of images processed at once
+    """
+
+    def __init__(
+        self,
+        max_workers: int = IMAGE_PROCESS_WORKERS,
+        max_concurrency: int = IMAGE_MAX_CONCURRENCY,
+    ):
+        """Initialize the processor without starting the pool.
+
+        Args:
+            max_workers (int): Number of pool processes
+            max_concurrency (int): Maximum number of images processed at once
+        """
+        self.max_workers = max_workers
+        self.max_concurrency = max_concurrency
+        self._executor: ProcessPoolExecutor | None = None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._queued = 0
+        self._in_flight = 0
+        self._completed = 0
+        self._failed = 0
+
+    def start(self) -> None:
+        """Start the process pool."""
+        if self._executor is not None:
+            return
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            max_tasks_per_child=IMAGE_MAX_TASKS_PER_CHILD,
+        )
+        logger.info(f"Started image process pool with {self.max_workers} workers")
+
+    def shutdown(self) -> None:
+        """Stop the process pool, waiting for running tasks."""
+        if self._executor is None:
+            return
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._executor = None
+
+    async def run(self, func, *args):
+        """Run a picklable function in the pool under the concurrency limit.
+
+        Args:
+            func: Module-level function to run
+            *args: Picklable arguments for the function
+
+        Returns:
+            Any: Result of the function
+        """
+        self._queued += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._queued -= 1
+
+        self._in_flight += 1
+        try:
+            if self._executor is None:
+                result = await asyncio.to_thread(func, *args)
+            else:
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(self._executor, func, *args)
+        except Exception:
+            self._failed += 1
+            raise
+        finally:
+            self._in_flight -= 1
+            self._semaphore.release()
+        self._completed += 1
+        return result
+
+    async def encode_image(self, source: bytes | Path) -> EncodedImage:
+        """Decode an uploaded image, encode its derivatives and extract its metadata in the pool.
+
+        Args:
+            source (bytes | Path): Raw image bytes or path of a spooled upload
+
+        Returns:
+            EncodedImage: Encoded derivatives and image metadata
+        """
+        return await self.run(encode_image_source, source)
+
+    async def resize(
+        self, source: Path, width: int | None, height: int | None, fmt: str
+    ) -> bytes:
+        """Downscale a stored image and encode it in the pool.
+
+        Args:
+            source (Path): Path of the stored image
+            width (int | None): Maximum width, unbounded if None
+            height (int | None): Maximum height, unbounded if None
+            fmt (str): Output format
+
+        Returns:
+            bytes: Encoded image
+        """
+        return await self.run(resize_image_source, source, width, height, fmt)
+
+    def metrics(self) -> dict[str, float]:
+        """Get current queue and throughput metrics.
+
+        Returns:
+            dict[str, float]: Metric name -> value
+        """
+        return {
+            "lookhub_image_pool_workers": self.max_workers if self._executor else 0,
+            "lookhub_image_queue_depth": self._queued,
+            "lookhub_image_in_flight": self._in_flight,
+            "lookhub_image_completed_total": self._completed,
+            "lookhub_image_failed_total": self._failed,
+        }
+
+
+image_processor = ProcessPoolImageProcessor()
+register_collector(image_processor.metrics)
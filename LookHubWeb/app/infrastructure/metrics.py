@@ -0,0 +1,157 @@
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Callable
+
+from app.config import METRICS_DIR, METRICS_FLUSH_SECONDS, METRICS_STALE_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# Collectors return metric name -> value pairs, sampled on every scrape,
+# together with how the values of all workers are combined ("sum" or "max")
+_collectors: list[tuple[Callable[[], dict[str, float]], str]] = []
+
+
+def register_collector(
+    collector: Callable[[], dict[str, float]], aggregate: str = "sum"
+) -> None:
+    """Register a metrics collector for the /metrics endpoint.
+
+    Args:
+        collector (Callable[[], dict[str, float]]): Function returning current metric values
+        aggregate (str): "sum" to add up the values of all workers, "max" for
+            state every worker holds a copy of; counters (``*_total``) are always summed
+    """
+    _collectors.append((collector, aggregate))
+
+
+def collect_metrics() -> dict[str, tuple[float, str]]:
+    """Sample all registered collectors of this worker.
+
+    Returns:
+        dict[str, tuple[float, str]]: Metric name -> value and aggregation
+    """
+    return {
+        name: (value, "sum" if name.endswith("_total") else aggregate)
+        for collector, aggregate in _collectors
+        for name, value in collector().items()
+    }
+
+
+def render_metrics(samples: dict[str, float]) -> str:
+    """Render metrics in the Prometheus text exposition format.
+
+    Args:
+        samples (dict[str, float]): Metric name -> value
+
+    Returns:
+        str: Metrics text
+    """
+    return "".join(f"{name} {value}\n" for name, value in samples.items())
+
+
+class WorkerMetricsSnapshots:
+    """Shares metrics between the app worker processes through files.
+
+    A scrape is answered by one gunicorn worker only, so every worker writes
+    its samples to ``<directory>/<pid>.json`` periodically and on each scrape.
+    The worker that answers combines the snapshots of all live workers.
+    Snapshots not refreshed within ``stale_after`` seconds belong to workers
+    that are gone and are removed.
+    """
+
+    def __init__(
+        self,
+        directory: Path = METRICS_DIR,
+        interval: float = METRICS_FLUSH_SECONDS,
+        stale_after: float = METRICS_STALE_SECONDS,
+        worker_id: int | None = None,
+    ):
+        """Initialize the snapshots of this worker.
+
+        Args:
+            directory (Path): Directory shared by all workers
+            interval (float): Seconds between periodic writes
+            stale_after (float): Age in seconds after which a snapshot is dropped
+            worker_id (int | None): Name of this worker's snapshot, the PID if None
+        """
+        self.directory = directory
+        self.interval = interval
+        self.stale_after = stale_after
+        self.worker_id = worker_id
+        self._task: asyncio.Task | None = None
+
+    @property
+    def path(self) -> Path:
+        """Snapshot file of this worker."""
+        worker_id = os.getpid() if self.worker_id is None else self.worker_id
+        return self.directory / f"{worker_id}.json"
+
+    def write(self, samples: dict[str, tuple[float, str]]) -> None:
+        """Replace the snapshot of this worker.
+
+        Args:
+            samples (dict[str, tuple[float, str]]): Metric name -> value and aggregation
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        temporary = self.path.with_suffix(".tmp")
+        temporary.write_text(json.dumps(samples))
+        os.replace(temporary, self.path)
+
+    def aggregate(self, samples: dict[str, tuple[float, str]]) -> dict[str, float]:
+        """Store the samples of this worker and combine them with the other workers.
+
+        Args:
+            samples (dict[str, tuple[float, str]]): Current samples of this worker
+
+        Returns:
+            dict[str, float]: Metric name -> value over all live workers
+        """
+        self.write(samples)
+        combined: dict[str, float] = {}
+        now = time.time()
+        for path in self.directory.glob("*.json"):
+            try:
+                if now - path.stat().st_mtime > self.stale_after:
+                    path.unlink(missing_ok=True)
+                    continue
+                snapshot = json.loads(path.read_text())
+            except (OSError, ValueError):
+                continue
+            for name, (value, aggregate) in snapshot.items():
+                if name not in combined:
+                    combined[name] = value
+                elif aggregate == "max":
+                    combined[name] = max(combined[name], value)
+                else:
+                    combined[name] += value
+        return combined
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.write, collect_metrics())
+            except OSError as e:
+                logger.warning(f"Writing metrics snapshot failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """Start writing snapshots periodically."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop writing snapshots and remove the one of this worker."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        self.path.unlink(missing_ok=True)
+
+
+worker_metrics = WorkerMetricsSnapshots()
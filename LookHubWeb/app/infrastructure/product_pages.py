@@ -0,0 +1,380 @@
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import time
+from html.parser import HTMLParser
+from typing import Any
+from urllib.parse import urljoin, urlsplit
+
+import httpx
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+
+from app.application.exceptions import ProductPageError
+from app.application.interfaces import (
+    ProductExtractorInterface,
+    ProductPageFetcherInterface,
+)
+from app.config import (
+    INGEST_MAX_CONCURRENCY,
+    INGEST_DOMAIN_DELAY_SECONDS,
+    INGEST_FETCH_TIMEOUT_SECONDS,
+    INGEST_MAX_PAGE_BYTES,
+    INGEST_PAGE_CACHE_SECONDS,
+    INGEST_USER_AGENT,
+)
+from app.domain.entities.clothes import ClothesCreate
+from app.domain.entities.enums import ColourEnum, GenderEnum
+
+logger = logging.getLogger(__name__)
+
+PAGE_CACHE_KEY_PREFIX = "product_page:"
+
+
+class RedisPageCache:
+    """Redis-backed cache of fetched product pages shared by all workers.
+
+    Pages are kept under a digest of their URL and expire after a TTL, so a
+    link ingested again, or retried, does not hit the shop a second time.
+    Redis errors are logged and treated as a cache miss.
+    """
+
+    def __init__(
+        self, redis_client: aioredis.Redis, ttl: int = INGEST_PAGE_CACHE_SECONDS
+    ):
+        """Initialize the cache.
+
+        Args:
+            redis_client (aioredis.Redis): Async Redis client
+            ttl (int): Seconds a page is kept
+        """
+        self.redis = redis_client
+        self.ttl = ttl
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return f"{PAGE_CACHE_KEY_PREFIX}{hashlib.sha256(url.encode()).hexdigest()}"
+
+    async def get(self, url: str) -> str | None:
+        """Get a cached page.
+
+        Args:
+            url (str): URL of the page
+
+        Returns:
+            str | None: HTML of the page, None if it is not cached
+        """
+        try:
+            html = await self.redis.get(self._key(url))
+        except RedisError as e:
+            logger.warning(f"Product page cache is unavailable: {e}")
+            return None
+        return html.decode() if html is not None else None
+
+    async def set(self, url: str, html: str) -> None:
+        """Cache a page.
+
+        Args:
+            url (str): URL of the page
+            html (str): HTML of the page
+        """
+        try:
+            await self.redis.set(self._key(url), html.encode(), ex=self.ttl)
+        except RedisError as e:
+            logger.warning(f"Product page cache is unavailable: {e}")
+
+
+class ProductPageFetcher(ProductPageFetcherInterface):
+    """HTTP fetcher of product pages that is polite to the shops.
+
+    A single client is reused for all requests. At most ``max_concurrency``
+    pages are downloaded at once and one at a time per host, and a request to
+    a host starts at least ``domain_delay`` seconds after the previous one
+    ended. Pages are read up to a size limit and cached when a cache is given.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = INGEST_MAX_CONCURRENCY,
+        domain_delay: float = INGEST_DOMAIN_DELAY_SECONDS,
+        timeout: float = INGEST_FETCH_TIMEOUT_SECONDS,
+        max_page_bytes: int = INGEST_MAX_PAGE_BYTES,
+        cache: RedisPageCache | None = None,
+    ):
+        """Initialize the fetcher.
+
+        Args:
+            max_concurrency (int): Maximum number of pages downloaded at once
+            domain_delay (float): Minimum seconds between requests to the same host
+            timeout (float): Timeout of a single request in seconds
+            max_page_bytes (int): Maximum size of a page
+            cache (RedisPageCache | None): Cache of fetched pages, None to always fetch
+        """
+        self.max_concurrency = max_concurrency
+        self.domain_delay = domain_delay
+        self.timeout = timeout
+        self.max_page_bytes = max_page_bytes
+        self.cache = cache
+        self._client: httpx.AsyncClient | None = None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._host_locks: dict[str, asyncio.Lock] = {}
+        self._next_request_at: dict[str, float] = {}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """HTTP client, created on first use."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                follow_redirects=True,
+                headers={"User-Agent": INGEST_USER_AGENT},
+                limits=httpx.Limits(max_connections=self.max_concurrency),
+            )
+        return self._client
+
+    async def _download(self, url: str) -> str:
+        """Download a page, reading at most max_page_bytes of it."""
+        try:
+            async with self.client.stream("GET", url) as response:
+                response.raise_for_status()
+                chunks, size = [], 0
+                async for chunk in response.aiter_bytes():
+                    size += len(chunk)
+                    if size > self.max_page_bytes:
+                        raise ProductPageError(
+                            url, f"page exceeds {self.max_page_bytes} bytes"
+                        )
+                    chunks.append(chunk)
+                return b"".join(chunks).decode(
+                    response.encoding or "utf-8", errors="replace"
+                )
+        except httpx.HTTPError as e:
+            raise ProductPageError(url, str(e) or type(e).__name__) from e
+
+    async def fetch(self, url: str) -> str:
+        """Fetch the HTML of a product page.
+
+        Args:
+            url (str): URL of the product page
+
+        Returns:
+            str: HTML of the page
+
+        Raises:
+            ProductPageError: If the URL is not http(s), the request fails or the page is too large
+        """
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ProductPageError(url, "not an http(s) URL")
+        if self.cache is not None and (html := await self.cache.get(url)) is not None:
+            return html
+
+        # One request per host at a time, the next one no sooner than domain_delay after it
+        lock = self._host_locks.setdefault(parts.hostname, asyncio.Lock())
+        async with lock:
+            delay = self._next_request_at.get(parts.hostname, 0) - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            try:
+                async with self._semaphore:
+                    html = await self._download(url)
+            finally:
+                self._next_request_at[parts.hostname] = (
+                    time.monotonic() + self.domain_delay
+                )
+
+        if self.cache is not None:
+            await self.cache.set(url, html)
+        return html
+
+    async def close(self) -> None:
+        """Close the HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class _ProductPageParser(HTMLParser):
+    """Collects the parts of a page that describe a product.
+
+    Keeps the first value of every ``<meta>`` property or name, the page title
+    and the contents of all JSON-LD scripts.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.meta: dict[str, str] = {}
+        self.title = ""
+        self.json_ld: list[str] = []
+        self._in_title = False
+        self._in_json_ld = False
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        attributes = dict(attrs)
+        if tag == "meta":
+            key = attributes.get("property") or attributes.get("name")
+            if key and attributes.get("content"):
+                self.meta.setdefault(key.lower(), attributes["content"].strip())
+        elif tag == "title":
+            self._in_title = True
+        elif (
+            tag == "script"
+            and (attributes.get("type") or "").lower() == "application/ld+json"
+        ):
+            self._in_json_ld = True
+            self.json_ld.append("")
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "title":
+            self._in_title = False
+        elif tag == "script":
+            self._in_json_ld = False
+
+    def handle_data(self, data: str) -> None:
+        if self._in_title:
+            self.title += data
+        elif self._in_json_ld:
+            self.json_ld[-1] += data
+
+
+_RU_ENDING = r"(?:ый|ий|ой|ая|яя|ое|ее|ые|ие|ого|его|ую|юю|ых|их)"
+COLOUR_PATTERNS = {
+    colour: re.compile(rf"\b(?:{pattern})\b", re.IGNORECASE)
+    for colour, pattern in {
+        ColourEnum.white: rf"бел{_RU_ENDING}|white",
+        ColourEnum.beige: rf"бежев{_RU_ENDING}|beige",
+        ColourEnum.gray: rf"сер{_RU_ENDING}|gr[ae]y",
+        ColourEnum.red: rf"красн{_RU_ENDING}|red",
+        ColourEnum.pink: rf"розов{_RU_ENDING}|pink",
+        ColourEnum.orange: rf"оранжев{_RU_ENDING}|orange",
+        ColourEnum.yellow: rf"ж[её]лт{_RU_ENDING}|yellow",
+        ColourEnum.green: rf"зел[её]н{_RU_ENDING}|green",
+        ColourEnum.light_blue: rf"голуб{_RU_ENDING}|light blue|sky blue",
+        ColourEnum.blue: rf"син{_RU_ENDING}|(?<!light )(?<!sky )blue|navy",
+        ColourEnum.purple: rf"фиолетов{_RU_ENDING}|purple|violet",
+        ColourEnum.brown: rf"коричнев{_RU_ENDING}|brown",
+        ColourEnum.black: rf"ч[её]рн{_RU_ENDING}|black",
+    }.items()
+}
+FEMALE_PATTERN = re.compile(
+    r"\b(?:женск\w*|для женщин|women\w*|woman|female|girls?)\b", re.IGNORECASE
+)
+MALE_PATTERN = re.compile(
+    r"\b(?:мужск\w*|для мужчин|men|men's|mens|man|male|boys?)\b", re.IGNORECASE
+)
+
+
+class HTMLProductExtractor(ProductExtractorInterface):
+    """Extracts clothes from the markup shops publish for search engines.
+
+    Uses the schema.org ``Product`` in JSON-LD first, then OpenGraph tags and
+    the page title. Colours and gender are recognised by keywords in Russian
+    and English; a page that names no gender is treated as unisex.
+    """
+
+    @staticmethod
+    def _find_product(node: Any) -> dict | None:
+        """Find the first schema.org Product in parsed JSON-LD."""
+        if isinstance(node, list):
+            for item in node:
+                if product := HTMLProductExtractor._find_product(item):
+                    return product
+        elif isinstance(node, dict):
+            types = node.get("@type")
+            if types == "Product" or (isinstance(types, list) and "Product" in types):
+                return node
+            return HTMLProductExtractor._find_product(node.get("@graph"))
+        return None
+
+    @staticmethod
+    def _text(value: Any) -> str | None:
+        """Get a plain string from a JSON-LD value that may be a list or an object."""
+        if isinstance(value, list):
+            value = value[0] if value else None
+        if isinstance(value, dict):
+            value = value.get("url") or value.get("name") or value.get("@id")
+        return str(value).strip() if value else None
+
+    def extract(self, url: str, html: str) -> ClothesCreate:
+        """Extract a clothing item from the HTML of its product page.
+
+        Args:
+            url (str): URL of the product page
+            html (str): HTML of the page
+
+        Returns:
+            ClothesCreate: Data of the clothing item
+
+        Raises:
+            ProductPageError: If the page has no product name or image
+        """
+        parser = _ProductPageParser()
+        parser.feed(html)
+        parser.close()
+
+        product = {}
+        for script in parser.json_ld:
+            try:
+                product = self._find_product(json.loads(script)) or {}
+            except ValueError:
+                continue
+            if product:
+                break
+
+        name = (
+            self._text(product.get("name"))
+            or parser.meta.get("og:title")
+            or parser.title.strip()
+        )
+        image_url = self._text(product.get("image")) or parser.meta.get("og:image")
+        if not name:
+            raise ProductPageError(url, "no product name on the page")
+        if not image_url:
+            raise ProductPageError(url, "no product image on the page")
+        description = (
+            self._text(product.get("description"))
+            or parser.meta.get("og:description")
+            or parser.meta.get("description")
+        )
+
+        colour_text = " ".join(filter(None, [self._text(product.get("color")), name]))
+        colours = [
+            colour
+            for colour, pattern in COLOUR_PATTERNS.items()
+            if pattern.search(colour_text)
+        ]
+
+        audience = product.get("audience")
+        gender_text = " ".join(
+            filter(
+                None,
+                [
+                    self._text(audience.get("suggestedGender"))
+                    if isinstance(audience, dict)
+                    else None,
+                    name,
+                    urlsplit(url).path.replace("/", " ").replace("-", " "),
+                ],
+            )
+        )
+        female, male = FEMALE_PATTERN.search(gender_text), MALE_PATTERN.search(
+            gender_text
+        )
+        gender = (
+            GenderEnum.female
+            if female and not male
+            else GenderEnum.male
+            if male and not female
+            else GenderEnum.unisex
+        )
+
+        return ClothesCreate(
+            name=name,
+            description=description,
+            colours=colours,
+            gender=gender,
+            link=url,
+            image_url=urljoin(url, image_url),
+        )
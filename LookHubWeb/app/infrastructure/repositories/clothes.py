@@ -1,3 +1,5 @@
+from sqlalchemy import ColumnElement, Integer
+
 from app.infrastructure.repositories.models.clothes import Clothes
 from app.infrastructure.repositories.sqlalchemy import SQLAlchemyRepository
 
@@ -11,3 +13,18 @@ class ClothesRepository(SQLAlchemyRepository[Clothes]):
 
     _model = Clothes
 
+    def _filters(self, colours: list[str] | None = None, **filter_by) -> list[ColumnElement[bool]]:
+        """Build WHERE conditions from list filters.
+        
+        Args:
+            colours (list[str] | None): Match clothes having any of these colours
+            **filter_by: Field values to match
+            
+        Returns:
+            list[ColumnElement[bool]]: Conditions to apply
+        """
+        conditions = super()._filters(**filter_by)
+        if colours:
+            # Colours are a bitmask, so "any of" is a single bitwise AND
+            conditions.append(self._model.colours.op("&", return_type=Integer)(colours) != 0)
+        return conditions
@@ -1,10 +1,17 @@
-from typing import Any
+from collections import Counter
+from datetime import timedelta
+from typing import Any, Awaitable, Callable
 
-from sqlalchemy import select, insert, update, delete
+from sqlalchemy import ARRAY, String, and_, bindparam, func, or_, select, insert, update, delete
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
+from app.application.exceptions import ClothesNotFoundError, EntityNotFoundError
 from app.application.interfaces import LooksRepositoryInterface
+from app.domain.entities.images import is_content_addressed
 from app.infrastructure.repositories.models.association import clothescategory_clothes
+from app.infrastructure.repositories.models.clothes import Clothes
 from app.infrastructure.repositories.models.clothes_categories import ClothesCategory
+from app.infrastructure.repositories.models.look_images import LookImage
 from app.infrastructure.repositories.models.looks import Look
 from app.infrastructure.repositories.sqlalchemy import SQLAlchemyRepository
 
@@ -49,6 +56,116 @@ class LooksRepository(SQLAlchemyRepository[Look], LooksRepositoryInterface):
             ans = res.unique().scalar_one()
         return ans.__dict__
 
+    async def add_many(self, looks: list[dict[str, Any]]) -> list[int]:
+        """Create looks with their clothes categories and image references in one transaction.
+        
+        Looks, categories, category clothes and image references are each
+        written with a single multi-row statement, so the number of round trips
+        does not depend on the number of looks.
+        
+        Args:
+            looks (list[dict[str, Any]]): Look data, each with a "clothes_categories" list
+                of {"name": str, "clothes": list[int]}
+            
+        Returns:
+            list[int]: IDs of the created looks, in input order
+            
+        Raises:
+            ClothesNotFoundError: If categories refer to clothes that do not exist
+        """
+        if not looks:
+            return []
+        look_rows = [{k: v for k, v in look.items() if k != "clothes_categories"} for look in looks]
+        clothes_ids = {
+            clothes_id
+            for look in looks
+            for category in look.get("clothes_categories", [])
+            for clothes_id in category.get("clothes", [])
+        }
+        async with self.session() as session:
+            # Checked up front, a foreign key violation would abort the transaction
+            if clothes_ids:
+                res = await session.execute(select(Clothes.id).where(Clothes.id.in_(clothes_ids)))
+                missing = sorted(clothes_ids - set(res.scalars().all()))
+                if missing:
+                    raise ClothesNotFoundError(missing)
+
+            res = await session.execute(
+                insert(self._model).returning(self._model.id, sort_by_parameter_order=True), look_rows
+            )
+            look_ids = list(res.scalars().all())
+
+            categories = [
+                (look_id, category)
+                for look_id, look in zip(look_ids, looks)
+                for category in look.get("clothes_categories", [])
+            ]
+            if categories:
+                res = await session.execute(
+                    insert(ClothesCategory).returning(ClothesCategory.id, sort_by_parameter_order=True),
+                    [{"name": category["name"], "look_id": look_id} for look_id, category in categories],
+                )
+                association_rows = [
+                    {"clothescategory_id": category_id, "clothes_id": clothes_id}
+                    for category_id, (_, category) in zip(res.scalars().all(), categories)
+                    for clothes_id in category.get("clothes", [])
+                ]
+                if association_rows:
+                    await session.execute(insert(clothescategory_clothes), association_rows)
+
+            image_counts = Counter(key for row in look_rows for key in row.get("image_urls") or [])
+            if image_counts:
+                await self._acquire_images(session, image_counts)
+            await session.commit()
+        return look_ids
+
+    async def update_with_images(
+        self, instance_id: int, data: dict[str, Any]
+    ) -> tuple[dict[str, Any], list[str]]:
+        """Update a look and move its image references in the same transaction.
+        
+        The look row is locked while its current image list is read, so the
+        references of added and removed images always match the stored list.
+        
+        Args:
+            instance_id (int): ID of the look to update
+            data (dict): Dictionary of field values to update, including "image_urls"
+            
+        Returns:
+            tuple[dict[str, Any], list[str]]: Updated look data and keys that have no
+                references left and whose files can be removed
+            
+        Raises:
+            EntityNotFoundError: If the look does not exist
+        """
+        async with self.session() as session:
+            res = await session.execute(
+                select(self._model.image_urls)
+                .where(self._model.id == instance_id)
+                .with_for_update()
+            )
+            row = res.one_or_none()
+            if row is None:
+                raise EntityNotFoundError(self._model.__name__)
+            stmt = (
+                update(self._model)
+                .where(self._model.id == instance_id)
+                .values(**data)
+                .returning(self._model)
+            )
+            res = await session.execute(stmt)
+            look = res.unique().scalar_one()
+
+            current_keys = Counter(row[0] or [])
+            new_keys = Counter(look.image_urls or [])
+            added = new_keys - current_keys
+            if added:
+                await self._acquire_images(session, added)
+            removed = list((current_keys - new_keys).elements())
+            released = await self._release_images(session, removed) if removed else []
+            await session.commit()
+        return look.__dict__, released
+
     async def add_clothes_to_clothes_category(
         self, category_id: int, clothes_id: int
     ) -> dict[str, Any]:
@@ -117,3 +234,268 @@ class LooksRepository(SQLAlchemyRepository[Look], LooksRepositoryInterface):
             res = await session.execute(stmt)
             ans = res.unique().scalar_one()
         return ans.__dict__
+
+    @staticmethod
+    async def _acquire_images(session, counts: Counter) -> None:
+        """Add references to images with one upsert, registering new images.
+        
+        A pending deletion of a re-acquired image is cancelled.
+        """
+        stmt = pg_insert(LookImage).values(
+            [{"key": key, "ref_count": count} for key, count in counts.items()]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[LookImage.key],
+            set_={
+                "ref_count": LookImage.ref_count + stmt.excluded.ref_count,
+                "pending_delete": False,
+            },
+        )
+        await session.execute(stmt)
+
+    @staticmethod
+    async def _release_images(session, keys: list[str]) -> list[str]:
+        """Remove one reference per given key and return keys left without references.
+        
+        Images left without references are marked pending deletion rather than
+        unregistered, see ``purge_released_images``.
+        """
+        released = []
+        for key, count in Counter(keys).items():
+            stmt = (
+                update(LookImage)
+                .where(LookImage.key == key)
+                .values(
+                    ref_count=LookImage.ref_count - count,
+                    pending_delete=LookImage.ref_count - count <= 0,
+                )
+                .returning(LookImage.ref_count)
+            )
+            res = await session.execute(stmt)
+            ref_count = res.scalar_one_or_none()
+            if ref_count is None or ref_count <= 0:
+                released.append(key)
+        return released
+
+    async def release_images(self, keys: list[str]) -> list[str]:
+        """Remove one reference per given key from stored images.
+        
+        Images without a reference row were stored before content addressing and
+        are never shared, so they are always released.
+        
+        Args:
+            keys (list[str]): Storage names of the images, repeated once per reference
+            
+        Returns:
+            list[str]: Keys that have no references left, to be passed to
+                ``purge_released_images``
+        """
+        async with self.session() as session:
+            released = await self._release_images(session, keys)
+            await session.commit()
+        return released
+
+    async def reserve_image(self, key: str) -> bool:
+        """Keep a registered image from being deleted before it is referenced again.
+        
+        An upload of already stored content reuses its files, which may belong to
+        an image released and waiting for deletion, so the pending deletion is
+        cancelled, and the reservation time is stored for the orphan image
+        collector. A deletion in progress holds the row locked; once it commits,
+        the row is gone and the image is reported as not registered.
+        
+        Args:
+            key (str): Storage name of the image
+        
+        Returns:
+            bool: True if the image is registered and kept, False if its files
+                have to be stored again
+        """
+        async with self.session() as session:
+            stmt = (
+                update(LookImage)
+                .where(LookImage.key == key)
+                .values(pending_delete=False, updated_at=func.now())
+                .returning(LookImage.id)
+            )
+            res = await session.execute(stmt)
+            reserved = res.scalar_one_or_none() is not None
+            await session.commit()
+        return reserved
+
+    async def purge_released_images(
+        self,
+        keys: list[str],
+        remove_files: Callable[[list[str]], Awaitable[set[str]]],
+    ) -> list[str]:
+        """Remove the files of released images that are still unused, then unregister them.
+        
+        Images still pending deletion are locked, so they cannot be acquired or
+        reserved while ``remove_files`` runs, and unregistered in the same
+        transaction. Images acquired or reserved since their release are
+        skipped. Images without a row were stored before content addressing and
+        are removed if no look refers to them.
+        
+        Args:
+            keys (list[str]): Storage names of released images
+            remove_files (Callable[[list[str]], Awaitable[set[str]]]): Coroutine function
+                removing the files of the given images and returning those it failed for;
+                these stay pending deletion
+        
+        Returns:
+            list[str]: Keys whose files were removed
+        """
+        keys = list(dict.fromkeys(keys))
+        async with self.session() as session:
+            res = await session.execute(
+                select(LookImage.key)
+                .where(
+                    LookImage.key.in_(keys),
+                    LookImage.pending_delete,
+                    LookImage.ref_count <= 0,
+                )
+                .with_for_update()
+            )
+            claimed = set(res.scalars().all())
+            legacy = [key for key in keys if not is_content_addressed(key)]
+            if legacy:
+                res = await session.execute(
+                    select(LookImage.key).where(LookImage.key.in_(legacy))
+                )
+                registered = set(res.scalars().all())
+                stmt = select(self._model.image_urls).where(
+                    self._model.image_urls.op("&&")(
+                        bindparam("keys", legacy, type_=ARRAY(String))
+                    )
+                )
+                res = await session.execute(stmt)
+                used = {key for urls in res.scalars().all() for key in urls}
+                claimed.update(
+                    key for key in legacy if key not in registered and key not in used
+                )
+            claimed_keys = [key for key in keys if key in claimed]
+            if not claimed_keys:
+                return []
+
+            failed = await remove_files(claimed_keys)
+            removed = [key for key in claimed_keys if key not in failed]
+            if removed:
+                await session.execute(
+                    delete(LookImage).where(LookImage.key.in_(removed))
+                )
+            await session.commit()
+        return removed
+
+    async def save_image_metadata(self, key: str, metadata: dict[str, Any]) -> None:
+        """Store metadata of a stored image, registering the image if it is new.
+        
+        Args:
+            key (str): Storage name of the image
+            metadata (dict[str, Any]): Image metadata fields
+        """
+        async with self.session() as session:
+            stmt = (
+                pg_insert(LookImage)
+                .values(key=key, ref_count=0, **metadata)
+                .on_conflict_do_update(
+                    index_elements=[LookImage.key],
+                    set_={**metadata, "pending_delete": False, "updated_at": func.now()},
+                )
+            )
+            await session.execute(stmt)
+            await session.commit()
+
+    async def get_image_metadata(self, keys: list[str]) -> dict[str, dict[str, Any]]:
+        """Get stored metadata of images.
+        
+        Args:
+            keys (list[str]): Storage names of the images
+            
+        Returns:
+            dict[str, dict[str, Any]]: Metadata by storage name, for images that have it
+        """
+        async with self.session() as session:
+            stmt = select(
+                LookImage.key, LookImage.width, LookImage.height,
+                LookImage.dominant_color, LookImage.blurhash, LookImage.dhash,
+            ).where(LookImage.key.in_(keys), LookImage.width.is_not(None))
+            res = await session.execute(stmt)
+            rows = res.mappings().all()
+        return {row["key"]: {k: v for k, v in row.items() if k != "key"} for row in rows}
+
+    async def get_image_hashes(self, after_id: int = 0) -> list[tuple[int, str, str]]:
+        """Get perceptual hashes of images registered after the given row.
+        
+        Args:
+            after_id (int): ID of the last image row already seen
+            
+        Returns:
+            list[tuple[int, str, str]]: (row id, storage name, hash) in id order
+        """
+        async with self.session() as session:
+            stmt = (
+                select(LookImage.id, LookImage.key, LookImage.dhash)
+                .where(LookImage.id > after_id, LookImage.dhash.is_not(None))
+                .order_by(LookImage.id)
+            )
+            res = await session.execute(stmt)
+            rows = res.all()
+        return [tuple(row) for row in rows]
+
+    async def get_look_ids_by_images(self, keys: list[str]) -> dict[str, list[int]]:
+        """Find the looks that contain any of the given images.
+        
+        Args:
+            keys (list[str]): Storage names of full-size images
+            
+        Returns:
+            dict[str, list[int]]: Look IDs by storage name, for images used by any look
+        """
+        wanted = set(keys)
+        found: dict[str, list[int]] = {}
+        async with self.session() as session:
+            stmt = select(self._model.id, self._model.image_urls).where(
+                self._model.image_urls.op("&&")(bindparam("keys", keys, type_=ARRAY(String)))
+            )
+            res = await session.execute(stmt)
+            for look_id, urls in res.all():
+                for key in set(urls) & wanted:
+                    found.setdefault(key, []).append(look_id)
+        return found
+
+    async def referenced_images(self, keys: list[str], grace_seconds: int = 0) -> set[str]:
+        """Find which of the given images are still referenced by any look.
+        
+        Both look image lists and registered references are checked, so an image
+        that is being attached to a look is not reported as unused. Images
+        registered or reserved within the grace period count as in use too, as
+        the look referring to them may not be written yet; a reused file keeps
+        its old modification time.
+        
+        Args:
+            keys (list[str]): Storage names of full-size images
+            grace_seconds (int): How long a registration or reservation keeps an image
+            
+        Returns:
+            set[str]: Subset of keys that are in use
+        """
+        wanted = set(keys)
+        async with self.session() as session:
+            stmt = select(self._model.image_urls).where(
+                self._model.image_urls.op("&&")(bindparam("keys", keys, type_=ARRAY(String)))
+            )
+            res = await session.execute(stmt)
+            referenced = {key for urls in res.scalars().all() for key in urls if key in wanted}
+            stmt = select(LookImage.key).where(
+                LookImage.key.in_(keys),
+                or_(
+                    LookImage.ref_count > 0,
+                    and_(
+                        ~LookImage.pending_delete,
+                        LookImage.updated_at > func.now() - timedelta(seconds=grace_seconds),
+                    ),
+                ),
+            )
+            res = await session.execute(stmt)
+            referenced.update(res.scalars().all())
+        return referenced
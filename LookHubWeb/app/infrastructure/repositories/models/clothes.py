@@ -1,9 +1,11 @@
 from typing import List
 
-from sqlalchemy import String, ARRAY
+from sqlalchemy import String, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from app.domain.entities.enums import ColourEnum, GenderEnum
 from app.infrastructure.repositories.models.base_model import Base
+from app.infrastructure.repositories.models.types import EnumBitmask, EnumCode
 
 
 class Clothes(Base):
@@ -12,19 +14,21 @@ class Clothes(Base):
     Attributes:
         name (str): Name of the clothing item
         description (str): Detailed description of the item (optional)
-        colours (List[str]): List of available colors
-        gender (str): Gender category (мужской/женский/унисекс)
+        colours (List[str]): List of available colors, stored as a ColourEnum bitmask
+        gender (str): Gender category (мужской/женский/унисекс), stored as a GenderEnum code
         link (str): URL to the original product page
         image_url (str): URL to the product image
     """
 
     name: Mapped[str]
     description: Mapped[str] = mapped_column(String, nullable=True)
-    colours: Mapped[List[str]] = mapped_column(ARRAY(String))
-    gender: Mapped[str]
+    colours: Mapped[List[str]] = mapped_column(EnumBitmask(ColourEnum))
+    gender: Mapped[str] = mapped_column(EnumCode(GenderEnum))
     link: Mapped[str]
     image_url: Mapped[str]
 
+    __table_args__ = (Index("ix_clothes_gender", "gender"),)
+
     def __str__(self):
         """String representation of the clothes item.
         
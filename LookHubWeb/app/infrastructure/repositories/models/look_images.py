@@ -0,0 +1,43 @@
+from sqlalchemy import String, Integer, Boolean, false
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.infrastructure.repositories.models.base_model import Base
+
+
+class LookImage(Base):
+    """Model representing a stored, content-addressed look image.
+
+    Identical uploads share one stored image, so the number of references from
+    looks' image_urls is counted to know when the files can be removed. An image
+    whose last reference is released stays registered, marked pending deletion,
+    until its files are removed, so reusing it meanwhile can cancel the deletion.
+
+    Attributes:
+        key (str): Storage name of the full-size image (e.g. "ab/cd/<sha256>.webp")
+        ref_count (int): Number of image_urls entries referencing the image
+        width (int): Width of the full-size image in pixels
+        height (int): Height of the full-size image in pixels
+        dominant_color (str): Most frequent colour as "#rrggbb"
+        blurhash (str): BlurHash placeholder string
+        dhash (str): Perceptual difference hash as 16 hex digits
+        pending_delete (bool): Whether the image was released and its files are to be removed
+    """
+
+    key: Mapped[str] = mapped_column(String, unique=True, index=True)
+    ref_count: Mapped[int] = mapped_column(Integer, default=0)
+    width: Mapped[int] = mapped_column(Integer, nullable=True)
+    height: Mapped[int] = mapped_column(Integer, nullable=True)
+    dominant_color: Mapped[str] = mapped_column(String(7), nullable=True)
+    blurhash: Mapped[str] = mapped_column(String, nullable=True)
+    dhash: Mapped[str] = mapped_column(String(16), nullable=True)
+    pending_delete: Mapped[bool] = mapped_column(
+        Boolean, default=False, server_default=false()
+    )
+
+    def __str__(self):
+        """String representation of the look image.
+
+        Returns:
+            str: Storage name of the image
+        """
+        return self.key
@@ -1,9 +1,11 @@
 from typing import List
 
-from sqlalchemy import ARRAY, String, JSON, Boolean
+from sqlalchemy import ARRAY, String, JSON, Boolean, Index
 from sqlalchemy.orm import Mapped, relationship, mapped_column, class_mapper
 
+from app.domain.entities.enums import GenderEnum
 from app.infrastructure.repositories.models.base_model import Base
+from app.infrastructure.repositories.models.types import EnumCode
 
 
 class Look(Base):
@@ -11,28 +13,33 @@ class Look(Base):
     
     Attributes:
         name (str): Name of the look
-        gender (str): Target gender for the look
+        gender (str): Target gender for the look, stored as a GenderEnum code
         description (str): Detailed description of the look
         clothes_categories (List[ClothesCategory]): Categories of clothes in the look
         image_prompts (List[str]): Prompts used for generating look images
         image_urls (List[str]): URLs of generated look images
+        image_metadata (dict): Dimensions and placeholders of look images by storage name
         content_json (str): JSON representation of the look's content
         checked (bool): Whether the look has been reviewed
         pushed (bool): Whether the look has been published
     """
 
     name: Mapped[str]
-    gender: Mapped[str]
+    gender: Mapped[str] = mapped_column(EnumCode(GenderEnum))
     description: Mapped[str]
     clothes_categories: Mapped[List["ClothesCategory"]] = relationship(
         "ClothesCategory", uselist=True, lazy="joined", cascade="all, delete-orphan"
     )
     image_prompts: Mapped[List[str]] = mapped_column(ARRAY(String))
     image_urls: Mapped[List[str]] = mapped_column(ARRAY(String), nullable=True)
+    image_metadata: Mapped[dict] = mapped_column(JSON, server_default="{}")
     content_json: Mapped[str] = mapped_column(JSON, nullable=True)
     checked: Mapped[bool] = mapped_column(Boolean, default=False)
     pushed: Mapped[bool] = mapped_column(Boolean, default=False)
 
+    # Lets the image garbage collector find looks by any of their images
+    __table_args__ = (Index("ix_look_image_urls", "image_urls", postgresql_using="gin"),)
+
     def __str__(self):
         """String representation of the look.
         
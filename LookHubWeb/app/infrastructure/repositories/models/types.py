@@ -0,0 +1,93 @@
+import enum
+from typing import Any, Type
+
+from sqlalchemy import Integer, SmallInteger
+from sqlalchemy.types import TypeDecorator
+
+
+class EnumCode(TypeDecorator):
+    """Stores an enum value as a small integer code.
+
+    The code of a member is its position in the enum, so new members must only
+    be appended. Values are read back as the enum values the domain uses.
+    """
+
+    impl = SmallInteger
+    cache_ok = True
+
+    def __init__(self, enum_class: Type[enum.Enum], *args, **kwargs):
+        """Initialize the type.
+
+        Args:
+            enum_class (Type[enum.Enum]): Enum whose values are stored
+        """
+        super().__init__(*args, **kwargs)
+        self.enum_class = enum_class
+        self._codes = {member: code for code, member in enumerate(enum_class)}
+        self._members = list(enum_class)
+
+    def process_bind_param(self, value: Any, dialect) -> int | None:
+        """Convert an enum member or value to its code."""
+        if value is None:
+            return None
+        return self._codes[
+            value if isinstance(value, self.enum_class) else self.enum_class(value)
+        ]
+
+    def process_result_value(self, value: int | None, dialect) -> Any:
+        """Convert a code to its enum value."""
+        if value is None:
+            return None
+        return self._members[value].value
+
+
+class EnumBitmask(TypeDecorator):
+    """Stores a set of enum values as an integer bitmask.
+
+    Bit ``n`` stands for the ``n``-th member of the enum, so new members must
+    only be appended. Values are read back as a list of enum values in enum
+    order, and any-of filters become a single bitwise AND.
+    """
+
+    impl = Integer
+    cache_ok = True
+
+    def __init__(self, enum_class: Type[enum.Enum], *args, **kwargs):
+        """Initialize the type.
+
+        Args:
+            enum_class (Type[enum.Enum]): Enum whose values are stored
+        """
+        super().__init__(*args, **kwargs)
+        self.enum_class = enum_class
+        self._bits = {
+            member: 1 << position for position, member in enumerate(enum_class)
+        }
+
+    def to_mask(self, values) -> int:
+        """Get the bitmask of enum members or values.
+
+        Args:
+            values: Iterable of enum members or values
+
+        Returns:
+            int: Bitmask with the bits of all values set
+        """
+        mask = 0
+        for value in values:
+            mask |= self._bits[
+                value if isinstance(value, self.enum_class) else self.enum_class(value)
+            ]
+        return mask
+
+    def process_bind_param(self, value: Any, dialect) -> int | None:
+        """Convert a list of enum members or values, or a ready mask, to a bitmask."""
+        if value is None or isinstance(value, int):
+            return value
+        return self.to_mask(value)
+
+    def process_result_value(self, value: int | None, dialect) -> list | None:
+        """Convert a bitmask to the list of enum values."""
+        if value is None:
+            return None
+        return [member.value for member, bit in self._bits.items() if value & bit]
@@ -1,6 +1,6 @@
 from typing import Generic, TypeVar, Type, Any, Callable, AsyncContextManager
 
-from sqlalchemy import insert, delete, select, update, func, asc, desc
+from sqlalchemy import ColumnElement, insert, delete, select, update, func, asc, desc
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.application.exceptions import EntityNotFoundError
@@ -119,16 +119,28 @@ class SQLAlchemyRepository(BaseRepositoryInterface, Generic[Model]):
                 order_field = getattr(self._model, order_by)
                 order_clause = desc(order_field) if desc_order else asc(order_field)
 
-            query = select(self._model).filter_by(**filter_by).order_by(order_clause)
+            conditions = self._filters(**filter_by)
+            query = select(self._model).where(*conditions).order_by(order_clause)
             paginated_query = query.offset(offset).limit(limit)
             res = await session.execute(paginated_query)
             ans = res.unique().scalars().all()
 
-            count_query = select(func.count(self._model.id)).filter_by(**filter_by)
+            count_query = select(func.count(self._model.id)).where(*conditions)
             total = await session.scalar(count_query)
 
         return [a.__dict__ for a in ans], total
 
+    def _filters(self, **filter_by) -> list[ColumnElement[bool]]:
+        """Build WHERE conditions from list filters.
+        
+        Args:
+            **filter_by: Field values to match
+            
+        Returns:
+            list[ColumnElement[bool]]: Equality condition per filter
+        """
+        return [getattr(self._model, key) == value for key, value in filter_by.items()]
+
     async def get_list_by_ids(self, instance_ids: list[int]) -> list[dict[str, Any]]:
         """Get multiple records by their IDs.
         
@@ -0,0 +1,269 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import posixpath
+import re
+import shutil
+from pathlib import Path
+from typing import Callable
+from urllib.parse import urlsplit
+
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Scope
+
+from app.config import (
+    STATIC_ASSETS_CACHE_CONTROL,
+    STATIC_ASSETS_COMPRESS_EXTENSIONS,
+    STATIC_ASSETS_COMPRESS_MIN_BYTES,
+    STATIC_ASSETS_DIR,
+    STATIC_ASSETS_URL,
+    STATIC_BUNDLES,
+)
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+HASH_LENGTH = 12
+# Pre-compressed variants in order of preference: (Content-Encoding, file suffix)
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+# References of stylesheets to other assets: @import "a.css", url(b.png), url("c.woff2")
+CSS_REFERENCE = re.compile(
+    r"""@import\s+(?P<quote>["'])(?P<import>[^"']+)(?P=quote)"""
+    r"""|url\(\s*(?P<url_quote>["']?)(?P<url>[^"')\s]+)(?P=url_quote)\s*\)"""
+)
+
+
+def _hashed_name(path: Path, digest: str) -> str:
+    """Get the file name with a content hash before the extension, e.g. ``main.3f2a9c.css``."""
+    return f"{path.stem}.{digest[:HASH_LENGTH]}{path.suffix}"
+
+
+def _rewrite_css(css: str, path: str, resolve: Callable[[str], str | None]) -> str:
+    """Point the relative references of a stylesheet to the hashed names of their targets.
+
+    Absolute URLs, ``data:`` URIs and references to files outside the bundle
+    are kept as they are.
+
+    Args:
+        css (str): Stylesheet source
+        path (str): Path of the stylesheet relative to the bundle
+        resolve (Callable[[str], str | None]): Maps a path relative to the bundle to its
+            hashed path, None if it is not an asset of the bundle
+
+    Returns:
+        str: Stylesheet with rewritten references
+    """
+    directory = posixpath.dirname(path)
+
+    def replace(match: re.Match) -> str:
+        group = "import" if match.group("import") else "url"
+        reference = match.group(group)
+        parts = urlsplit(reference)
+        if parts.scheme or parts.netloc or not parts.path or parts.path.startswith("/"):
+            return match.group(0)
+        hashed = resolve(posixpath.normpath(posixpath.join(directory, parts.path)))
+        if hashed is None:
+            return match.group(0)
+        rewritten = (
+            posixpath.relpath(hashed, directory or ".") + reference[len(parts.path) :]
+        )
+        start, end = (
+            match.start(group) - match.start(),
+            match.end(group) - match.start(),
+        )
+        return match.group(0)[:start] + rewritten + match.group(0)[end:]
+
+    return CSS_REFERENCE.sub(replace, css)
+
+
+def _compress(path: Path, data: bytes) -> None:
+    """Write the brotli and gzip variants of a file next to it.
+
+    A variant is kept only if it is smaller than the file itself. Brotli is
+    skipped if the ``brotli`` package is not installed.
+    """
+    try:
+        import brotli
+    except ImportError:
+        brotli = None
+
+    variants = {".gz": gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants[".br"] = brotli.compress(data, quality=11)
+    for suffix, compressed in variants.items():
+        if len(compressed) < len(data):
+            path.with_name(path.name + suffix).write_bytes(compressed)
+
+
+def build_bundle(source_dir: Path, output_dir: Path) -> dict[str, str]:
+    """Build one bundle of static assets.
+
+    Every file of ``source_dir`` is copied to ``output_dir`` under a name that
+    contains a hash of its contents, text files also get pre-compressed
+    variants. Stylesheets are built after the assets they reference, which
+    they are rewritten to point to by hashed name, so their hash changes with
+    the referenced files. The previous build of the bundle is removed first.
+
+    Args:
+        source_dir (Path): Directory with the source assets
+        output_dir (Path): Directory the bundle is written to
+
+    Returns:
+        dict[str, str]: Manifest, source path -> hashed path, both relative to the bundle
+    """
+    if output_dir.exists():
+        shutil.rmtree(output_dir)
+    sources = {
+        source.relative_to(source_dir).as_posix(): source
+        for source in sorted(source_dir.rglob("*"))
+        if source.is_file() and source.suffix not in (".py", ".pyc")
+    }
+    manifest: dict[str, str] = {}
+    building: set[str] = set()
+
+    def build(relative: str) -> str | None:
+        if relative in manifest:
+            return manifest[relative]
+        # Unknown files and import cycles are left unresolved
+        if relative not in sources or relative in building:
+            return None
+        building.add(relative)
+        source = sources[relative]
+        data = source.read_bytes()
+        if source.suffix == ".css":
+            data = _rewrite_css(data.decode(), relative, build).encode()
+        hashed = posixpath.join(
+            posixpath.dirname(relative),
+            _hashed_name(Path(relative), hashlib.sha256(data).hexdigest()),
+        )
+        target = output_dir / hashed
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(data)
+        if (
+            source.suffix in STATIC_ASSETS_COMPRESS_EXTENSIONS
+            and len(data) >= STATIC_ASSETS_COMPRESS_MIN_BYTES
+        ):
+            _compress(target, data)
+        building.discard(relative)
+        manifest[relative] = hashed
+        return hashed
+
+    for relative in sources:
+        build(relative)
+    (output_dir / MANIFEST_NAME).write_text(
+        json.dumps(manifest, indent=2, sort_keys=True)
+    )
+    return manifest
+
+
+def build_assets(
+    bundles: dict[str, Path] = STATIC_BUNDLES, output_dir: Path = STATIC_ASSETS_DIR
+) -> None:
+    """Build all bundles of static assets.
+
+    Args:
+        bundles (dict[str, Path]): Bundle name -> directory with its source assets
+        output_dir (Path): Directory the bundles are written to, one subdirectory each
+    """
+    for name, source_dir in bundles.items():
+        manifest = build_bundle(source_dir, output_dir / name)
+        logger.info(f"Built {len(manifest)} static assets of {name!r}")
+
+
+class AssetManifest:
+    """Resolves asset paths of a bundle to their content-hashed URLs.
+
+    The manifest is read on first use. Assets missing from it, or all of them
+    when the bundle was not built, are served unhashed from ``fallback_url``.
+    """
+
+    def __init__(
+        self, bundle: str, fallback_url: str, output_dir: Path = STATIC_ASSETS_DIR
+    ):
+        """Initialize the manifest.
+
+        Args:
+            bundle (str): Name of the bundle
+            fallback_url (str): URL prefix of the unhashed source assets
+            output_dir (Path): Directory the bundles are built to
+        """
+        self.bundle = bundle
+        self.fallback_url = fallback_url.rstrip("/")
+        self.path = output_dir / bundle / MANIFEST_NAME
+        self._entries: dict[str, str] | None = None
+
+    @property
+    def entries(self) -> dict[str, str]:
+        """Source path -> hashed path, empty if the bundle was not built."""
+        if self._entries is None:
+            try:
+                self._entries = json.loads(self.path.read_text())
+            except FileNotFoundError:
+                logger.warning(
+                    f"No manifest at {self.path}, static assets of {self.bundle!r} are served unhashed"
+                )
+                self._entries = {}
+        return self._entries
+
+    def url(self, path: str) -> str:
+        """Get the URL of an asset, used as ``static_url`` in templates.
+
+        Args:
+            path (str): Path of the asset relative to the bundle, e.g. ``css/main.css``
+
+        Returns:
+            str: Content-hashed URL if the asset was built, else its unhashed URL
+        """
+        path = path.strip("/")
+        hashed = self.entries.get(path)
+        if hashed is None:
+            return f"{self.fallback_url}/{path}"
+        return f"{STATIC_ASSETS_URL}/{self.bundle}/{hashed}"
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """Serves built assets with immutable caching and pre-compressed bodies.
+
+    Asset names change with their contents, so responses may be cached for
+    good. A brotli or gzip variant is sent instead of the file when the client
+    accepts it and the build produced one.
+    """
+
+    def file_response(
+        self,
+        full_path: str,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+        accepted = {
+            token.split(";")[0].strip().lower() for token in accept_encoding.split(",")
+        }
+        content_encoding = None
+        for encoding, suffix in ENCODINGS:
+            if encoding not in accepted:
+                continue
+            try:
+                stat_result = os.stat(f"{full_path}{suffix}")
+            except FileNotFoundError:
+                continue
+            # The media type is still guessed right, e.g. "main.css.br" is text/css
+            full_path, content_encoding = f"{full_path}{suffix}", encoding
+            break
+
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        response.headers["Cache-Control"] = STATIC_ASSETS_CACHE_CONTROL
+        response.headers["Vary"] = "Accept-Encoding"
+        if content_encoding is not None:
+            response.headers["Content-Encoding"] = content_encoding
+        return response
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    build_assets()
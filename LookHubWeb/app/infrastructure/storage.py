@@ -0,0 +1,256 @@
+import asyncio
+import logging
+from contextlib import AsyncExitStack
+
+from app.application.interfaces import ImageStorageInterface
+from app.application.utils import LocalImageStorage, set_image_storage
+from app.config import (
+    IMAGE_CACHE_CONTROL,
+    IMAGE_CONTENT_TYPES,
+    IMAGE_STORAGE_BACKEND,
+    S3_ENDPOINT_URL,
+    S3_REGION,
+    S3_BUCKET,
+    S3_ACCESS_KEY,
+    S3_SECRET_KEY,
+    S3_PUBLIC_URL,
+    S3_MULTIPART_THRESHOLD,
+    S3_MULTIPART_CHUNK_SIZE,
+)
+
+logger = logging.getLogger(__name__)
+
+S3_DELETE_BATCH_SIZE = 1000  # Maximum number of keys in a DeleteObjects request
+
+
+class S3ImageStorage(ImageStorageInterface):
+    """Image storage in an S3-compatible bucket.
+
+    A single client is created on first use and reused for all requests until
+    ``close``. Objects above the multipart threshold are uploaded in parts,
+    which are sent concurrently.
+
+    Attributes:
+        bucket (str): Bucket name
+        multipart_threshold (int): Object size above which multipart upload is used
+        chunk_size (int): Size of a multipart upload part
+    """
+
+    def __init__(
+        self,
+        bucket: str = S3_BUCKET,
+        endpoint_url: str | None = S3_ENDPOINT_URL,
+        region: str = S3_REGION,
+        access_key: str | None = S3_ACCESS_KEY,
+        secret_key: str | None = S3_SECRET_KEY,
+        public_url: str | None = S3_PUBLIC_URL,
+        multipart_threshold: int = S3_MULTIPART_THRESHOLD,
+        chunk_size: int = S3_MULTIPART_CHUNK_SIZE,
+    ):
+        """Initialize the storage without connecting.
+
+        Args:
+            bucket (str): Bucket name
+            endpoint_url (str | None): S3-compatible endpoint, None for AWS
+            region (str): Bucket region
+            access_key (str | None): Access key ID
+            secret_key (str | None): Secret access key
+            public_url (str | None): Public URL prefix of the bucket, defaults to the endpoint
+            multipart_threshold (int): Object size above which multipart upload is used
+            chunk_size (int): Size of a multipart upload part
+        """
+        self.bucket = bucket
+        self.endpoint_url = endpoint_url
+        self.region = region
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.multipart_threshold = multipart_threshold
+        self.chunk_size = chunk_size
+        if public_url is None:
+            host = endpoint_url or f"https://s3.{region}.amazonaws.com"
+            public_url = f"{host.rstrip('/')}/{bucket}/"
+        self._public_url = public_url if public_url.endswith("/") else f"{public_url}/"
+        self._client = None
+        self._exit_stack: AsyncExitStack | None = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def public_base_url(self) -> str:
+        """Get the URL prefix under which stored images are publicly served.
+
+        Returns:
+            str: URL prefix ending with a slash
+        """
+        return self._public_url
+
+    async def _get_client(self):
+        """Get the shared S3 client, creating it on first use."""
+        if self._client is not None:
+            return self._client
+        async with self._lock:
+            if self._client is None:
+                from aiobotocore.session import get_session
+
+                exit_stack = AsyncExitStack()
+                self._client = await exit_stack.enter_async_context(
+                    get_session().create_client(
+                        "s3",
+                        endpoint_url=self.endpoint_url,
+                        region_name=self.region,
+                        aws_access_key_id=self.access_key,
+                        aws_secret_access_key=self.secret_key,
+                    )
+                )
+                self._exit_stack = exit_stack
+        return self._client
+
+    async def close(self) -> None:
+        """Close the shared S3 client."""
+        if self._exit_stack is not None:
+            await self._exit_stack.aclose()
+        self._client = None
+        self._exit_stack = None
+
+    async def exists(self, key: str) -> bool:
+        """Check whether an object is present in the bucket.
+
+        Args:
+            key (str): Storage key of the image
+
+        Returns:
+            bool: True if the object exists
+        """
+        from botocore.exceptions import ClientError
+
+        client = await self._get_client()
+        try:
+            await client.head_object(Bucket=self.bucket, Key=key)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in (
+                "404",
+                "NoSuchKey",
+                "NotFound",
+            ):
+                return False
+            raise
+        return True
+
+    async def save(self, key: str, data: bytes) -> None:
+        """Upload an object, using a multipart upload for large objects.
+
+        Args:
+            key (str): Storage key of the image
+            data (bytes): Encoded image bytes
+        """
+        client = await self._get_client()
+        extra = {
+            "ContentType": IMAGE_CONTENT_TYPES.get(
+                key.rsplit(".", 1)[-1], "application/octet-stream"
+            ),
+            "CacheControl": IMAGE_CACHE_CONTROL,
+        }
+        if len(data) <= self.multipart_threshold:
+            await client.put_object(Bucket=self.bucket, Key=key, Body=data, **extra)
+            return
+
+        upload = await client.create_multipart_upload(
+            Bucket=self.bucket, Key=key, **extra
+        )
+        upload_id = upload["UploadId"]
+
+        async def upload_part(number: int, offset: int) -> dict:
+            response = await client.upload_part(
+                Bucket=self.bucket,
+                Key=key,
+                UploadId=upload_id,
+                PartNumber=number,
+                Body=data[offset : offset + self.chunk_size],
+            )
+            return {"PartNumber": number, "ETag": response["ETag"]}
+
+        try:
+            parts = await asyncio.gather(
+                *(
+                    upload_part(number, offset)
+                    for number, offset in enumerate(
+                        range(0, len(data), self.chunk_size), start=1
+                    )
+                )
+            )
+            await client.complete_multipart_upload(
+                Bucket=self.bucket,
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+        except BaseException:
+            await client.abort_multipart_upload(
+                Bucket=self.bucket, Key=key, UploadId=upload_id
+            )
+            raise
+
+    async def delete(self, key: str) -> bool:
+        """Delete an object from the bucket.
+
+        Args:
+            key (str): Storage key of the image
+
+        Returns:
+            bool: True if the object existed and was deleted
+        """
+        if not await self.exists(key):
+            return False
+        client = await self._get_client()
+        await client.delete_object(Bucket=self.bucket, Key=key)
+        return True
+
+    async def delete_many(self, keys: list[str]) -> list[str]:
+        """Delete objects with batched DeleteObjects requests.
+
+        Args:
+            keys (list[str]): Storage keys of the images
+
+        Returns:
+            list[str]: Keys that could not be deleted
+        """
+        client = await self._get_client()
+        failed = []
+        for start in range(0, len(keys), S3_DELETE_BATCH_SIZE):
+            chunk = keys[start : start + S3_DELETE_BATCH_SIZE]
+            try:
+                response = await client.delete_objects(
+                    Bucket=self.bucket,
+                    Delete={"Objects": [{"Key": key} for key in chunk], "Quiet": True},
+                )
+            except Exception as e:
+                logger.error(f"Error deleting {len(chunk)} images from S3: {e}")
+                failed.extend(chunk)
+                continue
+            for error in response.get("Errors", []):
+                logger.error(
+                    f"Error deleting image {error['Key']} from S3: {error.get('Message')}"
+                )
+                failed.append(error["Key"])
+        return failed
+
+
+def configure_image_storage() -> ImageStorageInterface:
+    """Create the image storage selected by IMAGE_STORAGE_BACKEND and make it the default.
+
+    Returns:
+        ImageStorageInterface: Configured image storage
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    if IMAGE_STORAGE_BACKEND == "local":
+        storage = LocalImageStorage()
+    elif IMAGE_STORAGE_BACKEND == "s3":
+        storage = S3ImageStorage()
+    else:
+        raise ValueError(f"Unknown IMAGE_STORAGE_BACKEND: {IMAGE_STORAGE_BACKEND}")
+    set_image_storage(storage)
+    logger.info(
+        f"Using {IMAGE_STORAGE_BACKEND} image storage at {storage.public_base_url}"
+    )
+    return storage
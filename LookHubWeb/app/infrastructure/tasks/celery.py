@@ -6,14 +6,22 @@ import uuid
 import logging
 from celery import Celery
 from celery.schedules import crontab
+from redis import asyncio as aioredis
 
-from app.application.use_cases import LooksUseCase
+from app.application.exceptions import ProductPageError
+from app.application.use_cases import LooksUseCase, ClothesUseCase
 from app.config import (REDIS_HOST, REDIS_PORT,
-                        SENDING_LOOKS_SCHEDULE_HOURS, SENDING_LOOKS_SCHEDULE_MINUTE)
+                        SENDING_LOOKS_SCHEDULE_HOURS, SENDING_LOOKS_SCHEDULE_MINUTE,
+                        IMAGE_STORAGE_BACKEND, IMAGE_GC_SCHEDULE_HOUR, PUBLICATION_EVENTS_CHANNEL)
 from app.domain.entities.looks import LookUpdate
 from app.infrastructure.database import async_session_maker
+from app.infrastructure.product_pages import ProductPageFetcher, HTMLProductExtractor, RedisPageCache
 from app.infrastructure.repositories.clothes import ClothesRepository
 from app.infrastructure.repositories.looks import LooksRepository
+from app.infrastructure.storage import configure_image_storage
+from app.infrastructure.tasks.producer import (
+    INGEST_CLOTHES_TASK, SOCIAL_MEDIA_TASK, SOCIAL_MEDIA_QUEUE, SOCIAL_MEDIA_RETRY_POLICY,
+)
 
 # === ЛОГИРОВАНИЕ ===
 logger = logging.getLogger(__name__)
@@ -27,6 +35,14 @@ celery_app = Celery(
 
 r = redis.Redis(host=REDIS_HOST, port=REDIS_PORT, db=0)
 
+# Image URLs sent to SocialMediaPoster must point to the configured storage
+configure_image_storage()
+
+# One fetcher per worker process, so concurrency and per-shop delays hold across tasks
+page_fetcher = ProductPageFetcher(
+    cache=RedisPageCache(aioredis.Redis(host=REDIS_HOST, port=REDIS_PORT, db=0))
+)
+
 
 def _get_look_use_case():
     looks_repo = LooksRepository(async_session_maker)
@@ -34,6 +50,11 @@ def _get_look_use_case():
     return LooksUseCase(looks_repo, clothes_repo)
 
 
+def _get_clothes_use_case():
+    clothes_repo = ClothesRepository(async_session_maker)
+    return ClothesUseCase(clothes_repo, page_fetcher, HTMLProductExtractor())
+
+
 @celery_app.task(name='send_looks_to_queue')
 def send_looks_to_queue():
     """
@@ -53,30 +74,28 @@ async def _send_looks():
     )
     logger.info(f"Found {len(looks_to_publish)} looks ready for publishing")
 
-    for look in looks_to_publish:
-        try:
-            look_data = look.model_dump()
-            task_id = str(uuid.uuid4())
-            look_data['task_id'] = task_id
-
-            celery_app.send_task(
-                "post_to_social_media",  # имя таски из SocialMediaPoster
-                args=[look_data],
-                queue="socialmediaposter",  # очередь другого микросервиса
-                retry_policy={
-                    'max_retries': 3,
-                    'interval_start': 10,  # 10 сек
-                    'interval_step': 30,
-                    'interval_max': 300,  # 5 минут
-                }
-            )
-
-            logger.info(
-                f"Sent look {look.id} ({look.name}) "
-                f"to social media queue with task_id={task_id}"
-            )
-        except Exception as e:
-            logger.exception(f"Error sending look {look.id} to social media: {e}")
+    # Все луки отправляются через одно соединение с брокером
+    with celery_app.producer_or_acquire() as producer:
+        for look in looks_to_publish:
+            try:
+                look_data = look.model_dump(mode="json")
+                task_id = str(uuid.uuid4())
+                look_data['task_id'] = task_id
+
+                celery_app.send_task(
+                    SOCIAL_MEDIA_TASK,  # имя таски из SocialMediaPoster
+                    args=[look_data],
+                    queue=SOCIAL_MEDIA_QUEUE,  # очередь другого микросервиса
+                    retry_policy=SOCIAL_MEDIA_RETRY_POLICY,
+                    producer=producer,
+                )
+
+                logger.info(
+                    f"Sent look {look.id} ({look.name}) "
+                    f"to social media queue with task_id={task_id}"
+                )
+            except Exception as e:
+                logger.exception(f"Error sending look {look.id} to social media: {e}")
 
 
 @celery_app.task(name='process_social_media_results')
@@ -108,6 +127,11 @@ async def _process_results(batch_size: int = 100):
                     LookUpdate(pushed=True)
                 )
                 logger.info(f"Marked look {result['look_id']} as pushed")
+                r.publish(PUBLICATION_EVENTS_CHANNEL, json.dumps({
+                    "status": "pushed",
+                    "task_id": result.get("task_id"),
+                    "look_id": result["look_id"],
+                }))
                 processed += 1
             else:
                 logger.warning(f"Invalid result data: {result}")
@@ -120,6 +144,33 @@ async def _process_results(batch_size: int = 100):
     logger.info(f"Processed results: success={processed}, errors={errors}")
 
 
+@celery_app.task(name='collect_orphan_images')
+def collect_orphan_images():
+    """
+    Удаляем файлы изображений, на которые не ссылается ни один лук.
+    """
+    if IMAGE_STORAGE_BACKEND != "local":
+        logger.info(f"Skipping orphan image collection for {IMAGE_STORAGE_BACKEND} storage")
+        return None
+    loop = asyncio.get_event_loop()
+    return loop.run_until_complete(_get_look_use_case().collect_orphan_images())
+
+
+@celery_app.task(name=INGEST_CLOTHES_TASK)
+def ingest_clothes_link(link: str) -> dict:
+    """
+    Создаём одежду по ссылке на страницу товара в магазине.
+    """
+    loop = asyncio.get_event_loop()
+    try:
+        clothes = loop.run_until_complete(_get_clothes_use_case().add_one_from_link(link))
+    except ProductPageError as e:
+        logger.warning(str(e))
+        raise
+    logger.info(f"Created clothes {clothes.id} ({clothes.name}) from {link}")
+    return clothes.model_dump(mode="json")
+
+
 celery_app.conf.beat_schedule = {
     'social-then-send': {
         'task': 'process_social_media_results',
@@ -128,5 +179,9 @@ celery_app.conf.beat_schedule = {
             minute=SENDING_LOOKS_SCHEDULE_MINUTE
         ),
         'options': {'link': send_looks_to_queue.si()},
-    }
-}
\ No newline at end of file
+    },
+    'collect-orphan-images': {
+        'task': 'collect_orphan_images',
+        'schedule': crontab(hour=IMAGE_GC_SCHEDULE_HOUR, minute=0),
+    },
+}
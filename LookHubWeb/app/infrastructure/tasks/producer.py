@@ -0,0 +1,152 @@
+import asyncio
+import logging
+from typing import Iterable
+
+from celery import Celery
+from celery.result import AsyncResult
+
+from app.config import REDIS_HOST, REDIS_PORT, CELERY_BROKER_POOL_LIMIT
+
+logger = logging.getLogger(__name__)
+
+INGEST_CLOTHES_TASK = "ingest_clothes_link"
+SOCIAL_MEDIA_TASK = "post_to_social_media"  # Task of SocialMediaPoster
+SOCIAL_MEDIA_QUEUE = "socialmediaposter"  # Queue the SocialMediaPoster worker consumes
+SOCIAL_MEDIA_RETRY_POLICY = {
+    "max_retries": 3,
+    "interval_start": 10,  # 10 сек
+    "interval_step": 30,
+    "interval_max": 300,  # 5 минут
+}
+
+
+class TaskProducer:
+    """Celery client shared by all requests of an app worker.
+
+    Tasks are sent by name, so the API does not import the worker modules.
+    Broker connections come from a pool opened once in the app lifespan
+    instead of a new client per request, and a batch of tasks is published
+    through a single pooled producer.
+    """
+
+    def __init__(
+        self,
+        broker_url: str = f"redis://{REDIS_HOST}:{REDIS_PORT}/0",
+        backend_url: str = f"redis://{REDIS_HOST}:{REDIS_PORT}/1",
+        pool_limit: int = CELERY_BROKER_POOL_LIMIT,
+    ):
+        """Initialize the producer.
+
+        Args:
+            broker_url (str): URL of the broker
+            backend_url (str): URL of the result backend
+            pool_limit (int): Maximum number of pooled broker connections
+        """
+        self.app = Celery(
+            "lookhubweb", broker=broker_url, backend=backend_url, set_as_current=False
+        )
+        self.app.conf.broker_pool_limit = pool_limit
+        # Honoured by AMQP brokers; Redis acknowledges every publish by its reply
+        self.app.conf.broker_transport_options = {"confirm_publish": True}
+
+    async def start(self) -> None:
+        """Open the first broker connection, so the first request does not pay for it.
+
+        An unavailable broker is only logged; sending then connects on demand.
+        """
+
+        def connect():
+            with self.app.pool.acquire(block=True) as connection:
+                connection.ensure_connection(max_retries=1)
+
+        try:
+            await asyncio.to_thread(connect)
+        except Exception as e:
+            logger.warning(f"Celery broker is unavailable: {e}")
+
+    async def send(
+        self, name: str, args: list, queue: str | None = None, **options
+    ) -> str:
+        """Send a task.
+
+        Args:
+            name (str): Registered name of the task
+            args (list): Positional arguments of the task
+            queue (str | None): Queue to send to, None for the default one
+            **options: Other options of ``Celery.send_task``
+
+        Returns:
+            str: ID of the sent task
+        """
+        (task_id,) = await self.send_many(name, [args], queue, **options)
+        return task_id
+
+    async def send_many(
+        self,
+        name: str,
+        args_list: Iterable[list],
+        queue: str | None = None,
+        task_ids: Iterable[str] | None = None,
+        **options,
+    ) -> list[str]:
+        """Send a task once per set of arguments over a single pooled connection.
+
+        Args:
+            name (str): Registered name of the task
+            args_list (Iterable[list]): Positional arguments of every task
+            queue (str | None): Queue to send to, None for the default one
+            task_ids (Iterable[str] | None): IDs to give the tasks, generated if None
+            **options: Other options of ``Celery.send_task``
+
+        Returns:
+            list[str]: IDs of the sent tasks, in order
+        """
+        args_list = list(args_list)
+        task_ids = list(task_ids) if task_ids is not None else [None] * len(args_list)
+
+        def publish() -> list[str]:
+            with self.app.producer_or_acquire() as producer:
+                return [
+                    self.app.send_task(
+                        name,
+                        args=args,
+                        queue=queue,
+                        task_id=task_id,
+                        producer=producer,
+                        **options,
+                    ).id
+                    for args, task_id in zip(args_list, task_ids)
+                ]
+
+        return await asyncio.to_thread(publish)
+
+    async def get_state(self, task_id: str) -> tuple[str, object]:
+        """Get the state of a sent task.
+
+        Tasks that are unknown or not yet picked up by a worker are both
+        reported as pending.
+
+        Args:
+            task_id (str): ID of the task
+
+        Returns:
+            tuple[str, object]: Lower-case Celery state and the task result, or the
+                raised error for failed tasks
+        """
+
+        def read_state() -> tuple[str, object]:
+            result = AsyncResult(task_id, app=self.app)
+            state = result.state
+            return (
+                state.lower(),
+                result.info if state in ("SUCCESS", "FAILURE") else None,
+            )
+
+        return await asyncio.to_thread(read_state)
+
+    async def close(self) -> None:
+        """Close the pooled broker and backend connections."""
+        await asyncio.to_thread(self.app.close)
+
+
+task_producer = TaskProducer()
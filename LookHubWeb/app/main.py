@@ -1,13 +1,30 @@
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request, status
+from fastapi.responses import PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.config import STATIC_ASSETS_DIR, STATIC_ASSETS_URL
 from app.api.exception_handlers import init_exception_handlers
+from app.api.responses import ModelJSONResponse
 from app.api.router import router as api_router
 from app.frontend.router import router as frontend_router
 from app.admin.router import router as admin_router
+from app.api.admission import AdmissionControlMiddleware
+from app.api.deadlines import RequestDeadlineMiddleware
+from app.api.uploads import UploadSizeLimitMiddleware
+from app.images.router import router as images_router
+from app.infrastructure.database import scoped_session
+from app.infrastructure.image_deletion import image_deletion_queue
+from app.infrastructure.image_index import image_hash_index
+from app.infrastructure.image_processing import image_processor
+from app.infrastructure.metrics import collect_metrics, render_metrics, worker_metrics
+from app.infrastructure.repositories.looks import LooksRepository
+from app.infrastructure.static_assets import PrecompressedStaticFiles
+from app.infrastructure.storage import configure_image_storage
+from app.infrastructure.tasks.producer import task_producer
 
 
 @asynccontextmanager
@@ -15,7 +32,10 @@ async def lifespan(app: FastAPI):
     """Manage application lifespan events.
     
     This context manager handles application startup and shutdown events.
-    Currently configured for future Redis cache integration.
+    Configures the image storage, starts the image processing pool, connects
+    the Celery task producer, starts building the image hash index and sharing
+    this worker's metrics. On shutdown, finishes queued image deletions and
+    releases all of them.
     
     Args:
         app (FastAPI): The FastAPI application instance
@@ -25,13 +45,33 @@ async def lifespan(app: FastAPI):
     """
     # redis = aioredis.from_url("redis://localhost")
     # FastAPICache.init(RedisBackend(redis), prefix="fastapi-cache")
+    image_storage = configure_image_storage()
+    image_processor.start()
+    await task_producer.start()
+    image_hash_index.start(LooksRepository(scoped_session))
+    worker_metrics.start()
     yield
+    await worker_metrics.stop()
+    await image_hash_index.stop()
+    await task_producer.close()
+    await asyncio.to_thread(image_processor.shutdown)
+    await image_deletion_queue.stop()
+    await image_storage.close()
 
 
 # Initialize FastAPI application
-app = FastAPI(lifespan=lifespan, title="LookHub main app")
+app = FastAPI(lifespan=lifespan, title="LookHub main app", default_response_class=ModelJSONResponse)
 
-# Configure CORS middleware
+# Shed load with 503 before requests queue up on the DB pool
+app.add_middleware(AdmissionControlMiddleware)
+
+# Start request deadlines before the admission wait and stop work of disconnected clients
+app.add_middleware(RequestDeadlineMiddleware)
+
+# Refuse oversized upload bodies while they arrive, before they wait for a slot
+app.add_middleware(UploadSizeLimitMiddleware)
+
+# Configure CORS middleware (added last so it also wraps 503 responses)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # In production, replace with specific domains
@@ -44,10 +84,22 @@ app.add_middleware(
 app.include_router(api_router)  # API endpoints
 app.include_router(frontend_router)  # Frontend endpoints
 app.include_router(admin_router)  # Admin endpoints
+app.include_router(images_router)  # Stored images
 
 # Register exception handlers
 init_exception_handlers(app)
 
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    """Expose metrics of all app workers in the Prometheus text format.
+
+    Not routed by nginx; Prometheus scrapes the app directly on the internal network.
+    """
+    samples = collect_metrics()
+    return render_metrics(await asyncio.to_thread(worker_metrics.aggregate, samples))
+
+
 # Mount static file directories
 app.mount(
     "/admin/static", StaticFiles(directory="app/admin/static"), name="admin_static"
@@ -57,5 +109,9 @@ app.mount(
     StaticFiles(directory="app/frontend/static"),
     name="frontend_static",
 )
-app.mount("/images", StaticFiles(directory="app/static/images"), name="images")
-
+# Content-hashed build of both directories, referenced by templates through static_url
+app.mount(
+    STATIC_ASSETS_URL,
+    PrecompressedStaticFiles(directory=STATIC_ASSETS_DIR, check_dir=False),
+    name="assets",
+)
@@ -7,7 +7,7 @@ from alembic import context
 
 from app.config import DB_HOST, DB_USER, DB_PASS, DB_NAME, DB_PORT
 from app.infrastructure.repositories.models.base_model import Base
-from app.infrastructure.repositories.models import clothes, looks, clothes_categories
+from app.infrastructure.repositories.models import clothes, looks, clothes_categories, look_images
 
 
 # this is the Alembic Config object, which provides
@@ -0,0 +1,102 @@
+"""Compact colour and gender encoding
+
+Revision ID: 4b1d8e6f9a27
+Revises: e3a9b7c41f08
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "4b1d8e6f9a27"
+down_revision: Union[str, None] = "e3a9b7c41f08"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Fixed at the time of the migration: ColourEnum bits and GenderEnum codes
+COLOUR_BITS = [
+    ("белый", 1),
+    ("бежевый", 2),
+    ("серый", 4),
+    ("красный", 8),
+    ("розовый", 16),
+    ("оранжевый", 32),
+    ("желтый", 64),
+    ("зеленый", 128),
+    ("голубой", 256),
+    ("синий", 512),
+    ("фиолетовый", 1024),
+    ("коричневый", 2048),
+    ("черный", 4096),
+]
+GENDER_CODES = [
+    ("мужской", 0),
+    ("женский", 1),
+    ("унисекс", 2),
+]
+UNISEX_CODE = 2
+
+
+def _values(pairs: list[tuple[str, int]]) -> str:
+    return ", ".join(f"('{name}', {code})" for name, code in pairs)
+
+
+def _encode_gender(table: str) -> None:
+    op.add_column(table, sa.Column("gender_code", sa.SmallInteger(), nullable=True))
+    op.execute(
+        f"UPDATE {table} SET gender_code = COALESCE("
+        f"(SELECT code FROM (VALUES {_values(GENDER_CODES)}) AS g(name, code) WHERE g.name = {table}.gender), "
+        f"{UNISEX_CODE})"
+    )
+    op.drop_column(table, "gender")
+    op.alter_column(table, "gender_code", new_column_name="gender", nullable=False)
+    op.create_index(f"ix_{table}_gender", table, ["gender"])
+
+
+def _decode_gender(table: str) -> None:
+    op.drop_index(f"ix_{table}_gender", table_name=table)
+    op.add_column(table, sa.Column("gender_name", sa.String(), nullable=True))
+    op.execute(
+        f"UPDATE {table} SET gender_name = "
+        f"(SELECT name FROM (VALUES {_values(GENDER_CODES)}) AS g(name, code) WHERE g.code = {table}.gender)"
+    )
+    op.drop_column(table, "gender")
+    op.alter_column(table, "gender_name", new_column_name="gender", nullable=False)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("clothes", sa.Column("colours_mask", sa.Integer(), nullable=True))
+    op.execute(
+        "UPDATE clothes SET colours_mask = COALESCE("
+        f"(SELECT bit_or(c.code) FROM (VALUES {_values(COLOUR_BITS)}) AS c(name, code) "
+        "WHERE c.name = ANY(clothes.colours)), 0)"
+    )
+    op.drop_column("clothes", "colours")
+    op.alter_column(
+        "clothes", "colours_mask", new_column_name="colours", nullable=False
+    )
+    _encode_gender("clothes")
+    _encode_gender("look")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _decode_gender("look")
+    _decode_gender("clothes")
+    op.add_column(
+        "clothes", sa.Column("colours_names", sa.ARRAY(sa.String()), nullable=True)
+    )
+    op.execute(
+        "UPDATE clothes SET colours_names = ARRAY("
+        f"SELECT c.name FROM (VALUES {_values(COLOUR_BITS)}) AS c(name, code) "
+        "WHERE clothes.colours & c.code <> 0 ORDER BY c.code)"
+    )
+    op.drop_column("clothes", "colours")
+    op.alter_column(
+        "clothes", "colours_names", new_column_name="colours", nullable=False
+    )
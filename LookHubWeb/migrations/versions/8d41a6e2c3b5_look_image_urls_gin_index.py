@@ -0,0 +1,34 @@
+"""Look image urls GIN index
+
+Revision ID: 8d41a6e2c3b5
+Revises: 5b2f0c9d1e47
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8d41a6e2c3b5"
+down_revision: Union[str, None] = "5b2f0c9d1e47"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_look_image_urls",
+        "look",
+        ["image_urls"],
+        unique=False,
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_look_image_urls", table_name="look", postgresql_using="gin")
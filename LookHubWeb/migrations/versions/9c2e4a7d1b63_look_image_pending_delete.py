@@ -0,0 +1,33 @@
+"""Look image pending deletion mark
+
+Revision ID: 9c2e4a7d1b63
+Revises: 4b1d8e6f9a27
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9c2e4a7d1b63"
+down_revision: Union[str, None] = "4b1d8e6f9a27"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "lookimage",
+        sa.Column(
+            "pending_delete", sa.Boolean(), server_default=sa.false(), nullable=False
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("lookimage", "pending_delete")
@@ -0,0 +1,41 @@
+"""Look image metadata
+
+Revision ID: c7e5f19a2d60
+Revises: 8d41a6e2c3b5
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c7e5f19a2d60"
+down_revision: Union[str, None] = "8d41a6e2c3b5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("lookimage", sa.Column("width", sa.Integer(), nullable=True))
+    op.add_column("lookimage", sa.Column("height", sa.Integer(), nullable=True))
+    op.add_column(
+        "lookimage", sa.Column("dominant_color", sa.String(length=7), nullable=True)
+    )
+    op.add_column("lookimage", sa.Column("blurhash", sa.String(), nullable=True))
+    op.add_column(
+        "look",
+        sa.Column("image_metadata", sa.JSON(), server_default="{}", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("look", "image_metadata")
+    op.drop_column("lookimage", "blurhash")
+    op.drop_column("lookimage", "dominant_color")
+    op.drop_column("lookimage", "height")
+    op.drop_column("lookimage", "width")
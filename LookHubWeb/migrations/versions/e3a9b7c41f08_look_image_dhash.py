@@ -0,0 +1,28 @@
+"""Look image perceptual hash
+
+Revision ID: e3a9b7c41f08
+Revises: c7e5f19a2d60
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e3a9b7c41f08"
+down_revision: Union[str, None] = "c7e5f19a2d60"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("lookimage", sa.Column("dhash", sa.String(length=16), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("lookimage", "dhash")
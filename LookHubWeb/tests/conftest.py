@@ -4,7 +4,6 @@ from typing import Generator
 
 from app.application.interfaces import (
     LooksRepositoryInterface,
-    ClothesRepositoryInterface,
     BaseRepositoryInterface,
 )
 from app.application.use_cases import ClothesUseCase, LooksUseCase
@@ -15,9 +14,9 @@ from app.domain.entities.categories import ClothesCategoryCreate
 
 
 @pytest.fixture
-def mock_clothes_repository() -> ClothesRepositoryInterface:
+def mock_clothes_repository() -> BaseRepositoryInterface:
     """Mock repository for clothes operations."""
-    mock = AsyncMock(spec=ClothesRepositoryInterface)
+    mock = AsyncMock(spec=BaseRepositoryInterface)
     return mock
 
 
@@ -0,0 +1,111 @@
+import pytest
+from datetime import datetime, timedelta, UTC
+from unittest.mock import AsyncMock, patch
+
+from jose import jwt, JWTError
+from redis.exceptions import RedisError
+
+from app.application.exceptions import AuthUnavailableError
+from app.config import SECRET_KEY, ALGORITHM
+from app.infrastructure import auth
+from app.infrastructure.auth import (
+    VerifiedTokenCache,
+    decode_token,
+    revoke_token,
+    token_digest,
+)
+
+
+def _make_token(minutes: int = 60) -> str:
+    expire = datetime.now(UTC) + timedelta(minutes=minutes)
+    return jwt.encode(
+        {"sub": "api_client", "exp": expire}, SECRET_KEY, algorithm=ALGORITHM
+    )
+
+
+@pytest.fixture(autouse=True)
+def clear_token_cache():
+    auth.verified_token_cache.clear()
+    yield
+    auth.verified_token_cache.clear()
+
+
+class TestVerifiedTokenCache:
+    """Test cases for the verified token cache."""
+
+    def test_entry_expires_with_token(self):
+        """Test that a cached entry is dropped once the token has expired."""
+        cache = VerifiedTokenCache()
+        cache.set("digest", {"sub": "api_client"}, expires_at=100.0, checked_at=0.0)
+
+        assert cache.get("digest", now=50.0) == ({"sub": "api_client"}, 0.0)
+        assert cache.get("digest", now=100.0) is None
+        assert len(cache) == 0
+
+    def test_evicts_when_full(self):
+        """Test that the cache never grows beyond its max size."""
+        cache = VerifiedTokenCache(max_size=2)
+        for i in range(5):
+            cache.set(f"digest-{i}", {}, expires_at=1000.0, checked_at=0.0)
+
+        assert len(cache) == 2
+        assert cache.get("digest-4", now=1.0) is not None
+
+
+class TestDecodeToken:
+    """Test cases for cached token verification."""
+
+    @pytest.mark.asyncio
+    async def test_second_call_skips_jwt_decode(self):
+        """Test that a verified token is served from the cache."""
+        token = _make_token()
+        with patch.object(
+            auth.revocation_store, "is_revoked", AsyncMock(return_value=False)
+        ):
+            await decode_token(token)
+            with patch("app.infrastructure.auth.jwt.decode") as mock_decode:
+                payload = await decode_token(token)
+
+        assert payload["sub"] == "api_client"
+        mock_decode.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_revoked_token_is_rejected(self):
+        """Test that a revoked token raises JWTError and leaves the cache."""
+        token = _make_token()
+        with patch.object(
+            auth.revocation_store, "is_revoked", AsyncMock(return_value=True)
+        ):
+            with pytest.raises(JWTError):
+                await decode_token(token)
+
+        assert auth.verified_token_cache.get(token_digest(token), 0.0) is None
+
+    @pytest.mark.asyncio
+    async def test_invalid_token_is_rejected(self):
+        """Test that an invalid token raises JWTError."""
+        with pytest.raises(JWTError):
+            await decode_token("not-a-token")
+
+
+class TestRevocationUnavailable:
+    """Test cases for token revocation while Redis is down."""
+
+    @pytest.mark.asyncio
+    async def test_check_fails_open_or_closed(self):
+        """Test that API tokens are accepted and admin tokens refused without Redis."""
+        token = _make_token()
+        failing = AsyncMock(side_effect=RedisError("down"))
+        with patch.object(auth.revocation_store, "is_revoked", failing):
+            assert (await decode_token(token))["sub"] == "api_client"
+            auth.verified_token_cache.clear()
+            with pytest.raises(AuthUnavailableError):
+                await decode_token(token, fail_closed=True)
+
+    @pytest.mark.asyncio
+    async def test_unstored_revocation_raises(self):
+        """Test that a revocation that could not be stored is reported."""
+        failing = AsyncMock(side_effect=RedisError("down"))
+        with patch.object(auth.revocation_store, "revoke", failing):
+            with pytest.raises(AuthUnavailableError):
+                await revoke_token(_make_token())
@@ -3,6 +3,9 @@ from app.domain.entities.clothes import Clothes, ClothesCreate, ClothesUpdate, C
 from app.domain.entities.looks import Look, LookCreate, LookUpdate, LookRead
 from app.domain.entities.enums import GenderEnum, ColourEnum
 from app.domain.entities.categories import ClothesCategoryCreate
+from app.domain.entities.images import (
+    ImageMetadata, ImageSrcset, ImageUrlResolver, content_key, derivative_name, derivative_names, source_name,
+)
 from app.config import API_HOST
 
 
@@ -144,7 +147,8 @@ class TestLookEntity:
         )
         
         expected_urls = [f"{API_HOST}/images/image1.jpg", f"{API_HOST}/images/image2.jpg"]
-        assert look.image_urls == expected_urls
+        assert look.image_urls == ["image1.jpg", "image2.jpg"]
+        assert look.model_dump(mode="json")["image_urls"] == expected_urls
 
     def test_look_get_storage_paths(self):
         """Test get_storage_paths method."""
@@ -170,7 +174,7 @@ class TestLookEntity:
         )
         
         expected_urls = ["https://external.com/image1.jpg", f"{API_HOST}/images/image2.jpg"]
-        assert look.image_urls == expected_urls
+        assert look.model_dump(mode="json")["image_urls"] == expected_urls
 
 
 class TestEnums:
@@ -215,4 +219,98 @@ class TestClothesCategoryCreate:
         category = ClothesCategoryCreate(**data)
         
         assert category.name == "Tops"
-        assert category.clothes == [] 
\ No newline at end of file
+        assert category.clothes == [] 
+
+class TestImageSrcset:
+    """Test cases for ImageSrcset entity."""
+
+    def test_derivative_name(self):
+        """Test derivative naming for the stored image."""
+        assert derivative_name("1-abc.webp", "full") == "1-abc.webp"
+        assert derivative_name("1-abc.webp", "thumbnail") == "1-abc_thumbnail.webp"
+        assert derivative_name("1-abc.webp", "medium", "avif") == "1-abc_medium.avif"
+
+    def test_source_name_inverts_derivative_name(self):
+        """Test that every derivative maps back to its full-size image."""
+        for variant in ("thumbnail", "medium", "full"):
+            for fmt in ("webp", "avif"):
+                assert source_name(derivative_name("ab/cd/abc.webp", variant, fmt)) == "ab/cd/abc.webp"
+        assert source_name("1-legacy.png") == "1-legacy.png"
+
+    def test_content_key_is_sharded(self):
+        """Test that content keys are sharded by the digest prefix."""
+        assert content_key("abcdef0123") == "ab/cd/abcdef0123.webp"
+        assert derivative_name(content_key("abcdef0123"), "thumbnail") == "ab/cd/abcdef0123_thumbnail.webp"
+
+    def test_srcset_from_derivatives(self):
+        """Test srcset built for an image stored with derivatives."""
+        prefix = f"{API_HOST}/images/"
+        srcset = ImageSrcset.from_storage_name("1-abc.webp", ImageUrlResolver(prefix))
+
+        assert srcset.src == f"{prefix}1-abc.webp"
+        assert srcset.thumbnail == f"{prefix}1-abc_thumbnail.webp"
+        assert srcset.srcset.startswith(f"{prefix}1-abc_thumbnail.webp 320w")
+
+    @pytest.mark.parametrize("width, height, expected", [
+        (1920, 1280, "_thumbnail.webp 320w, {p}1-abc_medium.webp 960w, {p}1-abc.webp 1920w"),
+        (1080, 1920, "_thumbnail.webp 180w, {p}1-abc_medium.webp 540w, {p}1-abc.webp 1080w"),
+        (500, 250, "_thumbnail.webp 320w, {p}1-abc_medium.webp 500w"),
+        (200, 100, "_thumbnail.webp 200w"),
+    ])
+    def test_srcset_widths_follow_image_size(self, width, height, expected):
+        """Test that w descriptors are the real widths of portrait and small images' derivatives."""
+        prefix = f"{API_HOST}/images/"
+        metadata = ImageMetadata(width=width, height=height, dominant_color="#000000", blurhash="00")
+        srcset = ImageSrcset.from_storage_name("1-abc.webp", ImageUrlResolver(prefix), metadata)
+
+        assert srcset.srcset == f"{prefix}1-abc" + expected.format(p=prefix)
+
+    def test_derivative_names_always_include_avif(self):
+        """Test that AVIF files are deleted even after IMAGE_AVIF_ENABLED is turned off."""
+        names = derivative_names("1-abc.webp")
+
+        assert "1-abc_thumbnail.avif" in names and "1-abc.webp" in names
+        assert len(names) == 6
+
+    def test_srcset_for_legacy_image(self):
+        """Test that a legacy image without derivatives is used for every variant."""
+        prefix = f"{API_HOST}/images/"
+        srcset = ImageSrcset.from_storage_name("1-abc.png", ImageUrlResolver(prefix))
+
+        assert srcset.thumbnail == srcset.full == f"{prefix}1-abc.png"
+
+    def test_look_read_exposes_images(self):
+        """Test that LookRead exposes one srcset per image."""
+        look = LookRead(
+            id=1,
+            name="Test Look",
+            gender=GenderEnum.unisex,
+            description="Test description",
+            image_prompts=["test"],
+            image_urls=["1-abc.webp"]
+        )
+
+        assert len(look.images) == 1
+        assert look.images[0].medium == f"{API_HOST}/images/1-abc_medium.webp"
+
+    def test_url_resolver_round_trip(self):
+        """Test that storage keys map to storage URLs and back, including legacy local URLs."""
+        resolver = ImageUrlResolver("https://cdn.example.com/bucket/")
+
+        assert resolver.public_url("ab/cd/abc.webp") == "https://cdn.example.com/bucket/ab/cd/abc.webp"
+        assert resolver.storage_key("https://cdn.example.com/bucket/ab/cd/abc.webp") == "ab/cd/abc.webp"
+        assert resolver.storage_key(f"{API_HOST}/images/1-abc.png") == "1-abc.png"
+        assert resolver.storage_key("https://other.example.com/a.png") == "https://other.example.com/a.png"
+
+    def test_url_resolver_spreads_keys_over_cdn_hosts(self):
+        """Test that each key is always served from the same CDN host and maps back to its key."""
+        cdn_urls = ["https://img1.example.com/", "https://img2.example.com"]
+        resolver = ImageUrlResolver("https://storage.example.com/bucket/", cdn_urls)
+        keys = [f"ab/cd/{i}.webp" for i in range(20)]
+
+        urls = resolver.public_urls(keys)
+
+        assert urls == resolver.public_urls(keys)
+        assert {url.split("/")[2] for url in urls} == {"img1.example.com", "img2.example.com"}
+        assert [resolver.storage_key(url) for url in urls] == keys
+        assert resolver.storage_key("https://storage.example.com/bucket/ab/cd/1.webp") == "ab/cd/1.webp"
@@ -0,0 +1,278 @@
+import asyncio
+from io import BytesIO
+
+import pytest
+from unittest.mock import AsyncMock, patch
+from PIL import Image
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.exception_handlers import init_exception_handlers
+from app.config import IMAGE_CACHE_CONTROL, IMAGE_LEGACY_CACHE_CONTROL
+from app.domain.entities.images import content_key
+from app.images.router import router
+from app.infrastructure.image_cache import DerivativeCache
+from app.infrastructure.image_deletion import BackgroundImageDeletionQueue
+from app.infrastructure.image_index import BKTree, ImageHashIndex
+
+
+@pytest.fixture
+def images_dir(tmp_path):
+    """Upload directory with one content-addressed and one legacy image."""
+    key = content_key("ab" * 32)
+    (tmp_path / key).parent.mkdir(parents=True)
+    (tmp_path / key).write_bytes(b"webp")
+    Image.new("RGB", (400, 200), color="red").save(tmp_path / "1-legacy.png")
+    (tmp_path / "ab" / "ab" / ".partial.webp.tmp").write_bytes(b"tmp")
+    with patch("app.application.utils.UPLOAD_IMAGES_DIR", tmp_path):
+        yield tmp_path
+
+
+@pytest.fixture
+def client():
+    """Test client for the images router."""
+    app = FastAPI()
+    app.include_router(router)
+    init_exception_handlers(app)
+    return TestClient(app)
+
+
+class TestImageRoute:
+    """Test cases for serving stored images."""
+
+    def test_content_addressed_image_is_immutable(self, images_dir, client):
+        """Test that content-addressed images are cached forever."""
+        response = client.get(f"/images/{content_key('ab' * 32)}")
+
+        assert response.status_code == 200
+        assert response.content == b"webp"
+        assert response.headers["cache-control"] == IMAGE_CACHE_CONTROL
+        assert response.headers["content-type"] == "image/webp"
+
+    def test_legacy_image_has_short_cache(self, images_dir, client):
+        """Test that images under non-content names are cached for a limited time."""
+        response = client.get("/images/1-legacy.png")
+
+        assert response.status_code == 200
+        assert response.headers["cache-control"] == IMAGE_LEGACY_CACHE_CONTROL
+
+    def test_accel_redirect(self, images_dir, client):
+        """Test that the file is handed off to nginx when X-Accel-Redirect is enabled."""
+        with patch("app.images.router.IMAGE_ACCEL_REDIRECT_PREFIX", "/_images/"):
+            response = client.get(f"/images/{content_key('ab' * 32)}")
+
+        assert response.status_code == 200
+        assert response.content == b""
+        assert (
+            response.headers["x-accel-redirect"] == f"/_images/{content_key('ab' * 32)}"
+        )
+
+    @pytest.mark.parametrize(
+        "name", ["ab/ab/.partial.webp.tmp", "../config.py", "missing.webp"]
+    )
+    def test_unservable_names_are_not_found(self, images_dir, client, name):
+        """Test that hidden, outside and missing files are not served."""
+        assert client.get(f"/images/{name}").status_code == 404
+
+    def test_resized_image_is_cached(self, images_dir, client, tmp_path):
+        """Test that a resized image is produced once and served from the cache."""
+        cache = DerivativeCache(tmp_path / "cache", max_bytes=10**6)
+
+        with patch("app.images.router.derivative_cache", cache):
+            first = client.get("/images/1-legacy.png?w=160&fmt=webp")
+            second = client.get("/images/1-legacy.png?w=160&fmt=webp")
+
+        assert first.status_code == second.status_code == 200
+        assert first.headers["content-type"] == "image/webp"
+        assert Image.open(BytesIO(first.content)).size == (160, 80)
+        assert cache.metrics()["lookhub_image_cache_misses_total"] == 1
+        assert cache.metrics()["lookhub_image_cache_hits_total"] == 1
+
+    def test_requested_sizes_are_rounded_up(self, images_dir, client, tmp_path):
+        """Test that arbitrary sizes share the derivative of the next allowed size."""
+        cache = DerivativeCache(tmp_path / "cache", max_bytes=10**6)
+
+        with patch("app.images.router.derivative_cache", cache):
+            responses = [
+                client.get(f"/images/1-legacy.png?w={w}&fmt=webp")
+                for w in (100, 101, 160)
+            ]
+
+        assert all(response.status_code == 200 for response in responses)
+        assert Image.open(BytesIO(responses[0].content)).size == (160, 80)
+        assert cache.metrics()["lookhub_image_cache_misses_total"] == 1
+
+    def test_decompression_bomb_is_handled(self, images_dir, client, tmp_path):
+        """Test that an image over the pixel limit is reported as a handled error."""
+        cache = DerivativeCache(tmp_path / "cache", max_bytes=10**6)
+        resize = AsyncMock(side_effect=Image.DecompressionBombError("too large"))
+
+        with (
+            patch("app.images.router.derivative_cache", cache),
+            patch("app.images.router.image_processor.resize", resize),
+        ):
+            response = client.get("/images/1-legacy.png?w=160")
+
+        assert response.status_code == 500
+        assert response.json()["detail"] == ["Unknown error"]
+
+    def test_resize_rejects_unknown_format(self, images_dir, client):
+        """Test that only configured output formats are accepted."""
+        assert client.get("/images/1-legacy.png?fmt=bmp").status_code == 422
+
+
+class TestDerivativeCache:
+    """Test cases for the on-disk derivative cache."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_are_deduplicated(self, tmp_path):
+        """Test that concurrent misses of the same key produce the file once."""
+        cache = DerivativeCache(tmp_path, max_bytes=10**6)
+        calls = 0
+
+        async def produce():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return b"data"
+
+        paths = await asyncio.gather(
+            *(cache.get_or_create("a/b/c.webp", produce) for _ in range(5))
+        )
+
+        assert calls == 1
+        assert len(set(paths)) == 1
+        assert paths[0].read_bytes() == b"data"
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_files_are_evicted(self, tmp_path):
+        """Test that the cache is trimmed to its budget in LRU order."""
+        cache = DerivativeCache(tmp_path, max_bytes=10)
+
+        async def produce():
+            return b"x" * 4
+
+        one = await cache.get_or_create("one.webp", produce)
+        two = await cache.get_or_create("two.webp", produce)
+        await cache.get_or_create("one.webp", produce)
+        await cache.get_or_create("three.webp", produce)
+
+        assert one.exists()
+        assert not two.exists()
+        assert cache.metrics()["lookhub_image_cache_bytes"] == 8
+
+    @pytest.mark.asyncio
+    async def test_workers_only_evict_their_own_slot(self, tmp_path):
+        """Test that each worker trims only its slot and a replacement takes over a free slot."""
+
+        async def produce():
+            return b"x" * 4
+
+        first = DerivativeCache(tmp_path, max_bytes=4, slots=2)
+        second = DerivativeCache(tmp_path, max_bytes=4, slots=2)
+        kept = await first.get_or_create("one.webp", produce)
+        await second.get_or_create("two.webp", produce)
+        await second.get_or_create("three.webp", produce)
+
+        assert kept.exists()
+        assert kept.parent != (await second.get_or_create("three.webp", produce)).parent
+
+        # The first worker exits; its replacement adopts the files of its slot
+        first._slot_lock.close()
+        replacement = DerivativeCache(tmp_path, max_bytes=4, slots=2)
+        assert await replacement.get_or_create("one.webp", produce) == kept
+        assert replacement.metrics()["lookhub_image_cache_hits_total"] == 1
+
+
+class TestImageDeletionQueue:
+    """Test cases for the background image deletion queue."""
+
+    @pytest.mark.asyncio
+    async def test_failed_deletions_are_retried_in_batches(self):
+        """Test that queued images are deleted in batches and failures are retried."""
+        storage = AsyncMock()
+        storage.delete_many.side_effect = [["1-legacy.png"], []]
+        repository = AsyncMock()
+
+        async def purge(keys, remove_files):
+            reusable = [key for key in keys if key != "3-reused.png"]
+            failed = await remove_files(reusable)
+            return [key for key in reusable if key not in failed]
+
+        repository.purge_released_images.side_effect = purge
+        queue = BackgroundImageDeletionQueue(
+            lambda: repository, batch_size=10, retry_delay=0.01
+        )
+
+        with patch(
+            "app.infrastructure.image_deletion.get_image_storage", return_value=storage
+        ):
+            queue.enqueue(["1-legacy.png", "2-legacy.png", "3-reused.png"])
+            await asyncio.sleep(0.05)
+            await queue.stop()
+
+        assert storage.delete_many.await_args_list[0].args == (
+            ["1-legacy.png", "2-legacy.png"],
+        )
+        assert storage.delete_many.await_args_list[1].args == (["1-legacy.png"],)
+        assert queue.metrics()["lookhub_image_deleted_total"] == 2
+        assert queue.metrics()["lookhub_image_delete_retries_total"] == 1
+        assert queue.metrics()["lookhub_image_delete_skipped_total"] == 1
+
+
+class TestImageHashIndex:
+    """Test cases for the perceptual hash index."""
+
+    def test_bk_tree_search_matches_linear_scan(self):
+        """Test that the tree finds exactly the hashes within the distance."""
+        values = [(i * 0x9E3779B97F4A7C15) & (2**64 - 1) for i in range(200)] + [
+            0b111,
+            0b111,
+        ]
+        tree = BKTree()
+        for i, value in enumerate(values):
+            tree.add(value, f"img{i}")
+
+        for query in (0, values[17], 0xFFFF):
+            expected = sorted(
+                (f"img{i}", (value ^ query).bit_count())
+                for i, value in enumerate(values)
+                if (value ^ query).bit_count() <= 12
+            )
+            assert sorted(tree.search(query, 12)) == expected
+
+    @pytest.mark.asyncio
+    async def test_sync_loads_only_new_hashes(self):
+        """Test that a sync continues from the last indexed row."""
+        repository = AsyncMock()
+        repository.get_image_hashes.side_effect = [
+            [
+                (1, "aa/bb/one.webp", "00000000000000ff"),
+                (4, "aa/bb/two.webp", "ffffffffffffffff"),
+            ],
+            [],
+        ]
+        index = ImageHashIndex()
+
+        await index.sync(repository)
+        await index.sync(repository)
+
+        assert [
+            call.args[0] for call in repository.get_image_hashes.await_args_list
+        ] == [0, 4]
+        assert index.search("00000000000000fe", 1) == [("aa/bb/one.webp", 1)]
+
+    @pytest.mark.asyncio
+    async def test_stored_images_are_indexed_once(self):
+        """Test that an image added on store is not counted again by the next sync."""
+        repository = AsyncMock()
+        repository.get_image_hashes.return_value = [
+            (1, "aa/bb/one.webp", "00000000000000ff"),
+        ]
+        index = ImageHashIndex()
+
+        index.add("aa/bb/one.webp", "00000000000000ff")
+        assert index.search("00000000000000ff", 0) == [("aa/bb/one.webp", 0)]
+        await index.sync(repository)
+
+        assert index.metrics()["lookhub_image_hash_index_size"] == 1
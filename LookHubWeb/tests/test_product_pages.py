@@ -0,0 +1,189 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.application.exceptions import ProductPageError
+from app.application.interfaces import BaseRepositoryInterface
+from app.application.use_cases import ClothesUseCase
+from app.domain.entities.enums import ColourEnum, GenderEnum
+from app.infrastructure.product_pages import HTMLProductExtractor, ProductPageFetcher
+
+PRODUCT_PAGE = """<!DOCTYPE html>
+<html><head>
+<title>Shop</title>
+<meta property="og:title" content="Ignored OpenGraph title">
+<script type="application/ld+json">
+{"@context": "https://schema.org", "@graph": [
+    {"@type": "BreadcrumbList", "name": "Каталог"},
+    {"@type": "Product", "name": "Платье женское миди", "description": "Платье из хлопка",
+     "color": "Чёрный", "image": ["/media/dress.jpg"]}
+]}
+</script>
+</head><body></body></html>"""
+
+OPENGRAPH_PAGE = """<html><head>
+<meta property="og:title" content="Men's grey hoodie &amp; cap">
+<meta property="og:image" content="https://cdn.shop.test/hoodie.jpg">
+<meta name="description" content="Warm hoodie">
+</head></html>"""
+
+
+class _StubShopHandler(BaseHTTPRequestHandler):
+    """Serves fixed pages and records when each request arrived."""
+
+    pages = {"/dress": PRODUCT_PAGE, "/hoodie": OPENGRAPH_PAGE, "/huge": "x" * 4096}
+    requests: list[tuple[str, float]] = []
+
+    def do_GET(self):
+        self.requests.append((self.path, time.monotonic()))
+        page = self.pages.get(self.path)
+        if page is None:
+            self.send_response(404)
+            self.end_headers()
+            return
+        body = page.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def shop_url():
+    """Base URL of a local stub shop."""
+    _StubShopHandler.requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubShopHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+class _DictPageCache:
+    """In-memory stand-in for the Redis page cache."""
+
+    def __init__(self):
+        self.pages = {}
+
+    async def get(self, url):
+        return self.pages.get(url)
+
+    async def set(self, url, html):
+        self.pages[url] = html
+
+
+class TestHTMLProductExtractor:
+    """Test cases for extracting clothes from product pages."""
+
+    def test_extracts_json_ld_product(self):
+        """Test that the schema.org Product wins over OpenGraph and URLs are made absolute."""
+        clothes = HTMLProductExtractor().extract(
+            "https://shop.test/women/dress-1", PRODUCT_PAGE
+        )
+
+        assert clothes.name == "Платье женское миди"
+        assert clothes.description == "Платье из хлопка"
+        assert clothes.colours == [ColourEnum.black.value]
+        assert clothes.gender == GenderEnum.female.value
+        assert clothes.image_url == "https://shop.test/media/dress.jpg"
+        assert clothes.link == "https://shop.test/women/dress-1"
+
+    def test_falls_back_to_opengraph(self):
+        """Test that OpenGraph and meta tags are used when there is no JSON-LD."""
+        clothes = HTMLProductExtractor().extract(
+            "https://shop.test/p/1", OPENGRAPH_PAGE
+        )
+
+        assert clothes.name == "Men's grey hoodie & cap"
+        assert clothes.description == "Warm hoodie"
+        assert clothes.colours == [ColourEnum.gray.value]
+        assert clothes.gender == GenderEnum.male.value
+
+    def test_page_without_image_is_rejected(self):
+        """Test that a page that does not describe a product raises ProductPageError."""
+        with pytest.raises(ProductPageError):
+            HTMLProductExtractor().extract(
+                "https://shop.test/", "<html><title>Shop</title></html>"
+            )
+
+
+class TestProductPageFetcher:
+    """Test cases for fetching product pages."""
+
+    @pytest.mark.asyncio
+    async def test_requests_to_one_host_are_spaced(self, shop_url):
+        """Test that concurrent requests to the same host respect the politeness delay."""
+        import asyncio
+
+        fetcher = ProductPageFetcher(max_concurrency=4, domain_delay=0.2)
+        try:
+            await asyncio.gather(
+                *(fetcher.fetch(f"{shop_url}/dress") for _ in range(3))
+            )
+        finally:
+            await fetcher.close()
+
+        times = sorted(arrived for _, arrived in _StubShopHandler.requests)
+        assert len(times) == 3
+        assert all(later - earlier >= 0.18 for earlier, later in zip(times, times[1:]))
+
+    @pytest.mark.asyncio
+    async def test_cached_page_is_not_fetched_again(self, shop_url):
+        """Test that a cached page is served without a request to the shop."""
+        fetcher = ProductPageFetcher(domain_delay=0, cache=_DictPageCache())
+        try:
+            first = await fetcher.fetch(f"{shop_url}/dress")
+            second = await fetcher.fetch(f"{shop_url}/dress")
+        finally:
+            await fetcher.close()
+
+        assert first == second == PRODUCT_PAGE
+        assert len(_StubShopHandler.requests) == 1
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("path", ["/missing", "/huge"])
+    async def test_failed_or_oversized_page_is_rejected(self, shop_url, path):
+        """Test that HTTP errors and pages over the size limit raise ProductPageError."""
+        fetcher = ProductPageFetcher(domain_delay=0, max_page_bytes=1024)
+        try:
+            with pytest.raises(ProductPageError):
+                await fetcher.fetch(f"{shop_url}{path}")
+        finally:
+            await fetcher.close()
+
+    @pytest.mark.asyncio
+    async def test_non_http_url_is_rejected(self):
+        """Test that only http(s) URLs are fetched."""
+        with pytest.raises(ProductPageError):
+            await ProductPageFetcher().fetch("file:///etc/passwd")
+
+
+class TestClothesFromLink:
+    """Test cases for creating clothes from a product link."""
+
+    @pytest.mark.asyncio
+    async def test_add_one_from_link(self, shop_url, sample_clothes_data):
+        """Test that the page is fetched, parsed and saved as a clothing item."""
+        repository = AsyncMock(spec=BaseRepositoryInterface)
+        repository.add_one.side_effect = lambda data: {**data, "id": 7}
+        fetcher = ProductPageFetcher(domain_delay=0)
+        use_case = ClothesUseCase(repository, fetcher, HTMLProductExtractor())
+
+        try:
+            clothes = await use_case.add_one_from_link(f"{shop_url}/dress")
+        finally:
+            await fetcher.close()
+
+        assert clothes.id == 7
+        assert clothes.name == "Платье женское миди"
+        saved = repository.add_one.call_args.args[0]
+        assert saved["link"] == f"{shop_url}/dress"
+        assert saved["image_url"] == f"{shop_url}/media/dress.jpg"
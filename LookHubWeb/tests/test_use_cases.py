@@ -1,5 +1,8 @@
+import os
+import time
+
 import pytest
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 from app.application.use_cases import ClothesUseCase, LooksUseCase
 from app.domain.entities.clothes import ClothesCreate, ClothesUpdate, ClothesRead
 from app.domain.entities.looks import LookCreate, LookUpdate, LookRead
@@ -98,6 +101,22 @@ class TestClothesUseCase:
         assert isinstance(result[0], ClothesRead)
         mock_clothes_repository.get_list_by_ids.assert_called_once_with([1, 2])
 
+    @pytest.mark.asyncio
+    async def test_get_batch_keeps_request_order(self, clothes_use_case, mock_clothes_repository, sample_clothes_instance):
+        """Test that a batch is fetched with one query, in request order, reporting missing IDs."""
+        # Arrange
+        mock_clothes_repository.get_list_by_ids.return_value = [
+            {**sample_clothes_instance, "id": 2}, {**sample_clothes_instance, "id": 5},
+        ]
+
+        # Act
+        results, missing = await clothes_use_case.get_batch([5, 9, 2, 5])
+
+        # Assert
+        assert [item.id for item in results] == [5, 2]
+        assert missing == [9]
+        mock_clothes_repository.get_list_by_ids.assert_called_once_with([5, 9, 2])
+
 
 class TestLooksUseCase:
     """Test cases for LooksUseCase."""
@@ -106,8 +125,9 @@ class TestLooksUseCase:
     async def test_add_one_success(self, looks_use_case, mock_looks_repository, sample_look_data, sample_look_instance):
         """Test successful look creation."""
         # Arrange
-        look_data = LookCreate(**sample_look_data)
-        mock_looks_repository.add_one.return_value = sample_look_instance
+        look_data = LookCreate(**{**sample_look_data, "image_urls": ["aa/bb/one.webp"]})
+        mock_looks_repository.add_many.return_value = [1]
+        mock_looks_repository.get_one_by_id.return_value = sample_look_instance
         
         # Act
         result = await looks_use_case.add_one(look_data)
@@ -116,7 +136,10 @@ class TestLooksUseCase:
         assert isinstance(result, LookRead)
         assert result.id == 1
         assert result.name == "Casual Summer Look"
-        mock_looks_repository.add_one.assert_called_once()
+        # Created through add_many, which acquires the image references with the look
+        (looks,), _ = mock_looks_repository.add_many.call_args
+        assert looks[0]["image_urls"] == ["aa/bb/one.webp"]
+        mock_looks_repository.add_one.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_add_clothes_categories_success(self, looks_use_case, mock_looks_repository, sample_look_instance):
@@ -250,6 +273,423 @@ class TestLooksUseCase:
         mock_looks_repository.get_list_by_ids.assert_called_once_with([1, 2])
 
 
+    @pytest.mark.asyncio
+    async def test_update_one_counts_image_references(self, looks_use_case, mock_looks_repository, sample_look_instance):
+        """Test that image reference counts follow image_urls changes."""
+        # Arrange
+        current_look = {**sample_look_instance, "image_urls": ["aa/bb/one.webp", "aa/bb/one.webp"]}
+        updated_look = {**sample_look_instance, "image_urls": ["aa/bb/one.webp", "cc/dd/two.webp"]}
+        mock_looks_repository.get_one_by_id.return_value = current_look
+        mock_looks_repository.update_with_images.return_value = (updated_look, [])
+
+        # Act
+        await looks_use_case.update_one(1, LookUpdate(image_urls=updated_look["image_urls"]))
+
+        # Assert
+        (look_id, data), _ = mock_looks_repository.update_with_images.call_args
+        assert (look_id, data["image_urls"]) == (1, updated_look["image_urls"])
+        mock_looks_repository.update_one.assert_not_called()
+        mock_looks_repository.release_images.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_update_with_images_moves_references_in_one_transaction(self, sample_look_instance):
+        """Test that added and removed images are counted in the transaction of the look update."""
+        from contextlib import asynccontextmanager
+        from app.infrastructure.repositories.looks import LooksRepository
+        # Clothes must be mapped for the look relationships to compile
+        from app.infrastructure.repositories.models.clothes import Clothes  # noqa: F401
+
+        # Arrange
+        session = MagicMock()
+        session.commit = AsyncMock()
+        updated = MagicMock(image_urls=["aa/bb/one.webp", "cc/dd/two.webp"])
+        statements = []
+
+        async def execute(stmt, params=None):
+            statements.append(str(stmt).split()[0])
+            result = MagicMock()
+            result.one_or_none.return_value = (["aa/bb/one.webp", "aa/bb/one.webp"],)
+            result.unique.return_value.scalar_one.return_value = updated
+            result.scalar_one_or_none.return_value = 5
+            result.scalars.return_value.all.return_value = []
+            return result
+
+        session.execute = AsyncMock(side_effect=execute)
+
+        @asynccontextmanager
+        async def session_factory():
+            yield session
+
+        # Act
+        _, released = await LooksRepository(session_factory).update_with_images(
+            1, {"image_urls": updated.image_urls}
+        )
+
+        # Assert
+        assert released == []
+        # Lock and read, update the look, acquire the new image, release the removed one
+        assert statements == ["SELECT", "UPDATE", "INSERT", "UPDATE"]
+        insert = session.execute.await_args_list[2].args[0]
+        assert insert.compile().params["key_m0"] == "cc/dd/two.webp"
+        session.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_delete_one_removes_only_released_images(self, looks_use_case, mock_looks_repository, sample_look_instance):
+        """Test that files are removed only for images without references left."""
+        # Arrange
+        look = {**sample_look_instance, "image_urls": ["aa/bb/shared.webp", "cc/dd/own.webp"]}
+        mock_looks_repository.get_one_by_id.return_value = look
+        mock_looks_repository.release_images.return_value = ["cc/dd/own.webp"]
+        mock_looks_repository.delete_one.return_value = True
+
+        async def purge(keys, remove_files):
+            return [key for key in keys if key not in await remove_files(keys)]
+
+        mock_looks_repository.purge_released_images.side_effect = purge
+
+        # Act
+        with patch("app.application.use_cases.delete_image", new_callable=AsyncMock) as mock_delete:
+            await looks_use_case.delete_one(1)
+
+        # Assert
+        mock_delete.assert_called_once_with("cc/dd/own.webp")
+
+    @pytest.mark.asyncio
+    async def test_release_marks_images_pending_delete(self):
+        """Test that released images stay registered until their files are purged."""
+        from contextlib import asynccontextmanager
+        from app.infrastructure.repositories.looks import LooksRepository
+
+        # Arrange
+        session = MagicMock()
+        session.commit = AsyncMock()
+        result = MagicMock()
+        result.scalar_one_or_none.side_effect = [0, 1, None]
+        session.execute = AsyncMock(return_value=result)
+
+        @asynccontextmanager
+        async def session_factory():
+            yield session
+
+        # Act
+        released = await LooksRepository(session_factory).release_images(
+            ["aa/bb/last.webp", "cc/dd/shared.webp", "1-legacy.png"]
+        )
+
+        # Assert
+        assert released == ["aa/bb/last.webp", "1-legacy.png"]
+        statements = [str(call.args[0]) for call in session.execute.await_args_list]
+        assert all(stmt.startswith("UPDATE lookimage SET") for stmt in statements)
+        assert "pending_delete=" in statements[0]
+
+    @pytest.mark.asyncio
+    async def test_delete_one_enqueues_released_images(self, mock_looks_repository, mock_clothes_repository, sample_look_instance):
+        """Test that released images are handed to the deletion queue instead of deleted inline."""
+        # Arrange
+        deletion_queue = MagicMock()
+        use_case = LooksUseCase(mock_looks_repository, mock_clothes_repository, image_deletion_queue=deletion_queue)
+        mock_looks_repository.get_one_by_id.return_value = {**sample_look_instance, "image_urls": ["cc/dd/own.webp"]}
+        mock_looks_repository.release_images.return_value = ["cc/dd/own.webp"]
+        mock_looks_repository.delete_one.return_value = True
+
+        # Act
+        with patch("app.application.use_cases.delete_image", new_callable=AsyncMock) as mock_delete:
+            await use_case.delete_one(1)
+
+        # Assert
+        deletion_queue.enqueue.assert_called_once_with(["cc/dd/own.webp"])
+        mock_delete.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_collect_orphan_images(self, looks_use_case, mock_looks_repository, tmp_path):
+        """Test that only old files of unreferenced images are collected."""
+        # Arrange
+        old = time.time() - 2 * 86400
+        files = {
+            "aa/bb/used.webp": old, "aa/bb/used_thumbnail.webp": old,
+            "cc/dd/orphan.webp": old, "cc/dd/orphan_medium.webp": old,
+            "cc/dd/.orphan.webp.tmp": old, "ee/ff/fresh.webp": time.time(),
+        }
+        for key, mtime in files.items():
+            (tmp_path / key).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / key).write_bytes(b"12345")
+            os.utime(tmp_path / key, (mtime, mtime))
+        mock_looks_repository.referenced_images.return_value = {"aa/bb/used.webp"}
+
+        # Act
+        with patch("app.application.utils.UPLOAD_IMAGES_DIR", tmp_path):
+            stats = await looks_use_case.collect_orphan_images(grace_seconds=86400, batch_size=2)
+
+        # Assert
+        remaining = sorted(p.relative_to(tmp_path).as_posix() for p in tmp_path.rglob("*") if p.is_file())
+        assert remaining == ["aa/bb/used.webp", "aa/bb/used_thumbnail.webp", "ee/ff/fresh.webp"]
+        assert stats == {"scanned": 6, "deleted": 3, "reclaimed_bytes": 15}
+        assert all(call.args[1] == 86400 for call in mock_looks_repository.referenced_images.await_args_list)
+
+    @pytest.mark.asyncio
+    async def test_reserved_images_are_not_orphans(self, looks_use_case, mock_looks_repository, tmp_path):
+        """Test that a reused image with an old file survives collection while it is reserved."""
+        from contextlib import asynccontextmanager
+        from datetime import timedelta
+        from sqlalchemy.dialects import postgresql
+        from app.infrastructure.repositories.looks import LooksRepository
+
+        # Arrange
+        old = time.time() - 2 * 86400
+        (tmp_path / "aa" / "bb").mkdir(parents=True)
+        (tmp_path / "aa" / "bb" / "reused.webp").write_bytes(b"12345")
+        os.utime(tmp_path / "aa" / "bb" / "reused.webp", (old, old))
+        session = MagicMock()
+        statements = []
+
+        async def execute(stmt, params=None):
+            statements.append(stmt)
+            result = MagicMock()
+            # No look refers to it yet; the registration query finds the fresh reservation
+            result.scalars.return_value.all.return_value = [] if len(statements) == 1 else ["aa/bb/reused.webp"]
+            return result
+
+        session.execute = AsyncMock(side_effect=execute)
+
+        @asynccontextmanager
+        async def session_factory():
+            yield session
+
+        use_case = LooksUseCase(LooksRepository(session_factory), MagicMock())
+
+        # Act
+        with patch("app.application.utils.UPLOAD_IMAGES_DIR", tmp_path):
+            stats = await use_case.collect_orphan_images(grace_seconds=86400)
+
+        # Assert
+        assert stats["deleted"] == 0
+        assert (tmp_path / "aa" / "bb" / "reused.webp").exists()
+        sql = str(statements[1].compile(dialect=postgresql.dialect()))
+        assert "NOT lookimage.pending_delete AND lookimage.updated_at > now() -" in sql
+        assert timedelta(seconds=86400) in statements[1].compile().params.values()
+
+    @pytest.mark.asyncio
+    async def test_find_duplicates(self, mock_looks_repository, mock_clothes_repository, sample_look_instance):
+        """Test that similar images of other looks are found and the look itself is skipped."""
+        # Arrange
+        image_index = MagicMock()
+        image_index.sync = AsyncMock()
+        image_index.search.return_value = [("aa/bb/own.webp", 0), ("cc/dd/similar.webp", 3)]
+        use_case = LooksUseCase(mock_looks_repository, mock_clothes_repository, image_index=image_index)
+        mock_looks_repository.get_one_by_id.return_value = {
+            **sample_look_instance,
+            "image_urls": ["aa/bb/own.webp"],
+            "image_metadata": {"aa/bb/own.webp": {
+                "width": 10, "height": 10, "dominant_color": "#000000", "blurhash": "00", "dhash": "0f0f0f0f0f0f0f0f",
+            }},
+        }
+        mock_looks_repository.get_look_ids_by_images.return_value = {
+            "aa/bb/own.webp": [1, 7], "cc/dd/similar.webp": [5],
+        }
+
+        # Act
+        duplicates = await use_case.find_duplicates(1, max_distance=5)
+
+        # Assert
+        image_index.sync.assert_not_called()
+        image_index.search.assert_called_once_with("0f0f0f0f0f0f0f0f", 5)
+        assert [(d.look_id, d.duplicate_image, d.distance) for d in duplicates] == [
+            (7, "aa/bb/own.webp", 0), (5, "cc/dd/similar.webp", 3),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_find_duplicates_requires_index(self, looks_use_case, mock_looks_repository):
+        """Test that a use case without an image index refuses to search."""
+        with pytest.raises(RuntimeError):
+            await looks_use_case.find_duplicates(1)
+        mock_looks_repository.get_one_by_id.assert_not_called()
+
+
+class TestLooksBulkCreate:
+    """Test cases for creating looks in bulk."""
+
+    @pytest.mark.asyncio
+    async def test_add_many_uses_three_multi_row_statements(self, sample_look_data):
+        """Test that looks, categories and category clothes are inserted with one statement each."""
+        from contextlib import asynccontextmanager
+        from app.infrastructure.repositories.looks import LooksRepository
+
+        # Arrange
+        session = MagicMock()
+        session.commit = AsyncMock()
+        results = iter([[1, 2, 3], [10, 11], [100, 101, 102]])
+
+        async def execute(stmt, params=None):
+            result = MagicMock()
+            result.scalars.return_value.all.return_value = next(results, [])
+            return result
+
+        session.execute = AsyncMock(side_effect=execute)
+
+        @asynccontextmanager
+        async def session_factory():
+            yield session
+
+        looks = [
+            LookCreate(**{**sample_look_data, "clothes_categories": [
+                ClothesCategoryCreate(name="Верх", clothes=[1, 2]),
+                ClothesCategoryCreate(name="Низ", clothes=[3]),
+            ]}),
+            LookCreate(**{**sample_look_data, "clothes_categories": [ClothesCategoryCreate(name="Обувь", clothes=[])]}),
+        ]
+        use_case = LooksUseCase(LooksRepository(session_factory), MagicMock())
+
+        # Act
+        ids = await use_case.add_many(looks)
+
+        # Assert
+        assert ids == [10, 11]
+        # Clothes are checked with one query, then one insert per table
+        assert session.execute.await_count == 4
+        look_rows = session.execute.await_args_list[1].args[1]
+        category_rows = session.execute.await_args_list[2].args[1]
+        association_rows = session.execute.await_args_list[3].args[1]
+        assert len(look_rows) == 2 and "clothes_categories" not in look_rows[0]
+        assert [(row["name"], row["look_id"]) for row in category_rows] == [("Верх", 10), ("Низ", 10), ("Обувь", 11)]
+        assert association_rows == [
+            {"clothescategory_id": 100, "clothes_id": 1},
+            {"clothescategory_id": 100, "clothes_id": 2},
+            {"clothescategory_id": 101, "clothes_id": 3},
+        ]
+        session.commit.assert_awaited_once()
+
+
+    @pytest.mark.asyncio
+    async def test_add_many_rejects_unknown_clothes(self, sample_look_data):
+        """Test that missing clothes are reported before anything is inserted."""
+        from contextlib import asynccontextmanager
+        from app.application.exceptions import ClothesNotFoundError
+        from app.infrastructure.repositories.looks import LooksRepository
+
+        # Arrange
+        session = MagicMock()
+        session.commit = AsyncMock()
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = [1]
+        session.execute = AsyncMock(return_value=result)
+
+        @asynccontextmanager
+        async def session_factory():
+            yield session
+
+        looks = [{**sample_look_data, "clothes_categories": [{"name": "Верх", "clothes": [1, 7, 5]}]}]
+
+        # Act
+        with pytest.raises(ClothesNotFoundError) as exc_info:
+            await LooksRepository(session_factory).add_many(looks)
+
+        # Assert
+        assert exc_info.value.clothes_ids == [5, 7]
+        assert session.execute.await_count == 1
+        session.commit.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_add_many_acquires_image_references_in_one_statement(self, sample_look_data):
+        """Test that image references of all looks are acquired with one upsert in the same transaction."""
+        from contextlib import asynccontextmanager
+        from app.infrastructure.repositories.looks import LooksRepository
+
+        # Arrange
+        session = MagicMock()
+        session.commit = AsyncMock()
+        results = iter([[10, 11]])
+
+        async def execute(stmt, params=None):
+            result = MagicMock()
+            result.scalars.return_value.all.return_value = next(results, [])
+            return result
+
+        session.execute = AsyncMock(side_effect=execute)
+
+        @asynccontextmanager
+        async def session_factory():
+            yield session
+
+        looks = [
+            LookCreate(**{**sample_look_data, "image_urls": ["looks/a.webp", "looks/b.webp"]}),
+            LookCreate(**{**sample_look_data, "image_urls": ["looks/a.webp"]}),
+        ]
+        use_case = LooksUseCase(LooksRepository(session_factory), MagicMock())
+
+        # Act
+        await use_case.add_many(looks)
+
+        # Assert
+        assert session.execute.await_count == 2
+        upsert = session.execute.await_args_list[1].args[0]
+        params = upsert.compile().params
+        assert sorted(value for name, value in params.items() if name.startswith("ref_count")) == [1, 2]
+        session.commit.assert_awaited_once()
+
+
+class TestLooksCreateWithImages:
+    """Test cases for creating a look together with its images."""
+
+    @pytest.mark.asyncio
+    async def test_add_one_with_images_stores_images_once_and_creates_look(
+            self, looks_use_case, mock_looks_repository, sample_look_data, sample_look_instance, tmp_path):
+        """Test that images are stored before the look is created in a single repository call."""
+        from app.domain.entities.images import ImageUpload, content_key
+
+        # Arrange
+        image = ImageUpload(path=tmp_path / "upload", size=3, sha256="ab" * 32)
+        mock_looks_repository.get_image_metadata.return_value = {}
+        mock_looks_repository.add_many.return_value = [1]
+        mock_looks_repository.get_one_by_id.return_value = sample_look_instance
+
+        # Act
+        with patch("app.application.use_cases.image_exists", AsyncMock(return_value=True)):
+            result = await looks_use_case.add_one_with_images(LookCreate(**sample_look_data), [image, image])
+
+        # Assert
+        assert isinstance(result, LookRead)
+        (looks,), _ = mock_looks_repository.add_many.call_args
+        assert len(looks) == 1
+        assert looks[0]["image_urls"] == [content_key(image.sha256)] * 2
+        mock_looks_repository.save_image_metadata.assert_not_called()
+        mock_looks_repository.reserve_image.assert_awaited_once_with(content_key(image.sha256))
+        mock_looks_repository.get_one_by_id.assert_called_once_with(1)
+
+    @pytest.mark.asyncio
+    async def test_images_being_deleted_are_stored_again(
+            self, looks_use_case, mock_looks_repository, tmp_path):
+        """Test that stored content is saved again when it cannot be reserved."""
+        from app.domain.entities.images import ImageUpload, content_key
+
+        # Arrange
+        image = ImageUpload(path=tmp_path / "upload", size=3, sha256="ab" * 32)
+        metadata = MagicMock(dhash="0f0f0f0f0f0f0f0f")
+        encoded = MagicMock(metadata=metadata)
+        mock_looks_repository.reserve_image.return_value = False
+        looks_use_case.image_index = MagicMock()
+
+        # Act
+        with (
+            patch("app.application.use_cases.image_exists", AsyncMock(return_value=True)),
+            patch.object(looks_use_case, "_encode_image", AsyncMock(return_value=encoded)),
+            patch(
+                "app.application.use_cases.save_derivatives",
+                AsyncMock(return_value=content_key(image.sha256)),
+            ) as mock_save,
+        ):
+            names, _ = await looks_use_case._store_images([image])
+
+        # Assert
+        assert names == [content_key(image.sha256)]
+        mock_save.assert_awaited_once()
+        mock_looks_repository.save_image_metadata.assert_awaited_once_with(
+            content_key(image.sha256), metadata.model_dump.return_value
+        )
+        looks_use_case.image_index.add.assert_called_once_with(
+            content_key(image.sha256), "0f0f0f0f0f0f0f0f"
+        )
+
+
 class TestBaseUseCase:
     """Test cases for base CRUD use case functionality."""
 
@@ -1,11 +1,27 @@
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
-from PIL import Image
+from PIL import Image, UnidentifiedImageError
 from io import BytesIO
 import os
+import hashlib
+import time
 
-from app.application.utils import save_image, delete_image
+from fastapi import UploadFile
+
+from app.api.responses import ModelJSONResponse
+from app.api.uploads import UploadSizeLimitMiddleware, spooled_uploads
+from app.application.exceptions import FileTooLargeError
+from app.application.image_metadata import blurhash, dhash, extract_metadata
+from app.application.utils import (
+    save_image, delete_image, encode_derivatives, encode_image_source, open_image, LocalImageStorage,
+)
 from app.domain.entities.clothes import Clothes
+from app.domain.entities.looks import Look
+from app.infrastructure.image_processing import ProcessPoolImageProcessor
+from app.infrastructure.metrics import WorkerMetricsSnapshots, render_metrics
+from app.infrastructure.static_assets import AssetManifest, PrecompressedStaticFiles, build_bundle
+from app.infrastructure.storage import S3ImageStorage
+from app.infrastructure.tasks.producer import TaskProducer
 from app.domain.entities.enums import GenderEnum, ColourEnum
 
 
@@ -82,6 +98,689 @@ class TestImageUtils:
             await delete_image(image_path)
 
 
+    def test_encode_derivatives_sizes(self):
+        """Test that derivatives are downscaled WebP images of configured sizes."""
+        test_image = Image.new('RGB', (2000, 1000), color='green')
+
+        outputs = encode_derivatives(test_image)
+
+        thumbnail = Image.open(BytesIO(outputs[("thumbnail", "webp")]))
+        assert thumbnail.format == "WEBP"
+        assert thumbnail.size == (320, 160)
+        assert Image.open(BytesIO(outputs[("full", "webp")])).size == (1920, 960)
+
+    def test_encode_derivatives_never_upscale(self):
+        """Test that small images are not upscaled."""
+        test_image = Image.new('RGBA', (100, 50))
+
+        outputs = encode_derivatives(test_image)
+
+        assert Image.open(BytesIO(outputs[("full", "webp")])).size == (100, 50)
+
+
+class TestImageMetadata:
+    """Test cases for image metadata extraction."""
+
+    def test_blurhash_matches_reference_encoding(self):
+        """Test the BlurHash of a solid image against the reference encoder output."""
+        test_image = Image.new('RGB', (32, 16), color=(255, 0, 0))
+
+        assert blurhash(test_image) == "LKTI:j,YfQ,Y|co1fQo1fQfQfQfQ"
+
+    def test_extract_metadata(self):
+        """Test that metadata reports the full size and a dominant colour."""
+        test_image = Image.new('RGB', (320, 160), color=(0, 0, 255))
+        test_image.paste((255, 255, 255), (0, 0, 40, 160))
+
+        metadata = extract_metadata(test_image, (1920, 960))
+
+        assert (metadata.width, metadata.height) == (1920, 960)
+        assert metadata.dominant_color == "#0000ff"
+
+    def test_dhash_of_resized_copy_is_close(self):
+        """Test that a resized copy hashes close to the original and a different image does not."""
+        original = Image.linear_gradient('L').convert('RGB')
+        original.paste((255, 0, 0), (40, 40, 120, 120))
+        resized = original.resize((97, 61))
+        different = original.transpose(Image.Transpose.FLIP_LEFT_RIGHT)
+
+        def distance(a, b):
+            return (int(dhash(a), 16) ^ int(dhash(b), 16)).bit_count()
+
+        assert len(dhash(original)) == 16
+        assert distance(original, resized) <= 4
+        assert distance(original, different) > 10
+
+
+class TestImageDecoding:
+    """Test cases for guarded decoding of uploaded images."""
+
+    @staticmethod
+    def _image_bytes(size, fmt) -> bytes:
+        buffer = BytesIO()
+        Image.new('RGB', size, color='red').save(buffer, format=fmt)
+        return buffer.getvalue()
+
+    def test_jpeg_is_decoded_at_reduced_scale(self):
+        """Test that a large JPEG is decoded straight to the requested box."""
+        data = self._image_bytes((4000, 2000), 'JPEG')
+
+        with open_image(data, (500, 500)) as image:
+            assert image.size == (500, 250)
+
+        encoded = encode_image_source(data)
+        assert (encoded.metadata.width, encoded.metadata.height) == (1920, 960)
+
+    def test_pixel_limit(self):
+        """Test that images above the pixel limit are rejected before decoding."""
+        data = self._image_bytes((200, 100), 'PNG')
+
+        with patch("app.application.utils.IMAGE_MAX_PIXELS", 10_000):
+            with pytest.raises(Image.DecompressionBombError):
+                encode_image_source(data)
+
+    def test_disallowed_format(self):
+        """Test that formats outside the upload whitelist are not decoded."""
+        data = self._image_bytes((20, 10), 'PPM')
+
+        with pytest.raises(UnidentifiedImageError):
+            encode_image_source(data)
+
+
+class TestImageProcessor:
+    """Test cases for the process pool image processor."""
+
+    @staticmethod
+    def _png_bytes() -> bytes:
+        buffer = BytesIO()
+        Image.new('RGB', (400, 200), color='red').save(buffer, format='PNG')
+        return buffer.getvalue()
+
+    @pytest.mark.asyncio
+    async def test_encode_in_process_pool(self):
+        """Test that images are encoded in the pool and counted in metrics."""
+        processor = ProcessPoolImageProcessor(max_workers=1, max_concurrency=1)
+        processor.start()
+        try:
+            encoded = await processor.encode_image(self._png_bytes())
+        finally:
+            processor.shutdown()
+
+        assert ("thumbnail", "webp") in encoded.derivatives
+        assert (encoded.metadata.width, encoded.metadata.height) == (400, 200)
+        assert encoded.metadata.dominant_color == "#ff0000"
+        assert processor.metrics()["lookhub_image_completed_total"] == 1
+        assert processor.metrics()["lookhub_image_queue_depth"] == 0
+
+    @pytest.mark.asyncio
+    async def test_invalid_bytes_are_counted_as_failed(self):
+        """Test that undecodable bytes raise and are counted as failures."""
+        processor = ProcessPoolImageProcessor(max_workers=1, max_concurrency=1)
+
+        with pytest.raises(UnidentifiedImageError):
+            await processor.encode_image(b"invalid_image_data")
+
+        assert processor.metrics()["lookhub_image_failed_total"] == 1
+
+
+class TestUploadSpooling:
+    """Test cases for streaming uploads to the spool directory."""
+
+    @pytest.mark.asyncio
+    async def test_spooled_uploads_hash_and_cleanup(self):
+        """Test that uploads are spooled with their digest and removed afterwards."""
+        data = b"x" * 3000
+        upload = UploadFile(file=BytesIO(data), filename="image.png")
+
+        async with spooled_uploads([upload]) as images:
+            path = images[0].path
+            assert path.read_bytes() == data
+            assert images[0].size == 3000
+            assert images[0].sha256 == hashlib.sha256(data).hexdigest()
+
+        assert not path.exists()
+
+    @pytest.mark.asyncio
+    async def test_spooled_uploads_request_limit(self):
+        """Test that the total request size is capped."""
+        uploads = [UploadFile(file=BytesIO(b"x" * 600)) for _ in range(2)]
+
+        with pytest.raises(FileTooLargeError):
+            async with spooled_uploads(uploads, max_request_bytes=1000):
+                pass
+
+    def test_oversized_upload_body_is_refused_through_app_stack(self):
+        """Test that upload bodies over the limit get 413 through the app's middleware stack.
+
+        A chunked body without Content-Length must be answered as well, and the
+        upload admission slot must be free afterwards.
+        """
+        from fastapi.testclient import TestClient
+        from app.api.admission import admission_gates
+        from app.main import app
+
+        stack = app.build_middleware_stack()
+        middleware = stack
+        while not isinstance(middleware, UploadSizeLimitMiddleware):
+            middleware = middleware.app
+        middleware.max_body_bytes = 1000
+        gate = admission_gates["upload"]
+
+        def chunks():
+            yield b"x" * 600
+            yield b"x" * 600
+
+        app.middleware_stack = stack
+        try:
+            client = TestClient(app)
+            files = [("image_files", ("a.png", b"x" * 2000, "image/png"))]
+            assert client.post("/api/looks/1/add_images", files=files).status_code == 413
+
+            response = client.post(
+                "/api/looks/1/add_images",
+                content=chunks(),
+                headers={"Content-Type": "multipart/form-data; boundary=b"},
+                timeout=5,
+            )
+            assert response.status_code == 413
+            assert gate.metrics()['lookhub_admission_in_progress{route_class="upload"}'] == 0
+
+            small = [("image_files", ("a.png", b"x" * 100, "image/png"))]
+            assert client.post("/api/looks/1/add_images", files=small).status_code != 413
+        finally:
+            app.middleware_stack = None
+
+
+class TestImageStorage:
+    """Test cases for image storage backends."""
+
+    @pytest.mark.asyncio
+    async def test_local_storage_round_trip(self, tmp_path):
+        """Test saving, checking and deleting a sharded key in the local storage."""
+        storage = LocalImageStorage()
+
+        with patch("app.application.utils.UPLOAD_IMAGES_DIR", tmp_path):
+            await storage.save("ab/cd/abc.webp", b"data")
+            assert (tmp_path / "ab" / "cd" / "abc.webp").read_bytes() == b"data"
+            assert await storage.exists("ab/cd/abc.webp")
+            assert await storage.delete("ab/cd/abc.webp")
+            assert not await storage.delete("ab/cd/abc.webp")
+
+    @pytest.mark.asyncio
+    async def test_s3_storage_multipart_upload(self):
+        """Test that large objects are uploaded in concurrent parts."""
+        storage = S3ImageStorage(bucket="images", multipart_threshold=10, chunk_size=4)
+        client = AsyncMock()
+        client.create_multipart_upload.return_value = {"UploadId": "upload-1"}
+        client.upload_part.return_value = {"ETag": "etag"}
+        storage._client = client
+
+        await storage.save("ab/cd/abc.webp", b"x" * 11)
+
+        assert client.upload_part.await_count == 3
+        parts = client.complete_multipart_upload.await_args.kwargs["MultipartUpload"]["Parts"]
+        assert [part["PartNumber"] for part in parts] == [1, 2, 3]
+        client.put_object.assert_not_called()
+
+
+class TestModelJSONResponse:
+    """Test cases for the orjson response class."""
+
+    def test_renders_models_with_public_image_urls(self):
+        """Test that models, also nested in plain data, are encoded in JSON mode."""
+        look = Look(
+            name="Test Look",
+            gender=GenderEnum.unisex,
+            description="Test description",
+            image_prompts=[],
+            image_urls=["ab/cd/abc.webp"],
+        )
+
+        body = ModelJSONResponse({"results": [look], "count": 1}).body
+
+        assert body == ModelJSONResponse({"results": [look.model_dump(mode="json")], "count": 1}).body
+        assert b'"image_urls":["http' in body
+        assert b'"count":1' in body
+
+
+class TestEnumColumnTypes:
+    """Test cases for the compact colour and gender column types."""
+
+    def test_colour_bitmask_round_trip(self):
+        """Test that colours are stored as a bitmask and read back in enum order."""
+        from app.infrastructure.repositories.models.types import EnumBitmask
+
+        column_type = EnumBitmask(ColourEnum)
+        mask = column_type.process_bind_param([ColourEnum.black.value, ColourEnum.white], None)
+
+        assert mask == 1 | 1 << (len(ColourEnum) - 1)
+        assert column_type.process_result_value(mask, None) == [ColourEnum.white.value, ColourEnum.black.value]
+
+    def test_gender_code_round_trip(self):
+        """Test that genders are stored as small integer codes."""
+        from app.infrastructure.repositories.models.types import EnumCode
+
+        column_type = EnumCode(GenderEnum)
+
+        assert column_type.process_bind_param(GenderEnum.unisex.value, None) == 2
+        assert column_type.process_result_value(2, None) == GenderEnum.unisex.value
+
+    def test_any_colour_filter_is_bitwise(self):
+        """Test that the any-of colour filter compiles to one bitwise test."""
+        from sqlalchemy import select
+        from sqlalchemy.dialects import postgresql
+        from app.infrastructure.repositories.clothes import ClothesRepository
+        from app.infrastructure.repositories.models.clothes import Clothes as ClothesModel
+
+        conditions = ClothesRepository(None)._filters(colours=[ColourEnum.red.value, ColourEnum.blue.value])
+        compiled = select(ClothesModel.id).where(*conditions).compile(dialect=postgresql.dialect())
+
+        assert "clothes.colours & " in str(compiled)
+        colours_type = compiled.binds["colours_1"].type
+        assert colours_type.process_bind_param(compiled.params["colours_1"], None) == 1 << 3 | 1 << 9
+
+
+class TestBatchIds:
+    """Test cases for parsing batch GET IDs."""
+
+    def test_parses_comma_separated_ids(self):
+        """Test that IDs keep their order and blanks are ignored."""
+        from app.api.routers.utils import batch_ids
+
+        assert batch_ids("3, 1,,2") == [3, 1, 2]
+
+    def test_rejects_invalid_and_oversized_batches(self):
+        """Test that non-integer IDs and too many IDs are rejected."""
+        from fastapi import HTTPException
+        from app.api.routers.utils import batch_ids
+        from app.config import API_BATCH_MAX_IDS
+
+        for ids in ("1,a", "", ",".join(["1"] * (API_BATCH_MAX_IDS + 1))):
+            with pytest.raises(HTTPException) as exc_info:
+                batch_ids(ids)
+            assert exc_info.value.status_code == 422
+
+
+class TestTaskProducer:
+    """Test cases for the pooled Celery task producer."""
+
+    @pytest.mark.asyncio
+    async def test_send_many_uses_one_producer(self):
+        """Test that a batch is published through a single pooled producer."""
+        task_producer = TaskProducer("memory://", "cache+memory://")
+        await task_producer.start()
+        producers = []
+        send_task = task_producer.app.send_task
+
+        def record(*args, producer=None, **kwargs):
+            producers.append(producer)
+            return send_task(*args, producer=producer, **kwargs)
+
+        try:
+            with patch.object(task_producer.app, "send_task", side_effect=record):
+                ids = await task_producer.send_many("post", [[1], [2], [3]], queue="q", task_ids=["a", "b", "c"])
+            with task_producer.app.connection_for_read() as connection:
+                queued = connection.SimpleQueue("q").qsize()
+        finally:
+            await task_producer.close()
+
+        assert ids == ["a", "b", "c"]
+        assert queued == 3
+        assert len(set(map(id, producers))) == 1 and producers[0] is not None
+
+
+class TestPublicationEvents:
+    """Test cases for the live publication events of the admin panel."""
+
+    @pytest.mark.asyncio
+    async def test_subscribe_events_parses_and_heartbeats(self):
+        """Test that JSON events are yielded, idle periods yield None and malformed messages are skipped."""
+        from app.infrastructure.events import subscribe_events
+
+        pubsub = MagicMock()
+        pubsub.subscribe = AsyncMock()
+        pubsub.unsubscribe = AsyncMock()
+        pubsub.aclose = AsyncMock()
+        pubsub.get_message = AsyncMock(side_effect=[
+            {"data": b'{"status": "success", "look_id": 1, "service": "telegram"}'},
+            None,
+            {"data": b"not json"},
+            {"data": b'{"status": "pushed", "look_id": 1}'},
+        ])
+        redis_client = MagicMock()
+        redis_client.pubsub.return_value = pubsub
+
+        events = subscribe_events("channel", heartbeat=0.1, redis_client=redis_client)
+        received = [await anext(events) for _ in range(3)]
+        await events.aclose()
+
+        assert received == [
+            {"status": "success", "look_id": 1, "service": "telegram"},
+            None,
+            {"status": "pushed", "look_id": 1},
+        ]
+        pubsub.subscribe.assert_awaited_once_with("channel")
+        pubsub.unsubscribe.assert_awaited_once_with("channel")
+        pubsub.aclose.assert_awaited_once()
+
+    def test_events_route_streams_events_of_look(self):
+        """Test that the SSE route sends pings and only the events of the requested look."""
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+        from app.admin import router as admin_router
+        from app.admin.security import verify_admin_token
+
+        async def fake_events():
+            yield {"status": "success", "look_id": 1, "service": "telegram"}
+            yield None
+            yield {"status": "success", "look_id": 2, "service": "telegram"}
+            yield {"status": "pushed", "look_id": 1}
+
+        app = FastAPI()
+        app.include_router(admin_router.router)
+        app.dependency_overrides[verify_admin_token] = lambda: None
+
+        with patch.object(admin_router, "subscribe_events", fake_events):
+            response = TestClient(app).get("/admin/events", params={"look_id": 1})
+
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert response.text == (
+            'event: publication\ndata: {"status": "success", "look_id": 1, "service": "telegram"}\n\n'
+            ": ping\n\n"
+            'event: publication\ndata: {"status": "pushed", "look_id": 1}\n\n'
+        )
+
+
+class TestWorkerMetrics:
+    """Test cases for metrics combined over the app workers."""
+
+    def test_snapshots_of_live_workers_are_combined(self, tmp_path):
+        """Test that counters are summed, replicated state is not, and stale workers are dropped."""
+        first = WorkerMetricsSnapshots(tmp_path, worker_id=1)
+        second = WorkerMetricsSnapshots(tmp_path, worker_id=2)
+        first.write({"lookhub_done_total": (3, "sum"), "lookhub_index_size": (10, "max")})
+        exited = WorkerMetricsSnapshots(tmp_path, worker_id=3)
+        exited.write({"lookhub_done_total": (100, "sum")})
+        os.utime(exited.path, (0, 0))
+
+        combined = second.aggregate(
+            {"lookhub_done_total": (2, "sum"), "lookhub_index_size": (10, "max")}
+        )
+
+        assert combined == {"lookhub_done_total": 5, "lookhub_index_size": 10}
+        assert not exited.path.exists()
+        assert render_metrics(combined) == "lookhub_done_total 5\nlookhub_index_size 10\n"
+
+
+class TestAdmissionControl:
+    """Test cases for the admission control middleware."""
+
+    @pytest.mark.parametrize("method, path, expected", [
+        ("GET", "/api/looks/", "read"),
+        ("GET", "/frontend/looks/1", "read"),
+        ("POST", "/api/looks/", "admin"),
+        ("DELETE", "/api/clothes/3", "admin"),
+        ("GET", "/admin/looks", "admin"),
+        ("POST", "/api/looks/1/add_images", "upload"),
+        ("POST", "/api/looks/with_images", "upload"),
+        ("GET", "/admin/events", None),
+        ("GET", "/images/a.webp", None),
+        ("OPTIONS", "/api/looks/", None),
+    ])
+    def test_classify_request(self, method, path, expected):
+        """Test that requests are sorted into the expected classes."""
+        from app.api.admission import classify_request
+
+        assert classify_request(method, path) == expected
+
+    @pytest.mark.asyncio
+    async def test_gate_rejects_when_queue_is_full_or_wait_is_too_long(self):
+        """Test that waiting requests time out and requests beyond the queue are rejected at once."""
+        import asyncio
+        from app.api.admission import AdmissionGate
+
+        gate = AdmissionGate("read", concurrency=1, max_queue=1, max_wait=0.05)
+        assert await gate.acquire()
+
+        waiting = asyncio.create_task(gate.acquire())
+        await asyncio.sleep(0)
+        assert gate.metrics()['lookhub_admission_queue_depth{route_class="read"}'] == 1
+        assert not await gate.acquire()
+        assert not await waiting
+
+        gate.release()
+        assert await gate.acquire()
+        metrics = gate.metrics()
+        assert metrics['lookhub_admission_rejected_queue_full_total{route_class="read"}'] == 1
+        assert metrics['lookhub_admission_rejected_timeout_total{route_class="read"}'] == 1
+        assert metrics['lookhub_admission_in_progress{route_class="read"}'] == 1
+
+    @pytest.mark.asyncio
+    async def test_middleware_answers_503_with_retry_after(self):
+        """Test that a request that cannot be admitted gets 503 while the first one still runs."""
+        import asyncio
+        import httpx
+        from app.api.admission import AdmissionControlMiddleware, AdmissionGate
+
+        release = asyncio.Event()
+
+        async def slow_app(scope, receive, send):
+            await release.wait()
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b"ok"})
+
+        app = AdmissionControlMiddleware(slow_app, gates={"read": AdmissionGate("read", 1, 0, 0.05)})
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            first = asyncio.create_task(client.get("/api/looks/"))
+            await asyncio.sleep(0.01)
+            rejected = await client.get("/api/looks/")
+            unlimited = asyncio.create_task(client.get("/metrics"))
+            release.set()
+            assert (await first).status_code == 200
+            assert (await unlimited).status_code == 200
+
+        assert rejected.status_code == 503
+        assert rejected.headers["retry-after"]
+
+
+class TestRequestDeadlines:
+    """Test cases for request deadlines and their database statement timeouts."""
+
+    @pytest.mark.parametrize("route_class, header, expected", [
+        ("read", None, 10),
+        ("read", b"2.5", 2.5),
+        ("read", b"600", 10),
+        ("read", b"abc", 10),
+        ("upload", b"-1", 55),
+        (None, b"5", None),
+    ])
+    def test_request_timeout(self, route_class, header, expected):
+        """Test that clients can only shorten the timeout of their route class."""
+        from app.api.deadlines import request_timeout
+
+        assert request_timeout(route_class, header) == expected
+
+    def test_statement_timeout_follows_deadline(self):
+        """Test that a transaction gets the remaining time as statement_timeout, or fails past the deadline."""
+        from app.application.exceptions import RequestTimeoutError
+        from app.infrastructure.database import _set_statement_timeout, request_deadline
+
+        connection = MagicMock()
+        _set_statement_timeout(None, None, connection)
+        connection.exec_driver_sql.assert_not_called()
+
+        token = request_deadline.set(time.monotonic() + 3)
+        try:
+            _set_statement_timeout(None, None, connection)
+            statement = connection.exec_driver_sql.call_args.args[0]
+            assert statement.startswith("SET LOCAL statement_timeout = ")
+            assert 2900 <= int(statement.rsplit(" ", 1)[1]) <= 3000
+
+            request_deadline.set(time.monotonic() - 1)
+            with pytest.raises(RequestTimeoutError):
+                _set_statement_timeout(None, None, connection)
+        finally:
+            request_deadline.reset(token)
+
+    @pytest.mark.asyncio
+    async def test_client_disconnect_cancels_request(self):
+        """Test that the app sees the deadline and is cancelled when the client goes away."""
+        import asyncio
+        from app.api.deadlines import RequestDeadlineMiddleware
+        from app.infrastructure.database import request_deadline
+
+        seen = {}
+
+        async def slow_app(scope, receive, send):
+            seen["deadline"] = request_deadline.get()
+            await receive()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                seen["cancelled"] = True
+                raise
+
+        messages = iter([{"type": "http.request", "body": b"", "more_body": False}])
+
+        async def receive():
+            message = next(messages, None)
+            if message is None:
+                await asyncio.sleep(0.05)
+                return {"type": "http.disconnect"}
+            return message
+
+        scope = {"type": "http", "method": "GET", "path": "/api/looks/", "headers": []}
+        await asyncio.wait_for(RequestDeadlineMiddleware(slow_app)(scope, receive, AsyncMock()), 1)
+
+        assert seen["cancelled"]
+        assert seen["deadline"] - time.monotonic() > 9
+        assert request_deadline.get() is None
+
+    @pytest.mark.asyncio
+    async def test_receive_error_reaches_the_app(self):
+        """Test that an error of the server's receive is raised to the app instead of hanging it."""
+        import asyncio
+        from app.api.deadlines import RequestDeadlineMiddleware
+
+        seen = []
+
+        async def app(scope, receive, send):
+            for _ in range(2):
+                try:
+                    await receive()
+                except RuntimeError as e:
+                    seen.append(e)
+            raise seen[-1]
+
+        async def receive():
+            raise RuntimeError("connection lost")
+
+        scope = {"type": "http", "method": "GET", "path": "/api/looks/", "headers": []}
+        with pytest.raises(RuntimeError, match="connection lost"):
+            await asyncio.wait_for(RequestDeadlineMiddleware(app)(scope, receive, AsyncMock()), 1)
+
+        assert len(seen) == 2
+
+    def test_statement_timeout_maps_to_504(self):
+        """Test that statements cancelled by statement_timeout answer 504 and other DB errors 500."""
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+        from sqlalchemy.exc import DBAPIError
+        from app.api.exception_handlers import init_exception_handlers
+
+        app = FastAPI()
+        init_exception_handlers(app)
+
+        @app.get("/{sqlstate}")
+        async def failing(sqlstate: str):
+            raise DBAPIError("SELECT 1", None, MagicMock(sqlstate=sqlstate))
+
+        client = TestClient(app, raise_server_exceptions=False)
+        assert client.get("/57014").status_code == 504
+        assert client.get("/23505").status_code == 500
+
+
+class TestStaticAssets:
+    """Test cases for the content-hashed static asset build."""
+
+    @pytest.fixture
+    def built_assets(self, tmp_path):
+        """A bundle built from one stylesheet and one icon."""
+        source = tmp_path / "source"
+        (source / "css").mkdir(parents=True)
+        (source / "css" / "main.css").write_text("body { color: black; }\n" * 100)
+        (source / "icon.svg").write_text("<svg/>")
+        build_bundle(source, tmp_path / "assets" / "frontend")
+        return tmp_path / "assets"
+
+    def test_build_writes_hashed_names_and_variants(self, built_assets):
+        """Test that names carry a content hash and only larger text files get a gzip variant."""
+        import gzip
+        import json
+
+        manifest = json.loads((built_assets / "frontend" / "manifest.json").read_text())
+        css = built_assets / "frontend" / manifest["css/main.css"]
+
+        digest = hashlib.sha256(css.read_bytes()).hexdigest()[:12]
+        assert manifest["css/main.css"] == f"css/main.{digest}.css"
+        assert gzip.decompress(css.with_name(css.name + ".gz").read_bytes()) == css.read_bytes()
+        assert not (built_assets / "frontend" / (manifest["icon.svg"] + ".gz")).exists()
+
+    def test_manifest_url_falls_back_to_unhashed(self, built_assets, tmp_path):
+        """Test that built assets resolve to hashed URLs and others to their source URL."""
+        manifest = AssetManifest("frontend", "/frontend/static", built_assets)
+
+        assert manifest.url("css/main.css").startswith("/assets/frontend/css/main.")
+        assert manifest.url("css/missing.css") == "/frontend/static/css/missing.css"
+        assert AssetManifest("admin", "/admin/static", tmp_path).url("js/looks.js") == "/admin/static/js/looks.js"
+
+    def test_assets_are_served_precompressed_and_immutable(self, built_assets):
+        """Test that the gzip variant is sent to clients that accept it, with immutable caching."""
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+
+        app = FastAPI()
+        app.mount("/assets", PrecompressedStaticFiles(directory=built_assets), name="assets")
+        url = AssetManifest("frontend", "/frontend/static", built_assets).url("css/main.css")
+        client = TestClient(app)
+
+        compressed = client.get(url, headers={"Accept-Encoding": "gzip"})
+        plain = client.get(url, headers={"Accept-Encoding": "identity"})
+
+        assert compressed.headers["content-encoding"] == "gzip"
+        assert compressed.headers["content-type"].startswith("text/css")
+        assert compressed.headers["cache-control"] == "public, max-age=31536000, immutable"
+        assert compressed.headers["vary"] == "Accept-Encoding"
+        assert int(compressed.headers["content-length"]) < int(plain.headers["content-length"])
+        assert "content-encoding" not in plain.headers
+        assert compressed.text == plain.text
+
+    def test_stylesheet_references_point_to_hashed_names(self, tmp_path):
+        """Test that relative @import and url() references are rewritten, others kept."""
+        source = tmp_path / "source"
+        (source / "css").mkdir(parents=True)
+        (source / "img").mkdir()
+        (source / "css" / "main.css").write_text(
+            '@import "./reset.css";\n'
+            "@import url('https://fonts.example.com/css2?family=Inter');\n"
+            'body { background: url("../img/bg.png?v=1"); }\n'
+            ".icon { background: url(data:image/png;base64,AAAA); }\n"
+        )
+        (source / "css" / "reset.css").write_text("* { margin: 0; }\n")
+        (source / "img" / "bg.png").write_bytes(b"png")
+
+        manifest = build_bundle(source, tmp_path / "assets")
+        css = (tmp_path / "assets" / manifest["css/main.css"]).read_text()
+
+        reset_name = manifest["css/reset.css"].split("/")[-1]
+        assert f'@import "{reset_name}";' in css
+        assert f'url("../{manifest["img/bg.png"]}?v=1")' in css
+        assert "url('https://fonts.example.com/css2?family=Inter')" in css
+        assert "url(data:image/png;base64,AAAA)" in css
+        digest = hashlib.sha256(css.encode()).hexdigest()[:12]
+        assert manifest["css/main.css"] == f"css/main.{digest}.css"
+
+
 class TestValidationUtils:
     """Test cases for validation utility functions."""
 
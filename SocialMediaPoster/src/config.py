@@ -17,6 +17,7 @@ UPLOAD_FILES_DIR.mkdir(parents=True, exist_ok=True)  # Ensure directory exists
 # Redis configuration
 REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
 REDIS_PORT = os.getenv("REDIS_PORT", "6379")
+PUBLICATION_EVENTS_CHANNEL = "look_publication_events"  # Pub/sub channel streamed to the LookHubWeb admin
 
 # Instagram configuration
 INSTAGRAM_LOGIN = os.environ.get('INSTAGRAM_LOGIN')
@@ -7,7 +7,7 @@ from instagrapi import Client
 from src.config import UPLOAD_FILES_DIR
 from src.entities.looks import LookRead
 from src.interfaces import ServiceInterface
-from src.services.utils import get_image_from_url, create_temporary_file, delete_temporary_file
+from src.services.utils import get_image_from_url, create_temporary_file, delete_temporary_file, convert_to_jpeg
 
 logger = logging.getLogger(__name__)
 
@@ -42,7 +42,7 @@ class InstagramService(ServiceInterface):
         """
         photos_paths = []
         for image_url in look.image_urls:
-            image_bytes = await get_image_from_url(image_url)
+            image_bytes = convert_to_jpeg(await get_image_from_url(image_url))
             image_file = create_temporary_file(image_bytes, suffix=".jpg")
             photos_paths.append(image_file)
 
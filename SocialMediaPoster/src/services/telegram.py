@@ -7,7 +7,7 @@ from aiogram.types import InputMediaPhoto, InputFile, BufferedInputFile
 
 from src.entities.looks import LookRead
 from src.interfaces import ServiceInterface
-from src.services.utils import get_image_from_url, create_temporary_file
+from src.services.utils import get_image_from_url, create_temporary_file, convert_to_jpeg
 
 logger = logging.getLogger(__name__)
 
@@ -66,7 +66,7 @@ class TelegramService(ServiceInterface):
             raise ValueError("Look without image urls is not supported")
         input_media_photo_array = []
         for i, image_url in enumerate(look.image_urls):
-            image_bytes = await get_image_from_url(image_url)
+            image_bytes = convert_to_jpeg(await get_image_from_url(image_url))
             input_file = BufferedInputFile(image_bytes, filename=look.name + str(i))
             input_media_photo_array.append(InputMediaPhoto(media=input_file))
         input_media_photo_array[0].parse_mode = "HTML"
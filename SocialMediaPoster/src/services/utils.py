@@ -1,10 +1,12 @@
 import logging
 import os
 import tempfile
+from io import BytesIO
 from pathlib import Path
 from urllib.parse import urlparse, urlunparse
 
 import aiohttp
+from PIL import Image
 
 from src.config import UPLOAD_FILES_DIR
 
@@ -32,6 +34,19 @@ async def get_image_from_url(image_url: str) -> bytes:
             return await response.read()
 
 
+def convert_to_jpeg(image_bytes: bytes) -> bytes:
+    """
+    Перекодирует изображение (например, WebP из LookHubWeb) в JPEG,
+    который принимают все социальные сети.
+    """
+    image = Image.open(BytesIO(image_bytes))
+    if image.format == "JPEG":
+        return image_bytes
+    buffer = BytesIO()
+    image.convert("RGB").save(buffer, format="JPEG", quality=90)
+    return buffer.getvalue()
+
+
 def create_temporary_file(file: bytes, suffix=".jpg") -> Path:
     tmp_file = tempfile.NamedTemporaryFile(delete=False, suffix=suffix, dir=UPLOAD_FILES_DIR)
     tmp_file.write(file)
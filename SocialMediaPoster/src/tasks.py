@@ -11,7 +11,7 @@ from .services.telegram import TelegramService
 from .config import (
     TELEGRAM_TOKEN, TELEGRAM_CHANNEL_ID,
     INSTAGRAM_LOGIN, INSTAGRAM_PASSWORD,
-    REDIS_HOST, REDIS_PORT
+    REDIS_HOST, REDIS_PORT, PUBLICATION_EVENTS_CHANNEL
 )
 
 
@@ -33,12 +33,16 @@ SERVICE_REGISTRY = {
 
 
 def publish_result(task_id, status, **extra):
-    """Запись результата в Redis"""
-    r.sadd("social_media_results_set", json.dumps({
+    """Запись результата в Redis и оповещение админки"""
+    result = json.dumps({
         "status": status,
         "task_id": task_id,
         **extra
-    }))
+    })
+    pipe = r.pipeline(transaction=False)
+    pipe.sadd("social_media_results_set", result)
+    pipe.publish(PUBLICATION_EVENTS_CHANNEL, result)
+    pipe.execute()
 
 
 def validate_look(look_data, task_id=None) -> LookRead: